@@ -1,19 +1,22 @@
 """This module contains the Acquirer class, which is used to gather inputs for
 a subsequent round of exploration based on prior prediction data."""
-import heapq
-from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import math
 from timeit import default_timer
-from typing import (Callable, Dict, Iterable, List, Mapping, 
-                    Optional, Set, TypeVar, Union)
+from typing import (Any, Callable, Dict, Iterable, List, Mapping, 
+                    Optional, Set, Tuple, TypeVar, Union)
 
 import numpy as np
-from tqdm import tqdm
 
+from molpal import similarity
 from molpal.acquirer import metrics
 
 T = TypeVar('T')
 
+# the maximum number of inputs in each shard of parallel top-k selection
+SHARDSIZE = 1 << 22
+
 class Acquirer:
     """An Acquirer acquires inputs from an input pool for exploration.
 
@@ -37,6 +40,22 @@ class Acquirer:
         whether the prediction values are generated through stochastic means
     threshold : float
         the threshold value to use in the random_threshold metric
+    max_similarity : Optional[float]
+        the maximum Tanimoto similarity allowed between any two inputs in a
+        batch. If None, batches are not diversified
+    shortlist_factor : int
+        the size of the shortlist of top inputs from which a diversified
+        batch is selected, as a multiple of the batch size
+    cost_aware : bool
+        whether to rank inputs by their utility, clipped at zero, per
+        predicted unit of cost when predicted costs are available
+    cpu_budget : Optional[float]
+        the total predicted CPU time in seconds to spend on each batch when
+        predicted costs are available. If None, each batch contains
+        batch_size inputs
+    n_threads : int
+        the number of threads over which to calculate utilities and select
+        batches
     verbose : int
         the level of output the acquirer should print
     
@@ -55,6 +74,12 @@ class Acquirer:
     xi: float (Default = 0.01)
     beta : int (Default = 2)
     threshold : float (Default = float('-inf'))
+    max_similarity : Optional[float] (Default = None)
+    shortlist_factor : int (Default = 10)
+    cost_aware : bool (Default = False)
+    cpu_budget : Optional[float] (Default = None)
+    n_threads : Optional[int] (Default = None)
+        if None, use all available cores
     seed : Optional[int] (Default = None)
         the random seed to use for initial batch acquisition
     verbose : int (Default = 0)
@@ -68,6 +93,10 @@ class Acquirer:
                  epsilon: float = 0., beta: int = 2, xi: float = 0.01,
                  threshold: float = float('-inf'),
                  temp_i: Optional[float] = None, temp_f: Optional[float] = 1.,
+                 max_similarity: Optional[float] = None,
+                 shortlist_factor: int = 10,
+                 cost_aware: bool = False, cpu_budget: Optional[float] = None,
+                 n_threads: Optional[int] = None,
                  seed: Optional[int] = None, verbose: int = 0, **kwargs):
         self.size = size
         self.init_size = init_size
@@ -87,9 +116,29 @@ class Acquirer:
         self.temp_i = temp_i
         self.temp_f = temp_f
 
+        if max_similarity is not None and not 0. < max_similarity <= 1.:
+            raise ValueError(
+                f'max_similarity(={max_similarity}) must be in (0, 1]'
+            )
+        if shortlist_factor < 1:
+            raise ValueError(
+                f'shortlist_factor(={shortlist_factor}) must be at least 1'
+            )
+        self.max_similarity = max_similarity
+        self.shortlist_factor = shortlist_factor
+
+        if cpu_budget is not None and cpu_budget <= 0:
+            raise ValueError(f'cpu_budget(={cpu_budget}) must be positive')
+        self.cost_aware = cost_aware
+        self.cpu_budget = cpu_budget
+        self.n_threads = n_threads or metrics.MAX_CPU
+
         metrics.set_seed(seed)
         self.verbose = verbose
 
+        # reusable output buffer for acquisition utilities
+        self._U = None
+
     def __len__(self) -> int:
         return self.size
 
@@ -99,6 +148,19 @@ class Acquirer:
         utilities"""
         return metrics.get_needs(self.metric)
     
+    @property
+    def rng_state(self) -> Tuple[Dict, Any]:
+        """Tuple[Dict, Any] : the states of the random number generators 
+        used during acquisition: the metrics module's generator and numpy's 
+        global generator, which is used for epsilon-greedy acquisition"""
+        return metrics.get_state(), np.random.get_state()
+    
+    @rng_state.setter
+    def rng_state(self, state: Tuple[Dict, Any]):
+        metrics_state, np_state = state
+        metrics.set_state(metrics_state)
+        np.random.set_state(np_state)
+
     @property
     def init_size(self) -> int:
         """int : the number of inputs to acquire initially"""
@@ -155,36 +217,66 @@ class Acquirer:
         List[T]
             the list of inputs to explore
         """
-        U = metrics.random(np.empty(self.size))
+        idxs = self.acquire_initial_idxs(cluster_ids, cluster_sizes)
+
+        # a single pass that stops at the last selected input
+        mask = np.zeros(self.size, dtype=bool)
+        mask[idxs] = True
+        n_max = idxs.max() + 1 if len(idxs) > 0 else 0
+
+        return [x for x, selected in zip(islice(xs, n_max), mask) if selected]
+
+    def acquire_initial_idxs(self,
+                             cluster_ids: Optional[Iterable[int]] = None,
+                             cluster_sizes: Optional[Mapping[int, int]] = None
+                             ) -> np.ndarray:
+        """Acquire the indices of an initial set of inputs to explore
+
+        Inputs are sampled uniformly at random in index space, so the pool
+        itself need not be read. If the pool is clustered, each cluster is
+        sampled independently in proportion to its size.
+
+        Parameters
+        ----------
+        cluster_ids : Optional[Iterable[int]] (Default = None)
+            the cluster ID of each input in the pool
+        cluster_sizes : Optional[Mapping[int, int]] (Default = None)
+            a mapping from a cluster id to the sizes of that cluster
+
+        Returns
+        -------
+        idxs : np.ndarray
+            the sorted indices of the inputs to explore
+        """
+        rg = metrics.RG
 
         if cluster_ids is None and cluster_sizes is None:
-            heap = []
-            for x, u in tqdm(zip(xs, U), total=U.size, desc='Acquiring'):
-                if len(heap) < self.init_size:
-                    heapq.heappush(heap, (u, x))
-                else:
-                    heapq.heappushpop(heap, (u, x))
+            size = min(self.init_size, self.size)
+            idxs = rg.choice(self.size, size=size, replace=False)
         else:
-            d_cid_heap = {
-                cid: ([], math.ceil(self.init_size * cluster_size/U.size))
-                for cid, cluster_size in cluster_sizes.items()
-            }
-
-            for x, u, cid in tqdm(zip(xs, U, cluster_ids), total=U.size,
-                                  desc='Acquiring'):
-                heap, heap_size = d_cid_heap[cid]
-                if len(heap) < heap_size:
-                    heapq.heappush(heap, (u, x))
-                else:
-                    heapq.heappushpop(heap, (u, x))
-
-            heaps = [heap for heap, _ in d_cid_heap.values()]
-            heap = list(chain(*heaps))
+            cluster_ids = np.fromiter(cluster_ids, dtype=int, count=self.size)
+            order = np.argsort(cluster_ids, kind='stable')
+            cids, starts, counts = np.unique(
+                cluster_ids[order], return_index=True, return_counts=True
+            )
+
+            idxss = []
+            for cid, start, count in zip(cids, starts, counts):
+                size = math.ceil(
+                    self.init_size * cluster_sizes[cid] / self.size
+                )
+                choices = rg.choice(
+                    count, size=min(size, count), replace=False
+                )
+                idxss.append(order[start + choices])
+            idxs = np.concatenate(idxss)
+
+        idxs.sort()
 
         if self.verbose > 0:
-            print(f'  Selected {len(heap)} initial samples')
+            print(f'  Selected {len(idxs)} initial samples')
 
-        return [x for _, x in heap]
+        return idxs
 
     def acquire_batch(self, xs: Iterable[T],
                       y_means: Iterable[float], y_vars: Iterable[float],
@@ -194,6 +286,9 @@ class Acquirer:
                       epoch: Optional[int] = None, **kwargs) -> List[T]:
         """Acquire a batch of inputs to explore
 
+        NOTE: this method holds all of the xs in memory. When acquiring from
+        a large pool, prefer acquire_batch_idxs()
+
         Parameters
         ----------
         xs : Iterable[T]
@@ -210,43 +305,128 @@ class Acquirer:
             a mapping from a cluster id to the sizes of that cluster
         epoch : Optional[int] (Default = None)
             the current epoch of batch acquisition
-        is_random : bool (Default = False)
-            are the y_means generated through stochastic methods?
 
         Returns
         -------
         List[T]
             a list of selected inputs
         """
-        if explored:
-            try:
-                current_max = max(y for y in explored.values() if y is not None)
-            except ValueError:
-                # all None values case
-                current_max = float('-inf')
-        else:
-            explored = {}
+        explored = explored or {}
+        try:
+            current_max = max(y for y in explored.values() if y is not None)
+        except ValueError:
+            # no explored inputs or all None values case
             current_max = float('-inf')
 
+        xs = list(xs)
+        explored_mask = np.fromiter(
+            (x in explored for x in xs), dtype=bool, count=len(xs)
+        )
+
+        idxs = self.acquire_batch_idxs(
+            y_means, y_vars, explored=explored_mask, current_max=current_max,
+            cluster_ids=cluster_ids, cluster_sizes=cluster_sizes, epoch=epoch
+        )
+
+        return [xs[i] for i in idxs]
+
+    def acquire_batch_idxs(self, y_means: Iterable[float],
+                           y_vars: Iterable[float],
+                           explored: Optional[np.ndarray] = None,
+                           current_max: float = float('-inf'),
+                           cluster_ids: Optional[Iterable[int]] = None,
+                           cluster_sizes: Optional[Mapping[int, int]] = None,
+                           epoch: Optional[int] = None,
+                           get_fps: Optional[
+                               Callable[[np.ndarray], np.ndarray]
+                           ] = None,
+                           costs: Optional[np.ndarray] = None) -> np.ndarray:
+        """Acquire the indices of a batch of inputs to explore
+
+        Selection is performed entirely on arrays: the top-k unexplored inputs
+        by utility are found with a partial sort of each shard of the pool,
+        run in parallel over n_threads threads, followed by a merge of the
+        shards' local top-k. For clustered acquisition, the inputs are then
+        stably sorted by (cluster, utility) and each cluster contributes its
+        top inputs up to its quota.
+
+        If max_similarity is set and get_fps is provided, a shortlist of
+        shortlist_factor times as many inputs is selected instead and the
+        batch is then picked greedily from the shortlist in order of
+        decreasing utility, skipping any input whose Tanimoto similarity to an
+        input already in the batch is at least max_similarity.
+
+        If costs are provided and the acquirer is cost-aware, inputs are
+        ranked by their utility per predicted unit of cost, with utilities
+        first clipped at zero. Clipping, rather than shifting by the minimum
+        utility, keeps the ranking of an input independent of the utilities
+        of the rest of the pool, but inputs with a negative utility all tie
+        at zero. Cost-aware acquisition is thus best suited to non-negative
+        metrics (e.g., 'ei' or 'pi') or objectives with positive values.
+
+        If costs are provided and a cpu_budget is set, the batch is the
+        longest run of top-ranked inputs whose total predicted cost fits in
+        the budget, chosen from a shortlist of shortlist_factor times the
+        batch size.
+
+        Parameters
+        ----------
+        y_means : Iterable[float]
+            the predicted input values
+        y_vars : Iterable[float]
+            the variances of the predicted input values
+        explored : Optional[np.ndarray] (Default = None)
+            a boolean mask parallel to the inputs that is True for each input
+            that has already been acquired
+        current_max : float (Default = -inf)
+            the maximum objective function value observed so far
+        cluster_ids : Optional[Iterable[int]] (Default = None)
+            a parallel iterable for the cluster ID of each input
+        cluster_sizes : Optional[Mapping[int, int]] (Default = None)
+            a mapping from a cluster id to the sizes of that cluster
+        epoch : Optional[int] (Default = None)
+            the current epoch of batch acquisition
+        get_fps : Optional[Callable[[np.ndarray], np.ndarray]] (Default = None)
+            a function that returns the packed fingerprints (see
+            molpal.similarity.pack) of the inputs at the given indices, in the
+            same order
+        costs : Optional[np.ndarray] (Default = None)
+            the predicted cost of evaluating each input
+
+        Returns
+        -------
+        idxs : np.ndarray
+            the indices of the selected inputs, in order of decreasing utility
+        """
         begin = default_timer()
 
-        Y_mean = np.array(y_means)
-        Y_var = np.array(y_vars)
+        Y_mean = np.asarray(y_means, dtype=np.float32)
+        Y_var = np.asarray(y_vars, dtype=np.float32)
 
         if self.verbose > 1:
             print('Calculating acquisition utilities ...', end=' ')
 
-        U = metrics.calc(
+        if self._U is None or self._U.shape != Y_mean.shape:
+            self._U = np.empty(Y_mean.shape, dtype=np.float32)
+
+        U = metrics.calc_chunked(
             self.metric, Y_mean=Y_mean, Y_var=Y_var, current_max=current_max, 
             threshold=self.threshold, beta=self.beta, xi=self.xi,
-            stochastic=self.stochastic_preds
+            stochastic=self.stochastic_preds, out=self._U,
+            n_threads=self.n_threads
         )
+        if costs is not None and self.cost_aware:
+            np.maximum(U, 0, out=U)
+            U /= costs
 
-        idxs = np.random.choice(
-            np.arange(U.size), replace=False,
-            size=int(self.batch_size * self.epsilon)
-        )
-        U[idxs] = np.inf
+        if explored is None:
+            n_candidates = U.size
+        else:
+            n_candidates = U.size - np.count_nonzero(explored)
+
+        # the ranks among the unexplored inputs of the randomly acquired inputs
+        n_random = min(int(self.batch_size * self.epsilon), n_candidates)
+        ranks = np.random.choice(n_candidates, replace=False, size=n_random)
 
         if self.verbose > 1:
             print('Done!')
@@ -255,110 +435,201 @@ class Acquirer:
             mins, secs = divmod(int(total), 60)
             print(f'      Utility calculation took {mins}m {secs}s')
         
+        diversify = self.max_similarity is not None and get_fps is not None
+        budget = self.cpu_budget is not None and costs is not None
+        if diversify or budget:
+            k = self.batch_size * self.shortlist_factor
+        else:
+            k = self.batch_size
+
         if cluster_ids is None and cluster_sizes is None:
-            # unclustered acquisition maintains one heap that pushes
-            # inputs on based on their utility
-            heap = []
-            for x, u in tqdm(zip(xs, U), total=U.size, desc='Acquiring'):
-                if x in explored:
-                    continue
-
-                if len(heap) < self.batch_size:
-                    heapq.heappush(heap, (u, x))
-                else:
-                    heapq.heappushpop(heap, (u, x))
+            idxs = self._select_top_k(U, explored, ranks, k)
         else:
-            # this is broken for e-greedy/pi/etc. approaches
-            # the random indices are not distributed evenly amongst clusters
-
-            # clustered acquisition maintains o independent heaps that
-            # operate similarly to the above
-            d_cid_heap = {
-                cid: ([], math.ceil(self.batch_size * cluster_size/U.size))
-                for cid, cluster_size in cluster_sizes.items()
-            }
-
-            global_pred_max = float('-inf')
-
-            for x, y_pred, u, cid in tqdm(zip(xs, Y_mean, U, cluster_ids),
-                                          total=U.size, desc='Acquiring'):
-                global_pred_max = max(y_pred, global_pred_max)
-
-                if x in explored:
-                    continue
-
-                heap, heap_size = d_cid_heap[cid]
-                if len(heap) < heap_size:
-                    heapq.heappush(heap, (u, x))
-                else:
-                    heapq.heappushpop(heap, (u, x))
-
-            if self.temp_i and self.temp_f:
-                d_cid_heap = self._scale_heaps(
-                    d_cid_heap, global_pred_max, epoch,
-                    self.temp_i, self.temp_f
+            if explored is None:
+                candidates = np.arange(U.size)
+            else:
+                candidates = np.flatnonzero(~explored)
+            U[candidates[ranks]] = np.inf
+
+            if not isinstance(cluster_ids, np.ndarray):
+                cluster_ids = np.fromiter(
+                    cluster_ids, dtype=int, count=U.size
                 )
+            idxs = self._select_clustered(
+                U, candidates, cluster_ids, cluster_sizes,
+                Y_mean.max(initial=float('-inf')), epoch, k
+            )
 
-            heaps = [heap for heap, _ in d_cid_heap.values()]
-            heap = list(chain(*heaps))
+        if diversify:
+            idxs = self._diversify(
+                idxs, get_fps, len(idxs) if budget else self.batch_size
+            )
+        if budget:
+            n = np.searchsorted(
+                np.cumsum(costs[idxs], dtype=float), self.cpu_budget, 'right'
+            )
+            idxs = idxs[:max(n, 1)]
 
         if self.verbose > 1:
-            print(f'Selected {len(heap)} new samples')
+            print(f'Selected {len(idxs)} new samples')
         if self.verbose > 2:
             total = default_timer() - begin
             mins, secs = divmod(int(total), 60)
             print(f'      Batch acquisition took {mins}m {secs}s')
 
-        return [x for _, x in heap]
+        return idxs
 
-    def _scale_heaps(self, d_cid_heap: Dict[int, List],
-                     pred_global_max: float, epoch: int,
-                     temp_i: float, temp_f: float):
-        """Scale each heap's size based on a decay factor
+    def _select_top_k(self, U: np.ndarray, explored: Optional[np.ndarray],
+                      ranks: np.ndarray, k: int) -> np.ndarray:
+        """Select the k unexplored inputs with the highest utilities, in order
+        of decreasing utility
 
-        The decay factor is calculated by an exponential decay based on the
-        difference between a given heap's local maximum and the predicted
-        global maximum then scaled by the current temperature. The temperature
-        is in turn an exponential decay based on the current epoch starting at 
-        the initial temperature and approaching the final temperature.
+        The inputs are split into shards of at most SHARDSIZE inputs, each of
+        which is reduced to its local top-k in parallel, reading U and
+        explored in place. The local top-k are then merged, breaking ties in
+        utility by index so that the result does not depend on the number of
+        threads or shards.
 
         Parameters
         ----------
-        d_cid_heap : Dict[int, List]
-            a mapping from cluster_id to the heap containing the inputs to
-            acquire from that cluster
-        pred_global_max : float
-            the predicted maximum value of the objective function
-        epoch : int
-            the current iteration of acquisition
-        temp_i : float
-            the initial temperature of the system
-        temp_f : float
-            the final temperature of the system
+        U : np.ndarray
+            the utility of each input
+        explored : Optional[np.ndarray]
+            a boolean mask that is True for each explored input
+        ranks : np.ndarray
+            the ranks among the unexplored inputs of those inputs that should
+            be acquired regardless of utility
+        k : int
+            the number of inputs to select
 
         Returns
         -------
-        d_cid_heap
-            the original mapping scaled down by the calculated decay factor
+        np.ndarray
+            the indices of the selected inputs
         """
-        temp = self._calc_temp(epoch, temp_i, temp_f)
+        n_shards = max(math.ceil(U.size / SHARDSIZE), self.n_threads)
+        bounds = np.linspace(0, U.size, n_shards+1).astype(int)
+
+        if explored is None:
+            offsets = bounds[:-1]
+        else:
+            counts = [
+                (j - i) - np.count_nonzero(explored[i:j])
+                for i, j in zip(bounds[:-1], bounds[1:])
+            ]
+            offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        ranks = np.sort(ranks)
+
+        def select_shard(s):
+            i, j = bounds[s], bounds[s+1]
+            if explored is None:
+                candidates = np.arange(i, j)
+            else:
+                candidates = np.flatnonzero(~explored[i:j]) + i
+
+            U_c = U[candidates]
+            lo, hi = np.searchsorted(
+                ranks, [offsets[s], offsets[s] + U_c.size]
+            )
+            U_c[ranks[lo:hi] - offsets[s]] = np.inf
+
+            k_s = min(k, U_c.size)
+            if k_s == 0:
+                return candidates[:0], U_c[:0]
+
+            top_k = np.argpartition(-U_c, k_s-1)[:k_s]
+            return candidates[top_k], U_c[top_k]
+
+        with ThreadPoolExecutor(self.n_threads) as pool:
+            shards = list(pool.map(select_shard, range(n_shards)))
+
+        idxs = np.concatenate([idxs for idxs, _ in shards])
+        U_top = np.concatenate([U_top for _, U_top in shards])
+
+        order = np.lexsort((idxs, -U_top))[:k]
+        return idxs[order]
 
-        for cid, (heap, heap_size) in d_cid_heap.items():
-            if len(heap) == 0:
-                continue
+    def _select_clustered(self, U: np.ndarray, candidates: np.ndarray,
+                          cluster_ids: np.ndarray,
+                          cluster_sizes: Mapping[int, int],
+                          global_pred_max: float,
+                          epoch: Optional[int], k: int) -> np.ndarray:
+        """Select the top candidates from each cluster
 
-            # get the largest non-infinity value
-            pred_local_max = max(
-                heap, key=lambda yx: -1 if math.isinf(yx[0]) else yx[0]
+        Each cluster is allotted a quota of the k candidates proportional to
+        its size. If an initial and final temperature are set, each quota is
+        then scaled by a decay factor based on the difference between the
+        predicted global maximum and the highest utility selected from that
+        cluster.
+
+        Returns
+        -------
+        np.ndarray
+            the indices of the selected candidates, in order of decreasing
+            utility
+        """
+        U_c = U[candidates]
+        cids_c = cluster_ids[candidates]
+
+        # stable sort by cluster, then by decreasing utility
+        order = np.lexsort((-U_c, cids_c))
+        cids_sorted = cids_c[order]
+        U_sorted = U_c[order]
+
+        cids, starts, counts = np.unique(
+            cids_sorted, return_index=True, return_counts=True
+        )
+        sizes = np.array([cluster_sizes[cid] for cid in cids])
+        quotas = np.ceil(k * sizes / U.size).astype(int)
+
+        group = np.repeat(np.arange(len(cids)), counts)
+        ranks = np.arange(len(order)) - starts[group]
+
+        if self.temp_i and self.temp_f:
+            temp = self._calc_temp(epoch, self.temp_i, self.temp_f)
+
+            # the largest finite utility selected from each cluster
+            U_selected = np.where(
+                (ranks < quotas[group]) & np.isfinite(U_sorted),
+                U_sorted, -np.inf
             )
-            f = self._calc_decay(pred_global_max, pred_local_max, temp)
+            local_maxs = np.full(len(cids), -np.inf)
+            np.maximum.at(local_maxs, group, U_selected)
+
+            decays = self._calc_decay(global_pred_max, local_maxs, temp)
+            # clusters with no finite utilities (i.e., only randomly acquired
+            # inputs) keep their full quota
+            decays[~np.isfinite(local_maxs)] = 1.
+            quotas = np.ceil(decays * quotas).astype(int)
 
-            new_heap_size = math.ceil(f * heap_size)
-            new_heap = heapq.nlargest(new_heap_size, heap)
+        selected = order[ranks < quotas[group]]
+        selected = selected[np.argsort(-U_c[selected], kind='stable')]
 
-            d_cid_heap[cid] = (new_heap, new_heap_size)
+        return candidates[selected]
+
+    def _diversify(self, idxs: np.ndarray,
+                   get_fps: Callable[[np.ndarray], np.ndarray],
+                   k: int) -> np.ndarray:
+        """Select a batch of at most k mutually dissimilar inputs from the
+        shortlist idxs, which is in order of decreasing utility"""
+        begin = default_timer()
+        if self.verbose > 1:
+            print(f'Diversifying batch from {len(idxs)} candidates ...',
+                  end=' ')
+
+        fps = get_fps(idxs)
+        selected = similarity.select_diverse(
+            fps, k, self.max_similarity
+        )
+
+        if self.verbose > 1:
+            print('Done!')
+        if self.verbose > 2:
+            total = default_timer() - begin
+            mins, secs = divmod(int(total), 60)
+            print(f'      Diversification took {mins}m {secs}s')
 
-        return d_cid_heap
+        return idxs[selected]
 
     @classmethod
     def _calc_temp(cls, epoch: int, temp_i, temp_f) -> float:
@@ -366,7 +637,7 @@ class Acquirer:
         return temp_i * math.exp(-epoch/0.75) + temp_f
 
     @classmethod
-    def _calc_decay(cls, global_max: float, local_max: float,
-                    temp: float) -> float:
-        """Calculate the decay factor of a given heap"""
-        return math.exp(-(global_max - local_max)/temp)
+    def _calc_decay(cls, global_max: float, local_max: np.ndarray,
+                    temp: float) -> np.ndarray:
+        """Calculate the decay factor of each cluster"""
+        return np.exp(-(global_max - local_max)/temp)
@@ -1,10 +1,22 @@
 """This module contains functions for calculating the acquisition score of an
 input based on various metrics"""
-from typing import Callable, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+import math
+import os
+from typing import Callable, Dict, Optional, Set
 
 import numpy as np
+from scipy.special import ndtr
 from scipy.stats import norm
 
+try:
+    MAX_CPU = len(os.sched_getaffinity(0))
+except AttributeError:
+    MAX_CPU = os.cpu_count()
+
+CHUNKSIZE = 1 << 16
+INV_SQRT_2PI = 1 / math.sqrt(2 * math.pi)
+
 # this module maintains an independent random number generator
 RG = np.random.default_rng()
 def set_seed(seed: Optional[int] = None) -> None:
@@ -12,6 +24,14 @@ def set_seed(seed: Optional[int] = None) -> None:
     global RG
     RG = np.random.default_rng(seed)
 
+def get_state() -> Dict:
+    """Get the state of this module's random number generator"""
+    return RG.bit_generator.state
+
+def set_state(state: Dict) -> None:
+    """Restore the state of this module's random number generator"""
+    RG.bit_generator.state = state
+
 def get_metric(metric: str) -> Callable[..., float]:
     """Get the corresponding metric function"""
     try:
@@ -67,6 +87,186 @@ def calc(metric: str, Y_mean: np.ndarray, Y_var: np.ndarray,
 
     raise ValueError(f'Unrecognized metric: "{metric}"')
 
+def calc_chunked(metric: str, Y_mean: np.ndarray,
+                 Y_var: Optional[np.ndarray] = None,
+                 current_max: float = float('-inf'),
+                 threshold: float = float('-inf'), beta: int = 2,
+                 xi: float = 0.01, stochastic: bool = False,
+                 out: Optional[np.ndarray] = None,
+                 chunksize: int = CHUNKSIZE,
+                 n_threads: Optional[int] = None) -> np.ndarray:
+    """Calculate the acquisition scores of a metric in float32 precision,
+    chunk by chunk
+
+    Equivalent to calc() but, rather than allocating several full-size float64
+    temporaries, this function processes the inputs in chunks of chunksize
+    elements over multiple threads, writing the scores directly into out.
+    Its peak memory overhead is therefore O(chunksize * n_threads) rather
+    than O(N). Random metrics draw each chunk from an independent generator
+    seeded from this module's generator, so their results depend on the 
+    chunksize but not on the number of threads.
+
+    Parameters
+    ----------
+    metric : str
+        the metric to calculate
+    Y_mean : np.ndarray
+        the mean predicted y values. Should be of type float32 to avoid an
+        extra copy
+    Y_var : Optional[np.ndarray] (Default = None)
+        the variances of the mean predicted y values. Only required by 
+        metrics that need variances
+    current_max : float (Default = -inf)
+    threshold : float (Default = -inf)
+    beta : int (Default = 2)
+    xi : float (Default = 0.01)
+    stochastic : bool (Default = False)
+    out : Optional[np.ndarray] (Default = None)
+        a float32 array of the same shape as Y_mean into which to write the
+        scores. If None, allocate a new one
+    chunksize : int (Default = 65536)
+        the number of elements to process at a time
+    n_threads : Optional[int] (Default = None)
+        the number of threads over which to process chunks. If None, use
+        all available cores
+
+    Returns
+    -------
+    out : np.ndarray
+        the acquisition scores
+
+    Raises
+    ------
+    ValueError
+        if metric is not a recognized metric
+        if out is not a float32 array of the same shape as Y_mean
+    """
+    try:
+        kernel = {
+            'random': _random_chunk,
+            'threshold': _threshold_chunk,
+            'greedy': _greedy_chunk,
+            'noisy': _noisy_chunk,
+            'ucb': _ucb_chunk,
+            'lcb': _lcb_chunk,
+            'ts': _thompson_chunk,
+            'thompson': _thompson_chunk,
+            'ei': _ei_chunk,
+            'pi': _pi_chunk,
+        }[metric]
+    except KeyError:
+        raise ValueError(f'Unrecognized metric: "{metric}"')
+
+    Y_mean = np.asarray(Y_mean, dtype=np.float32)
+    if Y_var is not None and len(Y_var) > 0:
+        Y_var = np.asarray(Y_var, dtype=np.float32)
+    else:
+        Y_var = None
+
+    if out is None:
+        out = np.empty(Y_mean.shape, dtype=np.float32)
+    elif out.shape != Y_mean.shape or out.dtype != np.float32:
+        raise ValueError(
+            f'out must be a float32 array of shape {Y_mean.shape}!')
+
+    params = dict(
+        threshold=threshold, beta=beta, stochastic=stochastic,
+        c=current_max - xi,
+        sd=_std_chunked(Y_mean, chunksize) if metric == 'noisy' else None
+    )
+
+    starts = range(0, len(Y_mean), chunksize)
+    seeds = RG.integers(2**63, size=len(starts))
+
+    def run_chunk(start, seed):
+        i, j = start, start+chunksize
+        # numpy error states are thread-local
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            kernel(
+                Y_mean[i:j], Y_var[i:j] if Y_var is not None else None,
+                out[i:j], rng=np.random.default_rng(seed), **params
+            )
+
+    with ThreadPoolExecutor(n_threads or MAX_CPU) as pool:
+        list(pool.map(run_chunk, starts, seeds))
+
+    return out
+
+def _std_chunked(Y: np.ndarray, chunksize: int) -> float:
+    """Calculate the standard deviation of Y in two chunked passes"""
+    n = len(Y)
+    if n == 0:
+        return 0.
+
+    mean = sum(
+        Y[i:i+chunksize].sum(dtype=np.float64) for i in range(0, n, chunksize)
+    ) / n
+    ssd = sum(
+        np.square(Y[i:i+chunksize] - mean, dtype=np.float64).sum()
+        for i in range(0, n, chunksize)
+    )
+    return math.sqrt(ssd / n)
+
+def _random_chunk(Y_mean, Y_var, out, rng, **kwargs):
+    rng.random(dtype=np.float32, out=out)
+
+def _threshold_chunk(Y_mean, Y_var, out, rng, threshold, **kwargs):
+    rng.random(dtype=np.float32, out=out)
+    out[Y_mean < threshold] = -1.
+
+def _greedy_chunk(Y_mean, Y_var, out, **kwargs):
+    out[:] = Y_mean
+
+def _noisy_chunk(Y_mean, Y_var, out, rng, sd, **kwargs):
+    rng.standard_normal(dtype=np.float32, out=out)
+    out *= sd
+    out += Y_mean
+
+def _ucb_chunk(Y_mean, Y_var, out, beta, **kwargs):
+    np.sqrt(Y_var, out=out)
+    out *= beta
+    out += Y_mean
+
+def _lcb_chunk(Y_mean, Y_var, out, beta, **kwargs):
+    np.sqrt(Y_var, out=out)
+    out *= -beta
+    out += Y_mean
+
+def _thompson_chunk(Y_mean, Y_var, out, rng, stochastic, **kwargs):
+    if stochastic:
+        out[:] = Y_mean
+        return
+
+    rng.standard_normal(dtype=np.float32, out=out)
+    out *= np.sqrt(Y_var)
+    out += Y_mean
+
+def _ei_chunk(Y_mean, Y_var, out, c, **kwargs):
+    I = Y_mean - np.float32(c)
+    Y_sd = np.sqrt(Y_var)
+    Z = I / Y_sd
+
+    ndtr(Z, out=out)
+    out *= I
+
+    # pdf(Z) = exp(-Z^2 / 2) / sqrt(2 pi), calculated in place
+    np.square(Z, out=Z)
+    Z *= -0.5
+    np.exp(Z, out=Z)
+    Z *= INV_SQRT_2PI
+    Z *= Y_sd
+    out += Z
+
+    np.copyto(out, I, where=(Y_var == 0))
+
+def _pi_chunk(Y_mean, Y_var, out, c, **kwargs):
+    I = Y_mean - np.float32(c)
+    Z = I / np.sqrt(Y_var)
+
+    ndtr(Z, out=out)
+
+    np.copyto(out, I > 0, where=(Y_var == 0))
+
 def random(Y_mean: np.ndarray) -> np.ndarray:
     """Random acquistion score
 
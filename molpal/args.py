@@ -49,10 +49,20 @@ def add_general_args(parser: ArgumentParser) -> None:
                         help='the number of cores to available to each worker/job/process/node. If performing docking, this is also the number of cores multithreaded docking programs will utilize.')
     parser.add_argument('--distributed', action='store_true', default=False,
                         help='whether the calculations will be distributed over an MPI setup')
+    parser.add_argument('--pipeline-frac', type=restricted_float,
+                        help='if specified, run exploration in pipelined mode: objective function evaluation runs in the background and the next batch is acquired as soon as this fraction of the current batch has been evaluated')
+    parser.add_argument('--continuous', action='store_true', default=False,
+                        help='whether to explore in continuous (steady-state) mode, streaming inputs to the objective and topping up its queue from the current acquisition ranking rather than evaluating discrete batches')
+    parser.add_argument('--retrain-every', type=int,
+                        help='the number of new results after which to retrain the model when exploring in continuous mode. By default, equal to the batch size')
+    parser.add_argument('--prune-epochs', type=int,
+                        help='the number of consecutive prediction updates over which the upper confidence bound of an input must stay below the current top-k threshold for it to be permanently pruned from the candidate pool. Pruned inputs are neither predicted nor acquired. By default, no inputs are pruned')
+    parser.add_argument('--prune-beta', type=float, default=2.,
+                        help='the beta value with which to calculate upper confidence bounds for pruning')
 
     parser.add_argument('--write-intermediate', 
                         action='store_true', default=False,
-                        help='whether to write a summary file with all of the explored inputs and their associated scores after each round of exploration')
+                        help='whether to append the inputs explored in each round of exploration and their associated scores to an append-only score log (<root>/<name>/data/scores.h5). Sorted CSV views may be produced with scripts/materialize_scores.py')
     parser.add_argument('--write-final', action='store_true', default=False,
                         help='whether to write a summary file with all of the explored inputs and their associated scores')
     parser.add_argument('-m', '--top-m', type=restricted_float_or_int, 
@@ -61,13 +71,22 @@ def add_general_args(parser: ArgumentParser) -> None:
 
     parser.add_argument('--save-preds', action='store_true', default=False,
                         help='whether to write the full prediction data to a file each time the predictions are updated')
+    parser.add_argument('--preds-dtype', default='float32',
+                        choices={'float16', 'float32'},
+                        help='the floating point type in which to write the predictions when using --save-preds')
+    parser.add_argument('--preds-top-n', type=int,
+                        help='the number of top predicted inputs to additionally write to a CSV file when using --save-preds')
     parser.add_argument('--save-state', action='store_true', default=False,
-                        help='whether to save the state of the explorer before each batch')
+                        help='whether to periodically write checkpoints of the full explorer state (labels, stopping criteria, acquirer RNG state, model, and predictions)')
+    parser.add_argument('--checkpoint-freq', type=int, default=1,
+                        help='the number of epochs between checkpoints when using --save-state')
+    parser.add_argument('--checkpoint',
+                        help='the path of a checkpoint directory written by a previous run from which to resume exploration')
 
     parser.add_argument('--previous-scores',
                         help='the path to a file containing the scores from a previous run of molpal to load in as preliminary dataset.')
     parser.add_argument('--scores-csvs', nargs='+',
-                        help='Either (1) A list of filepaths containing the outputs from a previous exploration or (2) a pickle file containing this list. Will load these files in the order in which they are passed to mimic the intermediate state of a previous exploration. Specifying a single will be interpreted as passing a pickle file. If seeking to mimic the state after only one round of exploration, use the --previous-scores argument instead and leave this option empty.')
+                        help='Either (1) A list of filepaths containing the outputs (CSVs or a score log) from a previous exploration or (2) a pickle file containing this list. Will load these files in the order in which they are passed to mimic the intermediate state of a previous exploration. Specifying a single will be interpreted as passing a pickle file. If seeking to mimic the state after only one round of exploration, use the --previous-scores argument instead and leave this option empty.')
 
     parser.add_argument('--root', default='.',
                         help='the root directory under which to organize all program outputs')
@@ -131,6 +150,16 @@ def add_acquisition_args(parser: ArgumentParser) -> None:
     parser.add_argument('--temp-f', type=float, default=1.,
                         help='the final temperature used in the greedy metric')
 
+    parser.add_argument('--max-similarity', type=float,
+                        help='the maximum Tanimoto similarity allowed between any two ligands in a batch. If not specified, batches are not diversified')
+    parser.add_argument('--shortlist-factor', type=int, default=10,
+                        help='the size of the shortlist of top ligands from which a diversified batch is selected, as a multiple of the batch size')
+
+    parser.add_argument('--cost-aware', action='store_true', default=False,
+                        help='whether to rank ligands by their acquisition utility per predicted CPU-second. Costs are predicted by a model trained on the CPU times recorded by the objective, e.g., the wall times of docking runs')
+    parser.add_argument('--cpu-budget', type=float,
+                        help='the total predicted CPU time in seconds to spend on each batch. If specified, the batch size is instead used to determine the size of the shortlist from which the batch is filled')
+
     parser.add_argument('--xi', type=float, default=0.01,
                         help='the xi value to use in EI and PI metrics')
     parser.add_argument('--beta', type=int, default=2,
@@ -211,7 +240,8 @@ def modify_LookupObjective_args(args: Namespace) -> None:
 #       MODEL ARGUMENTS       #
 ###############################
 def add_model_args(parser: ArgumentParser) -> None:
-    parser.add_argument('--model', choices=('rf', 'gp', 'nn', 'mpn'),
+    parser.add_argument('--model', choices=('rf', 'gb', 'gp', 'sgp', 'knn',
+                                            'linear', 'nn', 'mpn'),
                         default='rf',
                         help='the model type to use')
     parser.add_argument('--test-batch-size', type=int,
@@ -219,11 +249,52 @@ def add_model_args(parser: ArgumentParser) -> None:
     parser.add_argument('--retrain-from-scratch', 
                         action='store_true', default=False,
                         help='whether the model should be retrained from scratch at each iteration as opposed to retraining online.')
+
+    parser.add_argument('--cascade-frac', type=float,
+                        help='the fraction of the pool to pass from the prefilter model to the model during cascade inference. If specified, a cheap prefilter model first predicts the entire pool and only the inputs with the highest predicted scores are predicted by the model and considered for acquisition')
+    parser.add_argument('--prefilter-model',
+                        choices=('rf', 'gb', 'gp', 'sgp', 'knn', 'linear',
+                                 'nn'),
+                        default='rf',
+                        help='the model type to use as the prefilter during cascade inference')
     
+    # RF args
+    parser.add_argument('--rf-online', action='store_true', default=False,
+                        help='whether to train the RF model incrementally: each round of training grows new trees on the most recent training data and retires the oldest trees rather than refitting the entire forest. Only applies when not using --retrain-from-scratch')
+    parser.add_argument('--rf-new-trees', type=int, default=20,
+                        help='the number of trees to grow in each round of online RF training')
+    parser.add_argument('--rf-max-samples', type=int, default=10000,
+                        help='the number of most recent training points on which online RF trees are grown')
+
+    # GB args
+    parser.add_argument('--gb-max-iter', type=int, default=100,
+                        help='the number of boosting iterations of the gradient-boosted tree model')
+    parser.add_argument('--gb-lr', type=float, default=0.1,
+                        help='the learning rate of the gradient-boosted tree model')
+
     # GP args
-    parser.add_argument('--gp-kernel', choices={'dotproduct'},
+    parser.add_argument('--gp-kernel', choices={'dotproduct', 'tanimoto'},
                         default='dotproduct',
-                        help='Kernel to use for Gaussian Process model')
+                        help='Kernel to use for Gaussian Process model. The tanimoto kernel is calculated with popcount on bit-packed fingerprints')
+
+    # kNN args
+    parser.add_argument('--knn-k', type=int, default=10,
+                        help='the number of nearest neighbors from which the kNN model makes its predictions')
+
+    # online linear args
+    parser.add_argument('--linear-heads', type=int, default=8,
+                        help='the number of bootstrapped heads of the online linear model, the disagreement between which is its predicted variance')
+    parser.add_argument('--linear-alpha', type=float, default=1e-4,
+                        help='the L2 regularization strength of the online linear model')
+    parser.add_argument('--linear-iter', type=int, default=5,
+                        help='the number of passes over the new data in each update of the online linear model')
+
+    # sparse GP args
+    parser.add_argument('--n-inducing', type=int, default=500,
+                        help='the number of inducing points of the sparse GP model')
+    parser.add_argument('--inducing-method', choices=('kcenter', 'kmeans'),
+                        default='kcenter',
+                        help='the method with which to select inducing points from the training data for the sparse GP model')
 
     # MPNN args
     parser.add_argument('--init-lr', type=float, default=1e-4,
@@ -283,9 +354,31 @@ def cleanup_args(args: Namespace) -> None:
 
     if not args.cluster:
         args_to_remove |= {'temp_i', 'temp_f'}
-
-    if args.model != 'gp':
+    if args.max_similarity is None:
+        args_to_remove |= {'shortlist_factor'}
+    if args.prune_epochs is None:
+        args_to_remove |= {'prune_beta'}
+    if args.cascade_frac is None:
+        args_to_remove |= {'prefilter_model'}
+
+    if args.model != 'rf' or not args.rf_online:
+        args_to_remove |= {'rf_new_trees', 'rf_max_samples'}
+    if args.model != 'gb' and (
+        args.cascade_frac is None or args.prefilter_model != 'gb'
+    ):
+        args_to_remove |= {'gb_max_iter', 'gb_lr'}
+    if args.model not in ('gp', 'sgp'):
         args_to_remove |= {'gp_kernel'}
+    if args.model != 'sgp':
+        args_to_remove |= {'n_inducing', 'inducing_method'}
+    if args.model != 'knn' and (
+        args.cascade_frac is None or args.prefilter_model != 'knn'
+    ):
+        args_to_remove |= {'knn_k'}
+    if args.model != 'linear' and (
+        args.cascade_frac is None or args.prefilter_model != 'linear'
+    ):
+        args_to_remove |= {'linear_heads', 'linear_alpha', 'linear_iter'}
     if args.model != 'nn':
         args_to_remove |= set()
     if args.model != 'mpn':
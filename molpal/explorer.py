@@ -2,17 +2,28 @@
 for batched, Bayesian optimization."""
 
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import csv
 import heapq
-from itertools import zip_longest
+from itertools import compress, islice
+import math
 import os
-from operator import itemgetter
 from pathlib import Path
 import pickle
+import queue
+import shutil
 import tempfile
-from typing import Dict, List, Optional, Tuple, TypeVar, Union
+import timeit
+from typing import Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+
+import numpy as np
 
 from molpal import acquirer, encoder, models, objectives, pools
+from molpal.models.costmodel import CostModel
+from molpal.models.utils import PoolFeaturizer
+from molpal.scorelog import ScoreLog
+from molpal.tracker import TopKTracker
+from molpal.writer import BackgroundWriter
 
 T = TypeVar('T')
 
@@ -28,6 +39,9 @@ class Explorer:
     encoder : Encoder
         the encoder this explorer will use convert molecules from SMILES
         strings into feature representations
+    featurizer : PoolFeaturizer
+        the featurizer used to train models, which reads the precalculated
+        feature representations of acquired inputs from the pool
     acquirer : Acquirer
         an acquirer which selects molecules to explore next using a prior
         distribution over the inputs
@@ -51,6 +65,11 @@ class Explorer:
     new_scores : Dict[T, float]
         a dictionary mapping an input's identifier to its corresponding
         objective function value for the most recent batch of labeled inputs
+    acquired : np.ndarray
+        a boolean mask parallel to the pool that is True for each input that
+        has been acquired, i.e., explored, failed, or pending evaluation
+    cluster_ids : Optional[np.ndarray]
+        the cluster ID of each input in the pool, if it is clustered
     updated_model : bool
         whether the predictions are currently out-of-date with the model
     top_k_avg : float
@@ -61,6 +80,12 @@ class Explorer:
     y_vars : List[float]
         a list parallel to the pool containing the variance in the predicted
         score for an input. Will be empty if model does not provide variance
+    cost_model : Optional[CostModel]
+        the model used to predict the cost of evaluating each input, if the
+        acquirer is cost-aware or has a CPU budget
+    y_costs : Optional[np.ndarray]
+        an array parallel to the pool containing the predicted cost of each
+        input. None until the objective has recorded any costs
     recent_avgs : Deque[float]
         a queue containing the <window_size> most recent averages
     delta : float
@@ -74,14 +99,54 @@ class Explorer:
         whether the list of explored inputs and their scores should be written
         to a file at the end of exploration
     write_intermediate : bool
-        whether the list of explored inputs and their scores should be written
-        to a file after each round of exploration
+        whether the inputs explored in each round of exploration and their
+        scores should be appended to the score log
+    score_log : ScoreLog
+        the append-only log of explored inputs and their scores
     scores_csvs : List[str]
-        a list containing the filepath of each score file that was written
-        in the order in which they were written. Used only when saving the
-        intermediate state to initialize another explorer
-    write_preds : bool
+        a list containing the filepath of each score file (CSV or score log)
+        that was written in the order in which they were written. Used only
+        when saving the intermediate state to initialize another explorer
+    save_preds : bool
         whether the predictions should be written after each exploration batch
+    preds_dtype : str
+        the floating point type in which to write the predictions
+    preds_top_n : Optional[int]
+        the number of top predicted inputs to additionally write to a CSV
+        file each time the predictions are written
+    pipeline_frac : Optional[float]
+        if not None, the explorer runs in pipelined mode: objective function
+        evaluation runs in the background and the next batch is acquired as
+        soon as this fraction of the current batch has been evaluated
+    continuous : bool
+        whether to explore in continuous (steady-state) mode rather than in
+        discrete batches
+    retrain_every : int
+        in continuous mode, the number of new results after which the model
+        is retrained and the acquisition ranking is recalculated
+    save_state : bool
+        whether to periodically write checkpoints of the explorer state
+    checkpoint_freq : int
+        the number of epochs between checkpoints
+    prune_epochs : Optional[int]
+        if not None, the number of consecutive prediction updates over which
+        the upper confidence bound of an input must stay below the current
+        top-k threshold for the input to be pruned from the candidate pool
+    prune_beta : float
+        the beta value used to calculate upper confidence bounds for pruning
+    active : np.ndarray
+        a boolean mask parallel to the pool that is False for each input that
+        has been pruned. Pruned inputs are neither predicted nor acquired
+    cascade_frac : Optional[float]
+        if not None, predictions are made in two stages: the prefilter model
+        predicts every active input and only this fraction of them, those
+        with the highest predicted means, is predicted by the model
+    prefilter : Optional[Model]
+        the cheap model used in the first stage of cascade inference
+    survivors : Optional[np.ndarray]
+        a boolean mask parallel to the pool that is True for each input that
+        passed the prefilter in the latest cascade inference. Only survivors
+        are acquired
     verbose : int
         the level of output the Explorer prints
 
@@ -98,7 +163,13 @@ class Explorer:
     write_final : bool (Default = True)
     write_intermediate : bool (Default = False)
     save_preds : bool (Default = False)
+    preds_dtype : str (Default = 'float32')
+    preds_top_n : Optional[int] (Default = None)
     retrain_from_scratch : bool (Default = False)
+    pipeline_frac : Optional[float] (Default = None)
+    continuous : bool (Default = False)
+    retrain_every : Optional[int] (Default = None)
+        if None, use the batch size of the acquirer
     previous_scores : Optional[str] (Default = None)
         the filepath of a CSV file containing previous scoring data which will
         be treated as the initialization batch (instead of randomly selecting
@@ -108,7 +179,20 @@ class Explorer:
         pickle file containing this list. These
         CSVs will be read in and the model trained on the data in the order
         in which the CSVs are provide. This is useful for mimicking the
-        intermediate state of a previous Explorer instance
+        intermediate state of a previous Explorer instance. Score logs 
+        (.h5 files) may be passed in place of CSVs, in which case each
+        epoch of the log is replayed in turn
+    save_state : bool (Default = False)
+    checkpoint_freq : int (Default = 1)
+    checkpoint : Optional[str] (Default = None)
+        the path of a checkpoint written by a previous explorer from which to
+        resume exploration. Takes precedence over both previous_scores and
+        scores_csvs
+    prune_epochs : Optional[int] (Default = None)
+    prune_beta : float (Default = 2.)
+    cascade_frac : Optional[float] (Default = None)
+    prefilter_model : str (Default = 'rf')
+        the type of model to use as the prefilter in cascade inference
     verbose : int (Default = 0)
     **kwargs
         keyword arguments to initialize an Encoder, MoleculePool, Acquirer, 
@@ -119,15 +203,28 @@ class Explorer:
     ValueError
         if k is less than 0
         if max_explore is less than 0
+        if pipeline_frac is not in (0, 1]
+        if prune_epochs is less than 1
+        if cascade_frac is not in (0, 1]
     """
     def __init__(self, name: str = 'molpal',
                  k: Union[int, float] = 0.01, window_size: int = 3,
                  delta: float = 0.01, max_epochs: int = 50, 
                  max_explore: Union[int, float] = 1., root: str = '.',
                  write_final: bool = True, write_intermediate: bool = False,
-                 save_preds: bool = False, retrain_from_scratch: bool = False,
+                 save_preds: bool = False, preds_dtype: str = 'float32',
+                 preds_top_n: Optional[int] = None,
+                 retrain_from_scratch: bool = False,
+                 pipeline_frac: Optional[float] = None,
+                 continuous: bool = False,
+                 retrain_every: Optional[int] = None,
                  previous_scores: Optional[str] = None,
                  scores_csvs: Union[str, List[str], None] = None,
+                 save_state: bool = False, checkpoint_freq: int = 1,
+                 checkpoint: Optional[str] = None,
+                 prune_epochs: Optional[int] = None, prune_beta: float = 2.,
+                 cascade_frac: Optional[float] = None,
+                 prefilter_model: str = 'rf',
                  verbose: int = 0, **kwargs):
         self.name = name; kwargs['name'] = name
         self.verbose = verbose; kwargs['verbose'] = verbose
@@ -137,16 +234,40 @@ class Explorer:
         self.encoder = encoder.Encoder(**kwargs)
         self.pool = pools.pool(encoder=self.encoder, 
                                path=tempfile.gettempdir(), **kwargs)
+        self.featurizer = PoolFeaturizer(
+            self.pool, self.encoder.encode_and_uncompress
+        )
         self.acquirer = acquirer.Acquirer(size=len(self.pool), **kwargs)
 
+        self.cluster_ids = self.pool.cluster_ids_
+
         if self.acquirer.metric == 'thompson':
             kwargs['dropout_size'] = 1
         self.model = models.model(input_size=len(self.encoder), **kwargs)
+
+        if cascade_frac is not None and not 0. < cascade_frac <= 1.:
+            raise ValueError(
+                f'cascade_frac(={cascade_frac}) must be in (0, 1]!')
+        self.cascade_frac = cascade_frac
+        if cascade_frac is not None:
+            self.prefilter = models.model(
+                input_size=len(self.encoder),
+                **{**kwargs, 'model': prefilter_model}
+            )
+        else:
+            self.prefilter = None
+        self.survivors = None
         self.acquirer.stochastic_preds = 'stochastic' in self.model.provides
 
         self.objective = objectives.objective(**kwargs)
 
         self._validate_acquirer()
+
+        if self.acquirer.cost_aware or self.acquirer.cpu_budget is not None:
+            self.cost_model = CostModel(ncpu=kwargs.get('ncpu', 1))
+        else:
+            self.cost_model = None
+        self._n_costs = 0
         
         self.retrain_from_scratch = retrain_from_scratch
 
@@ -158,30 +279,77 @@ class Explorer:
         self.write_final = write_final
         self.write_intermediate = write_intermediate
         self.save_preds = save_preds
+        self.preds_dtype = preds_dtype
+        self.preds_top_n = preds_top_n
+
+        if pipeline_frac is not None and not 0. < pipeline_frac <= 1.:
+            raise ValueError(
+                f'pipeline_frac(={pipeline_frac}) must be in (0, 1]!')
+        self.pipeline_frac = pipeline_frac
+        self._executor = None
+        self._results = queue.Queue()
+        self._pending = {}
+
+        self.continuous = continuous
+        self.retrain_every = retrain_every or self.acquirer.batch_size
+
+        self.save_state = save_state
+        self.checkpoint_freq = checkpoint_freq
+
+        if prune_epochs is not None and prune_epochs < 1:
+            raise ValueError(
+                f'prune_epochs(={prune_epochs}) must be at least 1!')
+        self.prune_epochs = prune_epochs
+        self.prune_beta = prune_beta
+
+        self.score_log = ScoreLog(f'{self.root}/{self.name}/data/scores.h5')
+        self._n_logged = (0, 0)
+        self.writer = BackgroundWriter()
 
         # stateful attributes (not including model)
         self.epoch = 0
         self.scores = {}
+        self.tracker = TopKTracker()
         self.failures = {}
+        self.acquired = np.zeros(len(self.pool), dtype=bool)
+        self.active = np.ones(len(self.pool), dtype=bool)
+        self._n_below = np.zeros(len(self.pool), dtype=np.uint16)
         self.new_scores = {}
         self.updated_model = None
         self.recent_avgs = deque(maxlen=window_size)
         self.top_k_avg = None
         self.y_preds = None
         self.y_vars = None
+        self.y_costs = None
 
-        if isinstance(scores_csvs, str):
+        if isinstance(scores_csvs, str) and Path(scores_csvs).suffix == '.h5':
+            self.scores_csvs = [scores_csvs]
+        elif isinstance(scores_csvs, str):
             self.scores_csvs = pickle.load(open(scores_csvs, 'rb'))
         elif isinstance(scores_csvs, list):
             self.scores_csvs = scores_csvs
         else:
             self.scores_csvs = []
 
-        if previous_scores:
+        if checkpoint:
+            self.load_checkpoint(checkpoint)
+        elif previous_scores:
             self.load_scores(previous_scores)
         elif scores_csvs:
             self.load()
 
+        if self.write_intermediate and not checkpoint and not any(
+            Path(p).resolve() == self.score_log.path.resolve()
+            for p in self.scores_csvs
+        ):
+            # a log left behind by a previous run of the same name is only
+            # continued when resuming from it, and only replaced when this
+            # run writes its own
+            self.score_log.truncate(0)
+
+        if len(self) > 0:
+            self._mark_acquired()
+
     @property
     def k(self) -> int:
         """int : The number of top-scoring inputs from which to determine
@@ -241,6 +409,7 @@ class Explorer:
            1. the explorer has successfully explored at least k inputs
            2. the explorer has completed at least <window_size> epochs after
               sub-condition (1) has been met
+        e. every input that has not been pruned has been acquired
 
         Returns
         -------
@@ -249,7 +418,11 @@ class Explorer:
         """
         if self.epoch > self.max_epochs:
             return True
-        if len(self.scores) >= self.max_explore:
+        if len(self.scores) + len(self._pending) >= self.max_explore:
+            return True
+        if self.prune_epochs is not None and (
+            self.acquired | ~self.active
+        ).all():
             return True
 
         if len(self.recent_avgs) < self.recent_avgs.maxlen:
@@ -264,19 +437,30 @@ class Explorer:
     def run(self):
         """Explore the MoleculePool until the stopping condition is met"""
         
-        if self.epoch == 0:
+        if self.continuous:
+            print('Starting continuous exploration ...')
+            self.explore_continuous()
+        elif self.epoch == 0:
             print('Starting Exploration ...')
             self.explore_initial()
         else:
             print(f'Resuming Exploration at epoch {self.epoch}...')
             self.explore_batch()
 
-        while not self.completed:
+        while not self.completed and not self.continuous:
             if self.verbose > 0:
                 print(f'Current average of top {self.k}: {self.top_k_avg:0.3f}',
                       'Continuing exploration ...', flush=True)
             self.explore_batch()
 
+        if self._executor is not None:
+            self._collect_pending(wait_all=True)
+            self.top_k_avg = self.avg()
+
+            n_logged = (len(self.scores), len(self.failures))
+            if self.write_intermediate and self._n_logged != n_logged:
+                self.log_scores()
+
         print('Finished exploring!')
         print(f'Explored a total of {len(self)} molecules',
               f'over {self.epoch} iterations')
@@ -289,10 +473,19 @@ class Explorer:
         if self.write_final:
             self.write_scores(final=True)
 
+        self.writer.flush()
+
     def __len__(self) -> int:
         """The number of inputs that have been explored"""
         return len(self.scores) + len(self.failures)
 
+    @property
+    def pending(self) -> Dict[T, None]:
+        """Dict[T, None] : the inputs that have been acquired but whose
+        objective function evaluation has not yet finished. Always empty
+        unless running in pipelined or continuous mode"""
+        return dict(self._pending)
+
     def explore_initial(self) -> float:
         """Perform an initial round of exploration
         
@@ -303,17 +496,13 @@ class Explorer:
         avg : float
             the average score of the batch
         """
-        inputs = self.acquirer.acquire_initial(
-            xs=self.pool.smis(),
-            cluster_ids=self.pool.cluster_ids(),
+        idxs = self.acquirer.acquire_initial_idxs(
+            cluster_ids=self.cluster_ids,
             cluster_sizes=self.pool.cluster_sizes,
         )
+        inputs = self._take(idxs)
 
-        new_scores = self.objective.calc(
-            inputs,
-            in_path=f'{self.tmp}/{self.name}/inputs/iter_{self.epoch}',
-            out_path=f'{self.tmp}/{self.name}/outputs/iter_{self.epoch}'
-        )
+        new_scores = self._calc(inputs)
         self._clean_and_update_scores(new_scores)
 
         self.top_k_avg = self.avg()
@@ -321,10 +510,13 @@ class Explorer:
             self.recent_avgs.append(self.top_k_avg)
 
         if self.write_intermediate:
-            self.write_scores(include_failed=True)
+            self.log_scores()
         
         self.epoch += 1
 
+        if self.save_state and self.epoch % self.checkpoint_freq == 0:
+            self.checkpoint()
+
         valid_scores = [y for y in new_scores.values() if y is not None]
         return sum(valid_scores)/len(valid_scores)
 
@@ -353,18 +545,15 @@ class Explorer:
         self._update_model()
         self._update_predictions()
 
-        inputs = self.acquirer.acquire_batch(
-            xs=self.pool.smis(), y_means=self.y_preds, y_vars=self.y_vars,
-            explored={**self.scores, **self.failures},
-            cluster_ids=self.pool.cluster_ids(),
-            cluster_sizes=self.pool.cluster_sizes, epoch=self.epoch,
-        )
+        idxs = self._acquire_batch_idxs()
+        if len(idxs) == 0:
+            # every remaining input was pruned by the latest predictions
+            self.epoch += 1
+            return self.top_k_avg
 
-        new_scores = self.objective.calc(
-            inputs,
-            in_path=f'{self.tmp}/{self.name}/inputs/iter_{self.epoch}',
-            out_path=f'{self.tmp}/{self.name}/outputs/iter_{self.epoch}'
-        )
+        inputs = self._take(idxs)
+
+        new_scores = self._calc(inputs)
         self._clean_and_update_scores(new_scores)
 
         self.top_k_avg = self.avg()
@@ -372,13 +561,189 @@ class Explorer:
             self.recent_avgs.append(self.top_k_avg)
 
         if self.write_intermediate:
-            self.write_scores(include_failed=True)
+            self.log_scores()
         
         self.epoch += 1
 
+        if self.save_state and self.epoch % self.checkpoint_freq == 0:
+            self.checkpoint()
+
         valid_scores = [y for y in new_scores.values() if y is not None]
         return sum(valid_scores)/len(valid_scores)
 
+    def explore_continuous(self) -> None:
+        """Explore the pool in steady-state until the stopping condition is
+        met
+
+        Rather than evaluating discrete batches, the objective consumes a 
+        stream of inputs and reports each result as soon as it finishes. The
+        stream is topped up from the current acquisition ranking, so the
+        objective never waits on the slowest input of a batch. Every
+        <retrain_every> new results (or whenever the ranking has been used 
+        up and more inputs may be acquired), the model is retrained and the
+        ranking recalculated, which marks the end of an epoch. Once no more
+        inputs may be acquired, the remaining results are drained and
+        recorded in a final epoch.
+        """
+        ranking = deque()
+
+        if self.epoch == 0:
+            idxs = self.acquirer.acquire_initial_idxs(
+                cluster_ids=self.cluster_ids,
+                cluster_sizes=self.pool.cluster_sizes,
+            )
+            ranking.extend(zip(idxs, self._take(idxs)))
+        else:
+            self._rerank(ranking)
+
+        def candidates():
+            while ranking and not self.completed:
+                _, x = ranking.popleft()
+                if (x in self.scores or x in self.failures
+                        or x in self._pending):
+                    continue
+
+                self._pending[x] = None
+                yield x
+
+        n_new = 0
+        while ranking and not self.completed:
+            stream = self.objective.stream(
+                candidates(),
+                in_path=f'{self.tmp}/{self.name}/inputs/stream',
+                out_path=f'{self.tmp}/{self.name}/outputs/stream'
+            )
+            for x, y in stream:
+                self._pending.pop(x, None)
+                self._clean_and_update_scores({x: y})
+                n_new += 1
+
+                # only the consumer may refill the ranking, so do it before
+                # the stream finds it empty and stops pulling inputs
+                if (n_new >= self.retrain_every
+                        or not ranking and not self._exhausted()):
+                    self._end_continuous_epoch()
+                    self._rerank(ranking)
+                    n_new = 0
+
+            if not ranking and not self._exhausted():
+                self._end_continuous_epoch()
+                self._rerank(ranking)
+                n_new = 0
+
+        if ranking:
+            self.acquired[[i for i, _ in ranking]] = False
+        if n_new > 0:
+            self._end_continuous_epoch()
+
+    def _end_continuous_epoch(self) -> None:
+        """Update the stopping criteria and outputs at the end of a
+        continuous epoch"""
+        self.top_k_avg = self.avg()
+        if len(self.scores) >= self.k:
+            self.recent_avgs.append(self.top_k_avg)
+
+        if self.write_intermediate:
+            self.log_scores()
+
+        if self.verbose > 0:
+            print(f'Current average of top {self.k}: {self.top_k_avg:0.3f}',
+                  flush=True)
+
+        self.epoch += 1
+
+        if self.save_state and self.epoch % self.checkpoint_freq == 0:
+            self.checkpoint()
+
+    def _rerank(self, ranking: deque) -> None:
+        """Retrain the model and replace the contents of ranking with
+        a new batch of inputs to explore
+        
+        Side effects
+        ------------
+        (mutates) ranking : deque
+            the indices and inputs to explore next. Left empty if the pool
+            is exhausted or the explorer has completed
+        (mutates) self.acquired : np.ndarray
+            unmarks the inputs that were left in the ranking
+        """
+        if ranking:
+            self.acquired[[i for i, _ in ranking]] = False
+        ranking.clear()
+        if self._exhausted():
+            return
+
+        self._update_model()
+        self._update_predictions()
+
+        idxs = self._acquire_batch_idxs()
+        ranking.extend(zip(idxs, self._take(idxs)))
+
+    def _exhausted(self) -> bool:
+        """Whether no more inputs may be acquired, either because the
+        explorer has completed or because every input in the pool has been
+        acquired, pruned, or filtered out"""
+        return self.completed or self._unavailable().all()
+
+    def _acquire_batch_idxs(self) -> np.ndarray:
+        """Acquire the indices of the next batch of inputs to explore"""
+        return self.acquirer.acquire_batch_idxs(
+            y_means=self.y_preds, y_vars=self.y_vars,
+            explored=self._unavailable(),
+            current_max=self.tracker.threshold(1),
+            cluster_ids=self.cluster_ids,
+            cluster_sizes=self.pool.cluster_sizes, epoch=self.epoch,
+            get_fps=self.pool.get_packed_fps, costs=self.y_costs
+        )
+
+    def _unavailable(self) -> np.ndarray:
+        """Get a boolean mask parallel to the pool that is True for each
+        input that may not be acquired: those that have already been
+        acquired, pruned, or filtered out by the cascade prefilter"""
+        unavailable = self.acquired
+        if self.prune_epochs is not None:
+            unavailable = unavailable | ~self.active
+        if self.survivors is not None:
+            unavailable = unavailable | ~self.survivors
+
+        return unavailable
+
+    def _take(self, idxs: np.ndarray) -> List[T]:
+        """Mark the inputs at the given pool indices as acquired and return
+        them in the same order as idxs"""
+        self.acquired[idxs] = True
+
+        if len(idxs) == 0:
+            return []
+
+        d_idx_smi = dict(zip(sorted(idxs), self.pool.get_smis(idxs)))
+        self.featurizer.idxs.update(
+            (smi, int(i)) for i, smi in d_idx_smi.items()
+        )
+
+        return [d_idx_smi[i] for i in idxs]
+
+    def _mark_acquired(self) -> None:
+        """Mark the explored and failed inputs in self.acquired. Used after
+        loading scores that were not acquired by this explorer. Inputs whose
+        pool index is already known to the featurizer are marked directly"""
+        explored = self.scores.keys() | self.failures.keys()
+        idxs = self.featurizer.idxs
+
+        self.acquired = np.zeros(len(self.pool), dtype=bool)
+        self.acquired[[idxs[x] for x in explored if x in idxs]] = True
+
+        # the pool indices of inputs that were not acquired by an explorer
+        # must be found by reading the pool, but only until all are found
+        unknown = explored - idxs.keys()
+        for i, smi in enumerate(self.pool.smis()):
+            if not unknown:
+                break
+            if smi in unknown:
+                unknown.remove(smi)
+                self.acquired[i] = True
+                idxs[smi] = i
+
     def avg(self, k: Union[int, float, None] = None) -> float:
         """Calculate the average of the top k molecules
         
@@ -399,12 +764,8 @@ class Explorer:
         k = k or self.k
         if isinstance(k, float):
             k = int(k * len(self.pool))
-        k = min(k, len(self.scores))
 
-        if k == len(self.pool):
-            return sum(score for score in self.scores.items()) / k
-        
-        return sum(score for smi, score in self.top_explored(k)) / k
+        return self.tracker.avg(k)
 
     def top_explored(self, k: Union[int, float, None] = None) -> List[Tuple]:
         """Get the top-k explored molecules
@@ -426,12 +787,8 @@ class Explorer:
         k = k or self.k
         if isinstance(k, float):
             k = int(k * len(self.pool))
-        k = min(k, len(self.scores))
 
-        if k / len(self.scores) < 0.8:
-            return heapq.nlargest(k, self.scores.items(), key=itemgetter(1))
-        
-        return sorted(self.scores.items(), key=itemgetter(1), reverse=True)
+        return self.tracker.top(k)
 
     def top_preds(self, k: Union[int, float, None] = None) -> List[Tuple]:
         """Get the current top predicted molecules and their scores
@@ -499,17 +856,40 @@ class Explorer:
             p_scores = p_data / f'top_{m}_explored_iter_{self.epoch}.csv'
         self.scores_csvs.append(str(p_scores))
 
-        top_m = self.top_explored(m)
+        rows = self.top_explored(m)
+        if include_failed:
+            rows.extend(self.failures.items())
 
-        with open(p_scores, 'w') as fid:
-            writer = csv.writer(fid)
-            writer.writerow(['smiles', 'score'])
-            writer.writerows(top_m)
-            if include_failed:
-                writer.writerows(self.failures.items())
+        self.writer.submit(
+            p_scores, write_csv, p_scores, ['smiles', 'score'], rows
+        )
         
         if self.verbose > 0:
-            print(f'Results were written to "{p_scores}"')
+            print(f'Results are being written to "{p_scores}"')
+
+    def log_scores(self) -> None:
+        """Append the labels acquired since the last call to the score log
+
+        Unlike write_scores(), which rewrites every explored input each time
+        it is called, this only writes the new labels, tagged with the 
+        current epoch. Sorted CSV views of the log at any epoch may be
+        materialized with scripts/materialize_scores.py
+        """
+        n_scores, n_failures = self._n_logged
+        new_scores = dict(islice(self.scores.items(), n_scores, None))
+        new_failures = list(islice(self.failures.keys(), n_failures, None))
+
+        self.writer.submit(
+            self.score_log.path, self.score_log.append,
+            new_scores, new_failures, self.epoch
+        )
+        self._n_logged = (len(self.scores), len(self.failures))
+
+        if str(self.score_log.path) not in self.scores_csvs:
+            self.scores_csvs.append(str(self.score_log.path))
+
+        if self.verbose > 0:
+            print(f'New results are being logged to "{self.score_log.path}"')
 
     def load_scores(self, previous_scores: str) -> None:
         """Load the scores CSV located at saved_scores.
@@ -531,6 +911,7 @@ class Explorer:
 
         scores, failures = self._read_scores(previous_scores)
         self.scores.update(scores)
+        self.tracker = TopKTracker(self.scores)
         self.failures.update(failures)
         
         if self.epoch == 0:
@@ -545,11 +926,146 @@ class Explorer:
             p_states.mkdir(parents=True)
         
         p_state = p_states / f'epoch_{self.epoch}.pkl'
-        with open(p_state, 'wb') as fid:
-            pickle.dump(self.scores_csvs, fid)
+        self.writer.submit(
+            p_state, write_bytes, p_state, pickle.dumps(self.scores_csvs)
+        )
 
         return str(p_state)
 
+    def close(self) -> None:
+        """Wait for all outputs to finish writing and flush them to disk"""
+        self.writer.close()
+
+    def checkpoint(self, interrupted: bool = False) -> str:
+        """Write a checkpoint of the full explorer state
+
+        A checkpoint is a directory containing the labeled data and stopping
+        criteria state (state.pkl), the random number generator states of 
+        the acquirer, the serialized model, and the current predictions
+        (preds.npz.) Unlike the states written by save(), resuming from a
+        checkpoint requires no retraining of the model. Inputs whose
+        evaluation is still pending are not included.
+
+        The checkpoint is written to a temporary directory that is then
+        moved into place, so a checkpoint directory is always complete.
+
+        Parameter
+        ---------
+        interrupted : bool (Default = False)
+            whether the current epoch was interrupted. If so, the checkpoint
+            is written to epoch_{epoch}_interrupted so that it never replaces
+            the checkpoint of a finished epoch.
+
+        Returns
+        -------
+        str
+            the path of the checkpoint directory
+        """
+        p_chkpts = Path(f'{self.root}/{self.name}/chkpts')
+        p_chkpts.mkdir(parents=True, exist_ok=True)
+
+        name = f'epoch_{self.epoch}' + ('_interrupted' if interrupted else '')
+        p_chkpt = p_chkpts / name
+        p_tmp = Path(tempfile.mkdtemp(prefix=f'.{name}.', dir=p_chkpts))
+        try:
+            self._write_checkpoint(p_tmp)
+        except BaseException:
+            shutil.rmtree(p_tmp, ignore_errors=True)
+            raise
+
+        if p_chkpt.exists():
+            # a directory can only be renamed onto an empty one
+            p_old = Path(tempfile.mkdtemp(prefix=f'.{name}.', dir=p_chkpts))
+            os.replace(p_chkpt, p_old)
+            os.replace(p_tmp, p_chkpt)
+            shutil.rmtree(p_old)
+        else:
+            os.replace(p_tmp, p_chkpt)
+
+        if self.verbose > 0:
+            print(f'Checkpoint was written to "{p_chkpt}"')
+
+        return str(p_chkpt)
+
+    def _write_checkpoint(self, p_chkpt: Path) -> None:
+        """Write the contents of a checkpoint into the directory p_chkpt"""
+        state = {
+            'epoch': self.epoch,
+            'scores': self.scores,
+            'failures': self.failures,
+            'new_scores': self.new_scores,
+            'updated_model': self.updated_model,
+            'recent_avgs': list(self.recent_avgs),
+            'top_k_avg': self.top_k_avg,
+            'scores_csvs': self.scores_csvs,
+            'rng_state': self.acquirer.rng_state,
+            'active': self.active,
+            'n_below': self._n_below,
+            'survivors': self.survivors,
+            'idxs': self.featurizer.idxs,
+        }
+        with open(p_chkpt / 'state.pkl', 'wb') as fid:
+            pickle.dump(state, fid, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.model.save(str(p_chkpt / 'model'))
+        if self.prefilter is not None:
+            self.prefilter.save(str(p_chkpt / 'prefilter'))
+
+        if self.y_preds is not None:
+            np.savez(p_chkpt / 'preds.npz',
+                     y_preds=np.asarray(self.y_preds),
+                     y_vars=np.asarray(self.y_vars))
+
+    def load_checkpoint(self, checkpoint: str) -> None:
+        """Restore the explorer state from a checkpoint written by 
+        checkpoint()
+
+        Parameter
+        ---------
+        checkpoint : str
+            the path of the checkpoint directory
+        """
+        if self.verbose > 0:
+            print(f'Loading checkpoint "{checkpoint}" ... ', end='')
+
+        p_chkpt = Path(checkpoint)
+        with open(p_chkpt / 'state.pkl', 'rb') as fid:
+            state = pickle.load(fid)
+
+        self.epoch = state['epoch']
+        self.scores = state['scores']
+        self.tracker = TopKTracker(self.scores)
+        self.failures = state['failures']
+        self.new_scores = state['new_scores']
+        self.updated_model = state['updated_model']
+        self.recent_avgs.extend(state['recent_avgs'])
+        self.top_k_avg = state['top_k_avg']
+        self.scores_csvs = state['scores_csvs']
+        self.acquirer.rng_state = state['rng_state']
+        if 'active' in state:
+            self.active = state['active']
+            self._n_below = state['n_below']
+        self.survivors = state.get('survivors')
+        self.featurizer.idxs.update(state.get('idxs', {}))
+
+        # discard any labels logged after this checkpoint was written
+        if self.write_intermediate:
+            self.score_log.truncate(self.epoch)
+        self._n_logged = (len(self.scores), len(self.failures))
+
+        self.model.load(str(p_chkpt / 'model'))
+        if self.prefilter is not None:
+            self.prefilter.load(str(p_chkpt / 'prefilter'))
+
+        p_preds = p_chkpt / 'preds.npz'
+        if p_preds.exists():
+            preds = np.load(p_preds)
+            self.y_preds = preds['y_preds']
+            self.y_vars = preds['y_vars']
+
+        if self.verbose > 0:
+            print('Done!')
+
     def load(self) -> None:
         """Mimic the intermediate state of a previous explorer run by loading
         the data from the list of output files"""
@@ -558,6 +1074,10 @@ class Explorer:
             print(f'Loading in previous state ... ', end='')
 
         for scores_csv in self.scores_csvs:
+            if Path(scores_csv).suffix == '.h5':
+                self._replay_log(scores_csv)
+                continue
+
             scores, self.failures = self._read_scores(scores_csv)
 
             self.new_scores = {smi: score for smi, score in scores.items()
@@ -567,29 +1087,202 @@ class Explorer:
                 self._update_model()
 
             self.scores = scores
+            self.tracker = TopKTracker(self.scores)
             self.epoch += 1
 
             self.top_k_avg = self.avg()
             if len(self.scores) >= self.k:
                 self.recent_avgs.append(self.top_k_avg)
 
+        # the loaded labels remain reachable through scores_csvs, so only log
+        # the labels acquired from here on
+        self._n_logged = (len(self.scores), len(self.failures))
+
         if self.verbose > 0:
             print('Done!')
 
+    def _replay_log(self, path: str) -> None:
+        """Replay the epochs recorded in the score log at path, updating
+        the model and stopping criteria as if they were being explored"""
+        score_log = ScoreLog(path)
+        for _, scores, failures in score_log.iter_epochs():
+            scores = {x: y for x, y in scores.items() if x not in self.scores}
+            self.failures.update(failures)
+            self.scores.update(scores)
+            self.new_scores.update(scores)
+            self.tracker.update(scores)
+
+            if not self.retrain_from_scratch:
+                self._update_model()
+
+            self.epoch += 1
+
+            self.top_k_avg = self.avg()
+            if len(self.scores) >= self.k:
+                self.recent_avgs.append(self.top_k_avg)
+
     def write_preds(self) -> None:
+        """Write the current predictions to binary files
+
+        The predicted means and, if available, variances are written as 
+        .npy arrays of type preds_dtype parallel to the pool (i.e., the i-th
+        entry is the prediction for the i-th molecule in the pool) and may be
+        read via memory mapping: np.load(path, mmap_mode='r'). If 
+        preds_top_n is set, the top-N predicted inputs are also written to a
+        CSV file.
+        """
         preds_path = Path(f'{self.root}/{self.name}/preds')
         if not preds_path.is_dir():
             preds_path.mkdir(parents=True)
 
-        with open(f'{preds_path}/preds_iter_{self.epoch}.csv', 'w') as fid:
-            writer = csv.writer(fid)
-            writer.writerow(
-                ['smiles', 'predicted_score', '[predicted_variance]']
-            )
-            writer.writerows(
-                zip_longest(self.pool.smis(), self.y_preds, self.y_vars)
+        y_preds = np.asarray(self.y_preds, dtype=self.preds_dtype)
+        p_preds = preds_path / f'preds_iter_{self.epoch}.npy'
+        self.writer.submit(p_preds, np.save, p_preds, y_preds)
+
+        if len(self.y_vars) > 0:
+            y_vars = np.asarray(self.y_vars, dtype=self.preds_dtype)
+            p_vars = preds_path / f'vars_iter_{self.epoch}.npy'
+            self.writer.submit(p_vars, np.save, p_vars, y_vars)
+        else:
+            y_vars = None
+
+        if self.preds_top_n:
+            n = min(self.preds_top_n, len(y_preds))
+            idxs = np.argpartition(-y_preds, n-1)[:n]
+            idxs = idxs[np.argsort(-y_preds[idxs], kind='stable')]
+            d_idx_smi = dict(zip(sorted(idxs), self.pool.get_smis(idxs)))
+            rows = [
+                (d_idx_smi[i], y_preds[i].item(),
+                 y_vars[i].item() if y_vars is not None else None)
+                for i in idxs
+            ]
+
+            p_top = preds_path / f'top_{n}_preds_iter_{self.epoch}.csv'
+            self.writer.submit(
+                p_top, write_csv, p_top,
+                ['smiles', 'predicted_score', '[predicted_variance]'], rows
             )
     
+    def _calc(self, inputs: List[T]) -> Dict[T, Optional[float]]:
+        """Calculate the objective function for the inputs of the current
+        epoch
+
+        In pipelined mode, the inputs are streamed to the objective by a
+        background worker of their own, so the evaluation of a batch never
+        waits on the tail of the previous one. This method returns as soon
+        as pipeline_frac of the inputs have finished, in whatever order they
+        finish, along with any previously submitted inputs that have since
+        finished. The remaining inputs are left running in the background
+        while the next batch is acquired.
+
+        Parameter
+        ---------
+        inputs : List[T]
+            the inputs to calculate the objective function for
+
+        Returns
+        -------
+        Dict[T, Optional[float]]
+            a mapping from each evaluated input to its objective function
+            value
+        """
+        in_path = f'{self.tmp}/{self.name}/inputs/iter_{self.epoch}'
+        out_path = f'{self.tmp}/{self.name}/outputs/iter_{self.epoch}'
+
+        if self.pipeline_frac is None:
+            return self.objective.calc(
+                inputs, in_path=in_path, out_path=out_path
+            )
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor()
+
+        self._pending.update(dict.fromkeys(inputs))
+        self._executor.submit(self._stream, inputs, in_path, out_path)
+
+        batch = set(inputs)
+        n_head = math.ceil(self.pipeline_frac * len(inputs))
+
+        new_scores = {}
+        while n_head > 0:
+            x, y = self._next_result()
+            new_scores[x] = y
+            self._pending.pop(x, None)
+            n_head -= x in batch
+
+        new_scores.update(self._collect_pending())
+        return new_scores
+
+    def _stream(self, xs: List[T], in_path: str, out_path: str) -> None:
+        """Stream the inputs xs to the objective and put each result in the
+        results queue. Inputs for which the objective returns no value are
+        reported as failures, and an exception raised by the objective is
+        put in the queue to be reraised by the consumer"""
+        try:
+            stream = self.objective.stream(
+                xs, in_path=in_path, out_path=out_path
+            )
+            missing = dict.fromkeys(xs)
+            for x, y in stream:
+                missing.pop(x, None)
+                self._results.put((x, y))
+            for x in missing:
+                self._results.put((x, None))
+        except Exception as e:
+            self._results.put(e)
+
+    def _next_result(self, block: bool = True) -> Tuple[T, Optional[float]]:
+        """Get the next result from the results queue
+
+        Raises
+        ------
+        queue.Empty
+            if block is False and no result is available
+        Exception
+            any exception raised by the objective in a background worker
+        """
+        result = self._results.get(block)
+        if isinstance(result, Exception):
+            raise result
+
+        return result
+
+    def _collect_pending(self, wait_all: bool = False
+                         ) -> Dict[T, Optional[float]]:
+        """Collect the results of all finished background evaluations
+
+        Parameter
+        ---------
+        wait_all : bool (Default = False)
+            whether to block until every pending evaluation has finished. 
+            If True, also update the explorer's scores with the results
+
+        Returns
+        -------
+        new_scores : Dict[T, Optional[float]]
+            the objective function values of the collected inputs
+        
+        Side effects
+        ------------
+        (mutates) self._pending : Dict[T, None]
+            removes the collected inputs
+        """
+        new_scores = {}
+        while self._pending:
+            try:
+                x, y = self._next_result(block=wait_all)
+            except queue.Empty:
+                break
+            new_scores[x] = y
+            self._pending.pop(x, None)
+
+        if wait_all:
+            self._clean_and_update_scores(new_scores)
+            self._executor.shutdown()
+            self._executor = None
+
+        return new_scores
+
     def _clean_and_update_scores(self, new_scores: Dict[T, Optional[float]]):
         """Remove the None entries from new_scores and update the attributes 
         new_scores, scores, and failed accordingly
@@ -608,13 +1301,19 @@ class Explorer:
             updates self.new_scores with the non-None entries from new_scores
         (mutates) self.failures : Dict[T, None]
             a dictionary storing the inputs for which scoring failed
+        (mutates) self.tracker : TopKTracker
+            adds the newly scored inputs
         """
+        valid_scores = {}
         for x, y in new_scores.items():
             if y is None:
                 self.failures[x] = y
-            else:
-                self.scores[x] = y
-                self.new_scores[x] = y
+            elif x not in self.scores:
+                valid_scores[x] = y
+
+        self.scores.update(valid_scores)
+        self.new_scores.update(valid_scores)
+        self.tracker.update(valid_scores)
 
     def _update_model(self) -> None:
         """Update the prior distribution to generate a posterior distribution
@@ -629,6 +1328,8 @@ class Explorer:
             sets self.updated_model to True, indicating that the predictions
             must be updated as well
         """
+        self._update_cost_model()
+
         if len(self.new_scores) == 0:
             # only update model if there are new data
             self.updated_model = False
@@ -640,10 +1341,44 @@ class Explorer:
             xs, ys = zip(*self.new_scores.items())
 
         self.model.train(xs, ys, retrain=self.retrain_from_scratch,
-                         featurize=self.encoder.encode_and_uncompress)
+                         featurize=self.featurizer)
+        if self.prefilter is not None:
+            self.prefilter.train(
+                xs, ys, retrain=self.retrain_from_scratch,
+                featurize=self.featurizer
+            )
         self.new_scores = {}
         self.updated_model = True
 
+    def _update_cost_model(self) -> None:
+        """Retrain the cost model and update the predicted costs over the
+        pool if the objective has recorded any new costs
+
+        Side effects
+        ------------
+        (mutates) self.cost_model : CostModel
+        (sets) self.y_costs : np.ndarray
+        """
+        if self.cost_model is None:
+            return
+
+        costs = self.objective.costs
+        if len(costs) == self._n_costs:
+            return
+
+        xs, ys = zip(*costs.items())
+        self.cost_model.train(
+            xs, ys, featurize=self.featurizer
+        )
+        self.y_costs = self.cost_model.predict(
+            self.pool.fps_batches(), len(self.pool)
+        )
+        self._n_costs = len(costs)
+
+        if self.verbose > 0:
+            print(f'Updated cost model with {len(costs)} observed costs '
+                  f'(median predicted cost: {np.median(self.y_costs):0.1f}s)')
+
     def _update_predictions(self) -> None:
         """Update the predictions over the pool with the new model
 
@@ -659,23 +1394,176 @@ class Explorer:
             sets self.updated_model to False, indicating that the predictions 
             are now up-to-date with the current model
         """
-        if not self.updated_model and self.y_preds:
+        if not self.updated_model and self.y_preds is not None:
             # don't update predictions if the model has not been updated 
             # and the predictions are already set
             return
 
-        self.y_preds, self.y_vars = self.model.apply(
-            x_ids=self.pool.smis(), 
-            x_feats=self.pool.fps(), 
-            batched_size=None, size=len(self.pool), 
-            mean_only='vars' not in self.acquirer.needs
+        mean_only = 'vars' not in self.acquirer.needs and not (
+            self.prune_epochs is not None and 'vars' in self.model.provides
         )
 
+        if self.prefilter is not None:
+            self._cascade(mean_only)
+        else:
+            self._predict(self.active, mean_only)
+            if self.prune_epochs is not None:
+                self._prune()
+
         self.updated_model = False
-        
+
         if self.save_preds:
             self.write_preds()
 
+    def _predict(self, mask: np.ndarray, mean_only: bool) -> None:
+        """Predict the inputs in mask with the model and keep the stale (or
+        prefilter) predictions of the others
+
+        Side effects
+        ------------
+        (sets) self.y_preds : Union[List[float], np.ndarray]
+        (sets) self.y_vars : Union[List[float], np.ndarray]
+        """
+        if self.y_preds is None or mask.all():
+            self.y_preds, self.y_vars = self.model.apply(
+                x_ids=self.pool.smis(), 
+                x_feats=self.pool.fps(), 
+                batched_size=None, size=len(self.pool), 
+                mean_only=mean_only
+            )
+        else:
+            # only predict the active inputs (that survived the prefilter)
+            # and keep the stale (or prefilter) predictions of the others
+            y_means, y_vars = self.model.apply(
+                x_ids=compress(self.pool.smis(), mask),
+                x_feats=compress(self.pool.fps(), mask),
+                batched_size=None, size=int(mask.sum()),
+                mean_only=mean_only
+            )
+            self.y_preds = np.array(self.y_preds, dtype=float)
+            self.y_preds[mask] = y_means
+            if len(y_vars) > 0:
+                if len(self.y_vars) > 0:
+                    self.y_vars = np.array(self.y_vars, dtype=float)
+                else:
+                    self.y_vars = np.zeros(len(self.pool))
+                self.y_vars[mask] = y_vars
+
+    def _cascade(self, mean_only: bool) -> None:
+        """Run cascade inference over the active inputs that have not been
+        acquired
+
+        The prefilter predicts every candidate and the fraction cascade_frac
+        of them with the highest predicted means survive to be predicted by
+        the model. If pruning then leaves fewer than a batch of survivors
+        active, the next best candidates by the prefilter's predictions are
+        passed to the model, until enough survivors remain or no candidates
+        are left.
+
+        Side effects
+        ------------
+        (sets) self.y_preds : np.ndarray
+        (sets) self.y_vars : Union[List[float], np.ndarray]
+        (sets) self.survivors : np.ndarray
+        (mutates) self.active : np.ndarray
+        """
+        # acquired inputs can't survive, else they would take the place of
+        # inputs that may still be acquired
+        candidates = self.active & ~self.acquired
+        self._prefilter(candidates)
+        n = math.ceil(self.cascade_frac * candidates.sum())
+
+        survivors = np.zeros(len(self.pool), dtype=bool)
+        while candidates.any():
+            idxs = np.flatnonzero(candidates)
+            if n < len(idxs):
+                idxs = idxs[np.argpartition(-self.y_preds[idxs], n-1)[:n]]
+            self.survivors = np.zeros(len(self.pool), dtype=bool)
+            self.survivors[idxs] = True
+
+            self._predict(self.survivors, mean_only)
+            if self.prune_epochs is not None:
+                self._prune()
+
+            survivors |= self.survivors
+            candidates &= ~self.survivors
+            if (survivors & self.active).sum() >= self.acquirer.batch_size:
+                break
+
+        self.survivors = survivors
+
+        if self.verbose > 0:
+            print(f'Cascade: passed {survivors.sum()} inputs from the '
+                  f'{self.prefilter.type_} prefilter to the '
+                  f'{self.model.type_} model')
+
+    def _prefilter(self, mask: np.ndarray) -> None:
+        """Run the first stage of cascade inference over the inputs in mask,
+        writing the prefilter's predicted means into self.y_preds
+
+        Side effects
+        ------------
+        (sets) self.y_preds : np.ndarray
+        """
+        begin = timeit.default_timer()
+
+        y_means, _ = self.prefilter.apply(
+            x_ids=compress(self.pool.smis(), mask),
+            x_feats=compress(self.pool.fps(), mask),
+            batched_size=None, size=int(mask.sum()), mean_only=True
+        )
+        if self.y_preds is None:
+            self.y_preds = np.zeros(len(self.pool))
+            self.y_vars = []
+        else:
+            self.y_preds = np.array(self.y_preds, dtype=float)
+        self.y_preds[mask] = y_means
+
+        if self.verbose > 0:
+            total = timeit.default_timer() - begin
+            print(f'Cascade: prefiltered {mask.sum()} inputs with the '
+                  f'{self.prefilter.type_} model in {total:0.1f}s')
+
+    def _prune(self) -> None:
+        """Prune the active inputs whose upper confidence bound has stayed
+        below the current top-k threshold for prune_epochs consecutive
+        prediction updates
+
+        During cascade inference, only the latest survivors have been
+        predicted by the model, so only their counts are updated. The others
+        hold the prefilter's predictions, which are not comparable to the
+        model's.
+
+        Side effects
+        ------------
+        (mutates) self.active : np.ndarray
+        (mutates) self._n_below : np.ndarray
+        """
+        threshold = self.tracker.threshold(self.k)
+        if not math.isfinite(threshold):
+            return
+
+        Y_ucb = np.asarray(self.y_preds, dtype=np.float32)
+        if len(self.y_vars) > 0:
+            Y_ucb = Y_ucb + self.prune_beta * np.sqrt(
+                np.asarray(self.y_vars, dtype=np.float32)
+            )
+
+        below = Y_ucb < threshold
+        n_below = np.where(
+            below, np.minimum(self._n_below, self.prune_epochs) + 1, 0
+        ).astype(np.uint16)
+        if self.survivors is not None:
+            n_below = np.where(self.survivors, n_below, self._n_below)
+        self._n_below = n_below
+
+        pruned = self.active & (self._n_below >= self.prune_epochs)
+        self.active &= ~pruned
+
+        if self.verbose > 0:
+            print(f'Pruned {pruned.sum()} inputs '
+                  f'({self.active.sum()} remain active)')
+
     def _validate_acquirer(self):
         """Ensure that the model provides values the Acquirer needs"""
         if self.acquirer.needs > self.model.provides:
@@ -700,6 +1588,16 @@ class Explorer:
         
         return scores, failures
 
+def write_csv(path: str, header: List[str], rows: Iterable) -> None:
+    with open(path, 'w') as fid:
+        writer = csv.writer(fid)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def write_bytes(path: str, data: bytes) -> None:
+    with open(path, 'wb') as fid:
+        fid.write(data)
+
 class InvalidExplorationError(Exception):
     pass
 
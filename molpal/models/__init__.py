@@ -13,9 +13,25 @@ def model(model: str, **kwargs) -> Type[Model]:
         from molpal.models.sklmodels import RFModel
         return RFModel(**kwargs)
 
+    if model == 'gb':
+        from molpal.models.sklmodels import GBModel
+        return GBModel(**kwargs)
+
     if model == 'gp':
         from molpal.models.sklmodels import GPModel
         return GPModel(**kwargs)
+
+    if model == 'sgp':
+        from molpal.models.sgpmodels import SparseGPModel
+        return SparseGPModel(**kwargs)
+
+    if model == 'knn':
+        from molpal.models.knnmodels import KNNModel
+        return KNNModel(**kwargs)
+
+    if model == 'linear':
+        from molpal.models.linmodels import OnlineLinearModel
+        return OnlineLinearModel(**kwargs)
         
     if model == 'nn':
         return nn(**kwargs)
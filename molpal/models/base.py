@@ -3,6 +3,8 @@ implement this interface in order to interact properly with an Explorer"""
 
 from abc import ABC, abstractmethod
 import gc
+from pathlib import Path
+import pickle
 from typing import (Callable, Iterable, List,
                     Optional, Sequence, Set, Tuple, TypeVar)
 
@@ -92,6 +94,34 @@ class Model(ABC):
     def get_means_and_vars(self, xs: Sequence) -> Tuple[ndarray, ndarray]:
         """Get both the predicted mean and variance for a sequence of inputs"""
 
+    def save(self, path: str) -> str:
+        """Save the state of the model under path so that it may be 
+        restored with load(). By default, pickle the underlying model
+
+        Parameter
+        ---------
+        path : str
+            the directory under which to save the model state
+        
+        Returns
+        -------
+        str
+            the directory the model state was saved under
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        with open(path / 'model.pkl', 'wb') as fid:
+            pickle.dump(self.model, fid)
+
+        return str(path)
+
+    def load(self, path: str) -> None:
+        """Restore the state of the model from a directory written by save()
+        """
+        with open(Path(path) / 'model.pkl', 'rb') as fid:
+            self.model = pickle.load(fid)
+
     def apply(self, x_ids: Iterable[T], x_feats: Iterable[T_feat],
               batched_size: Optional[int] = None,
               size: Optional[int] = None, mean_only: bool = True
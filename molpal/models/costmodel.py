@@ -0,0 +1,115 @@
+"""This module contains the CostModel class, which is used to predict the
+computational cost of evaluating the objective function for an input"""
+
+import logging
+from typing import Callable, Iterable, Optional, TypeVar
+
+import numpy as np
+from numpy import ndarray
+from sklearn.linear_model import Ridge
+
+from molpal.models.utils import feature_matrix
+
+T = TypeVar('T')
+
+class CostModel:
+    """A CostModel predicts the CPU time needed to evaluate the objective
+    function for an input from that input's feature representation
+
+    The model is a ridge regression on the logarithm of the observed costs,
+    so predictions are always positive and errors are relative rather than
+    absolute. Docking costs grow with molecular size and flexibility, both of
+    which are captured by the substructure bits of a fingerprint.
+
+    Attributes
+    ----------
+    model : Ridge
+        the underlying regression model
+    min_cost : float
+        the minimum cost a training point or prediction may take
+    ncpu : int
+        the number of cores over which to featurize training inputs
+    trained : bool
+        whether the model has been trained
+
+    Parameters
+    ----------
+    alpha : float (Default = 1.)
+        the regularization strength of the ridge regression
+    min_cost : float (Default = 1e-3)
+    ncpu : int (Default = 1)
+    """
+    def __init__(self, alpha: float = 1., min_cost: float = 1e-3,
+                 ncpu: int = 1, **kwargs):
+        self.model = Ridge(alpha=alpha)
+        self.min_cost = min_cost
+        self.ncpu = ncpu
+        self.trained = False
+
+    def train(self, xs: Iterable[T], costs: Iterable[float], *,
+              featurize: Callable[[T], ndarray]) -> bool:
+        """Train the model on the observed costs of the inputs xs
+
+        Returns
+        -------
+        bool
+            whether training was successful, i.e., there were any training
+            data
+        """
+        X = feature_matrix(xs, featurize, self.ncpu)
+        if len(X) == 0:
+            return False
+
+        Y = np.log(np.maximum(np.array(costs, dtype=float), self.min_cost))
+
+        self.model.fit(X, Y)
+        errors = self.model.predict(X) - Y
+        logging.info(f'  cost model training MAE (log s): '
+                     f'{np.mean(np.abs(errors)):.2f}')
+
+        self.trained = True
+        return True
+
+    def predict(self, xs_batches: Iterable[ndarray],
+                size: Optional[int] = None) -> ndarray:
+        """Predict the cost of each input
+
+        Parameters
+        ----------
+        xs_batches : Iterable[ndarray]
+            an iterable of batches of feature representations
+        size : Optional[int] (Default = None)
+            the total number of inputs. If specified, the predictions are
+            written into a preallocated array
+
+        Returns
+        -------
+        ndarray
+            the predicted cost of each input in seconds, of type float32
+        """
+        Xs = (self._as_array(X) for X in xs_batches)
+        if size is None:
+            return np.concatenate([
+                self._predict(X) for X in Xs
+            ]).astype(np.float32)
+
+        costs = np.empty(size, dtype=np.float32)
+        i = 0
+        for X in Xs:
+            costs[i:i+len(X)] = self._predict(X)
+            i += len(X)
+
+        return costs
+
+    @staticmethod
+    def _as_array(X: Iterable[ndarray]) -> ndarray:
+        """Convert a batch to an array. Batches need not be arrays, e.g., a
+        LazyMoleculePool yields its batches of fingerprints as iterators"""
+        if isinstance(X, ndarray):
+            return X
+
+        return np.array(list(X))
+
+    def _predict(self, X: ndarray) -> ndarray:
+        Y = self.model.predict(X)
+        return np.maximum(np.exp(Y), self.min_cost)
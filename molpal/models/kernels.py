@@ -0,0 +1,81 @@
+"""This module contains the Tanimoto kernel for Gaussian process models of
+fingerprint inputs"""
+
+from typing import Optional
+
+import numpy as np
+from numpy import ndarray
+from sklearn.gaussian_process.kernels import Kernel
+
+from molpal import similarity
+
+def tanimoto_kernel(X: ndarray, Y: Optional[ndarray] = None,
+                    n_threads: int = 1) -> ndarray:
+    """Calculate the Tanimoto kernel matrix K(X, Y) between two sets of
+    uncompressed fingerprints
+
+    The fingerprints are packed into 64-bit words and their intersections
+    counted with popcount, so each kernel entry costs W = ceil(L / 64) word
+    operations rather than L floating point operations.
+
+    Parameters
+    ----------
+    X : ndarray
+        an NxL array of fingerprints, where any nonzero entry is an on-bit
+    Y : Optional[ndarray] (Default = None)
+        an MxL array of fingerprints. If None, use X
+    n_threads : int (Default = 1)
+        the number of threads over which to calculate the kernel matrix
+
+    Returns
+    -------
+    ndarray
+        the NxM kernel matrix of type float64
+    """
+    A = similarity.pack(X)
+    B = A if Y is None else similarity.pack(Y)
+    counts_A = similarity.counts(A)
+    counts_B = counts_A if Y is None else similarity.counts(B)
+
+    K = similarity.tanimoto(A, B, counts_A, counts_B, n_threads)
+    return K.astype(float)
+
+def tanimoto_kernel_diag(X: ndarray) -> ndarray:
+    """The diagonal of tanimoto_kernel(X): 1 for each fingerprint with any
+    on-bits and 0 otherwise"""
+    return (np.asarray(X) != 0).any(axis=1).astype(float)
+
+class TanimotoKernel(Kernel):
+    """A Tanimoto (Jaccard) kernel for binary fingerprints
+
+    k(x, y) = |x & y| / |x | y|
+
+    The kernel has no hyperparameters, so it is typically scaled by a
+    ConstantKernel and summed with a WhiteKernel.
+
+    Parameters
+    ----------
+    n_threads : int (Default = 1)
+        the number of threads over which to calculate kernel matrices
+    """
+    def __init__(self, n_threads: int = 1):
+        self.n_threads = n_threads
+
+    def __call__(self, X, Y=None, eval_gradient=False):
+        if eval_gradient and Y is not None:
+            raise ValueError('Gradient can only be evaluated when Y is None.')
+
+        K = tanimoto_kernel(X, Y, self.n_threads)
+        if eval_gradient:
+            return K, np.empty((len(X), len(X), 0))
+
+        return K
+
+    def diag(self, X):
+        return tanimoto_kernel_diag(X)
+
+    def is_stationary(self):
+        return False
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}()'
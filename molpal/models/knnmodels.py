@@ -0,0 +1,127 @@
+"""This module contains the KNNModel, a nearest-neighbor model that predicts
+an input's value from the labelled inputs most similar to it"""
+
+import logging
+from typing import Callable, Iterable, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+from numpy import ndarray
+
+from molpal import similarity
+from molpal.models.base import Model
+from molpal.models.utils import feature_matrix
+from molpal.pools.index import SimilarityIndex
+
+T = TypeVar('T')
+
+class KNNModel(Model):
+    """A k-nearest-neighbor model in Tanimoto similarity
+
+    Training only stores the packed fingerprints and labels of the training
+    inputs. They are appended to buffers whose capacity doubles when full,
+    so adding a label takes amortized constant time rather than time
+    proportional to the size of the training set.
+
+    The mean prediction for an input is the similarity-weighted mean of the
+    labels of its k most similar training inputs and the variance is the
+    similarity-weighted variance of those labels, i.e., the disagreement
+    between its neighbors. Neighbors are found with a SimilarityIndex over
+    the training inputs, which is rebuilt lazily after training.
+
+    Attributes
+    ----------
+    model : Optional[Dict]
+        the training data: the buffers of packed fingerprints 'fps' and
+        labels 'ys', of which the first 'size' rows are filled. None if the
+        model has not been trained
+    k : int
+        the number of neighbors to use
+    index : Optional[SimilarityIndex]
+        the similarity index over the training fingerprints. None if it must
+        be rebuilt
+
+    Parameters
+    ----------
+    knn_k : int (Default = 10)
+    ncpu : int (Default = 1)
+        the number of threads over which to search for neighbors
+    test_batch_size : Optional[int] (Default = 10000)
+    """
+    def __init__(self, knn_k: int = 10, ncpu: int = 1,
+                 test_batch_size: Optional[int] = 10000, **kwargs):
+        test_batch_size = test_batch_size or 10000
+        super().__init__(test_batch_size, ncpu=ncpu, **kwargs)
+
+        self.model = None
+        self.k = knn_k
+        self.index = None
+
+    @property
+    def provides(self):
+        return {'means', 'vars'}
+
+    @property
+    def type_(self):
+        return 'knn'
+
+    def train(self, xs: Iterable[T], ys: Iterable[float], *,
+              featurize: Callable[[T], ndarray], retrain: bool = False) -> bool:
+        """Add the inputs xs and their labels to the training data. If
+        retrain is True, replace the training data instead"""
+        fps = similarity.pack(feature_matrix(xs, featurize, self.ncpu))
+        Y = np.array(ys, dtype=float)
+
+        if self.model is None or retrain:
+            self.model = {'fps': fps, 'ys': Y, 'size': len(Y)}
+        else:
+            self._append(fps, Y)
+        self.index = None
+
+        logging.info(f'  kNN model contains {self.model["size"]} points')
+        return True
+
+    def get_means(self, xs: Sequence) -> ndarray:
+        return self._predict(xs)[0]
+
+    def get_means_and_vars(self, xs: Sequence) -> Tuple[ndarray, ndarray]:
+        return self._predict(xs)
+
+    def load(self, path: str) -> None:
+        super().load(path)
+        self.index = None
+
+    def _append(self, fps: ndarray, Y: ndarray) -> None:
+        """Append packed fingerprints and their labels to the training data,
+        doubling the capacity of the buffers if they are full"""
+        n = self.model['size']
+        m = n + len(Y)
+
+        capacity = len(self.model['ys'])
+        if m > capacity:
+            capacity = max(m, 2 * capacity)
+            for key, X in (('fps', fps), ('ys', Y)):
+                buffer = np.empty((capacity, *X.shape[1:]), dtype=X.dtype)
+                buffer[:n] = self.model[key][:n]
+                self.model[key] = buffer
+
+        self.model['fps'][n:m] = fps
+        self.model['ys'][n:m] = Y
+        self.model['size'] = m
+
+    def _predict(self, xs: Sequence) -> Tuple[ndarray, ndarray]:
+        n = self.model['size']
+        if self.index is None:
+            self.index = SimilarityIndex(self.model['fps'][:n])
+
+        fps = similarity.pack(np.stack(xs, axis=0))
+        idxs, sims = self.index.query(fps, self.k, self.ncpu)
+
+        W = sims.astype(float)
+        W[W.sum(axis=1) == 0] = 1.
+        W /= W.sum(axis=1, keepdims=True)
+
+        Y = self.model['ys'][:n][idxs]
+        means = (W * Y).sum(axis=1)
+        variances = (W * np.square(Y - means[:, None])).sum(axis=1)
+
+        return means, variances
@@ -0,0 +1,167 @@
+"""This module contains the OnlineLinearModel, a bootstrapped ensemble of
+linear models over fingerprint on-bits that is trained incrementally"""
+
+import logging
+from typing import Callable, Iterable, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+from numpy import ndarray
+from scipy import sparse
+from sklearn.linear_model import SGDRegressor
+
+from molpal.models.base import Model
+from molpal.models.utils import feature_matrix
+
+T = TypeVar('T')
+
+class OnlineLinearModel(Model):
+    """An ensemble of linear models trained by stochastic gradient descent
+    on the sparse on-bits of fingerprints
+
+    Each head of the ensemble is a ridge-penalized SGDRegressor. Training
+    without retraining calls partial_fit() on only the new data, so the
+    cost of an update is independent of the number of previously acquired
+    points. Each head sees every new point a Poisson(1)-distributed number
+    of times (an online bootstrap), so the disagreement between the heads
+    estimates the predictive variance. The heads' weights are stacked into a
+    single matrix so inference over a batch is one sparse matrix product.
+
+    The targets are standardized with the running mean and standard
+    deviation of all the data on which the heads have been trained, which
+    are updated with each batch by Welford's method. Before the heads are
+    updated on a new batch, their weights and intercepts are rescaled to the
+    new statistics, so their predictions in the original units are
+    unchanged.
+
+    Attributes
+    ----------
+    model : Optional[Dict]
+        the heads, the number of training points 'n', and the mean 'y_mean',
+        standard deviation 'y_std', and sum of squared deviations 'y_m2' of
+        their targets. None if the model has not been trained
+    n_heads : int
+        the number of heads in the ensemble
+    alpha : float
+        the L2 regularization strength
+    n_iter : int
+        the number of passes over the training data in each update
+    rg : np.random.Generator
+        the random number generator used to draw bootstrap weights
+
+    Parameters
+    ----------
+    linear_heads : int (Default = 8)
+    linear_alpha : float (Default = 1e-4)
+    linear_iter : int (Default = 5)
+    seed : Optional[int] (Default = None)
+    ncpu : int (Default = 1)
+    test_batch_size : Optional[int] (Default = 10000)
+    """
+    def __init__(self, linear_heads: int = 8, linear_alpha: float = 1e-4,
+                 linear_iter: int = 5, seed: Optional[int] = None,
+                 ncpu: int = 1, test_batch_size: Optional[int] = 10000,
+                 **kwargs):
+        test_batch_size = test_batch_size or 10000
+        super().__init__(test_batch_size, ncpu=ncpu, **kwargs)
+
+        self.model = None
+        self.n_heads = linear_heads
+        self.alpha = linear_alpha
+        self.n_iter = linear_iter
+        self.rg = np.random.default_rng(seed)
+
+        self._W = None
+        self._b = None
+
+    @property
+    def provides(self):
+        return {'means', 'vars'}
+
+    @property
+    def type_(self):
+        return 'linear'
+
+    def train(self, xs: Iterable[T], ys: Iterable[float], *,
+              featurize: Callable[[T], ndarray], retrain: bool = False) -> bool:
+        """Update the heads on the inputs xs. If retrain is True or the model
+        has not been trained, the heads are first reinitialized"""
+        X = sparse.csr_matrix(feature_matrix(xs, featurize, self.ncpu))
+        Y = np.array(ys, dtype=float)
+
+        if self.model is None or retrain:
+            self.model = {
+                'heads': [
+                    SGDRegressor(
+                        alpha=self.alpha, learning_rate='invscaling',
+                        eta0=0.01, random_state=int(self.rg.integers(2**31))
+                    ) for _ in range(self.n_heads)
+                ],
+                'n': 0,
+                'y_mean': 0.,
+                'y_std': 1.,
+                'y_m2': 0.
+            }
+        self._update_stats(Y)
+
+        Y = (Y - self.model['y_mean']) / self.model['y_std']
+        for head in self.model['heads']:
+            weights = self.rg.poisson(1., len(Y)).astype(float)
+            for _ in range(self.n_iter):
+                order = self.rg.permutation(len(Y))
+                head.partial_fit(X[order], Y[order], weights[order])
+        self._stack()
+
+        errors = self.get_means(X) - np.array(ys)
+        logging.info(f'  training MAE: {np.mean(np.abs(errors)):.2f}, '
+                     f'MSE: {np.mean(np.power(errors, 2)):.2f}')
+        return True
+
+    def get_means(self, xs: Sequence) -> ndarray:
+        return self._predict(xs).mean(axis=1)
+
+    def get_means_and_vars(self, xs: Sequence) -> Tuple[ndarray, ndarray]:
+        Y_pred = self._predict(xs)
+        return Y_pred.mean(axis=1), Y_pred.var(axis=1)
+
+    def load(self, path: str) -> None:
+        super().load(path)
+        self._stack()
+
+    def _update_stats(self, Y: ndarray) -> None:
+        """Merge the targets Y into the running target statistics and
+        rescale the heads to the new standardization"""
+        n_a, n_b = self.model['n'], len(Y)
+        if n_b == 0:
+            return
+
+        n = n_a + n_b
+        delta = Y.mean() - self.model['y_mean']
+        mean = self.model['y_mean'] + delta * n_b / n
+        m2 = (self.model['y_m2'] + np.square(Y - Y.mean()).sum()
+              + delta**2 * n_a * n_b / n)
+        std = np.sqrt(m2 / n) or 1.
+
+        scale = self.model['y_std'] / std
+        shift = (self.model['y_mean'] - mean) / std
+        if n_a > 0:
+            for head in self.model['heads']:
+                head.coef_ *= scale
+                head.intercept_ = head.intercept_ * scale + shift
+
+        self.model.update(n=n, y_mean=mean, y_std=std, y_m2=m2)
+
+    def _stack(self) -> None:
+        """Stack the weights and intercepts of the heads"""
+        heads = self.model['heads']
+        self._W = np.stack([head.coef_ for head in heads], axis=1)
+        self._b = np.concatenate([head.intercept_ for head in heads])
+
+    def _predict(self, xs: Sequence) -> ndarray:
+        """Predict the value of each input with each head"""
+        if sparse.issparse(xs):
+            X = xs
+        else:
+            X = sparse.csr_matrix(np.stack(xs, axis=0))
+
+        Y_pred = X @ self._W + self._b
+        return Y_pred * self.model['y_std'] + self.model['y_mean']
@@ -3,12 +3,14 @@ their underlying model"""
 
 from argparse import Namespace
 from functools import partial
+from pathlib import Path
+import pickle
 from typing import Iterable, List, NoReturn, Optional, Sequence, Tuple, TypeVar
 
 import numpy as np
 from numpy import ndarray
 from tqdm import tqdm
-import torch.cuda
+import torch
 
 from .chemprop.data.data import (MoleculeDatapoint, MoleculeDataset,
                                  MoleculeDataLoader)
@@ -167,6 +169,26 @@ class MPNN:
 
         return mpnn.predict(self.model, data_loader, scaler=self.scaler)
 
+    def save(self, path: str) -> str:
+        """Save the model weights and target scaler under path"""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        torch.save(self.model.state_dict(), path / 'model.pt')
+        with open(path / 'scaler.pkl', 'wb') as fid:
+            pickle.dump(self.scaler, fid)
+
+        return str(path)
+
+    def load(self, path: str) -> None:
+        """Load the model weights and target scaler saved under path"""
+        path = Path(path)
+
+        state_dict = torch.load(path / 'model.pt', map_location=self.device)
+        self.model.load_state_dict(state_dict)
+        with open(path / 'scaler.pkl', 'rb') as fid:
+            self.scaler = pickle.load(fid)
+
 class MPNModel(Model):
     """Message-passing model that learns feature representations of inputs and
     passes these inputs to a feed-forward neural network to predict means"""
@@ -194,6 +216,12 @@ class MPNModel(Model):
 
         return self.model.train(xs, ys)
 
+    def save(self, path: str) -> str:
+        return self.model.save(path)
+
+    def load(self, path: str) -> None:
+        self.model.load(path)
+
     def get_means(self, xs: Sequence[str]) -> ndarray:
         preds = self.model.predict(xs)
         return preds
@@ -233,6 +261,12 @@ class MPNDropoutModel(Model):
 
         return self.model.train(xs, ys)
 
+    def save(self, path: str) -> str:
+        return self.model.save(path)
+
+    def load(self, path: str) -> None:
+        self.model.load(path)
+
     def get_means(self, xs: Sequence[str]) -> ndarray:
         predss = self._get_predictions(xs)
         return np.mean(predss, axis=1)
@@ -276,6 +310,12 @@ class MPNTwoOutputModel(Model):
 
         return self.model.train(xs, ys)
 
+    def save(self, path: str) -> str:
+        return self.model.save(path)
+
+    def load(self, path: str) -> None:
+        self.model.load(path)
+
     def get_means(self, xs: Sequence[str]) -> ndarray:
         means, _ = self._get_predictions(xs)
         return means.flatten()
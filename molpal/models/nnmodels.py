@@ -2,6 +2,7 @@
 underlying model"""
 
 from functools import partial
+import json
 import logging
 import os
 from typing import (Callable, Iterable, List, NoReturn,
@@ -39,6 +40,8 @@ class NN:
         the dimension of the model inputs
     output_dim : int
         the dimension of the model outputs
+    n_heads : int
+        the number of independent networks fused into the model
     batch_size : int
         the size to batch training into
     dropout : Optional[float]
@@ -58,6 +61,16 @@ class NN:
     input_size : int
     output_size : int
     batch_size : int (Default = 4096)
+    n_heads : int (Default = 1)
+        If greater than 1, build n_heads independently initialized networks
+        that share only their input layer and concatenate their outputs, so
+        that the whole ensemble is trained and evaluated as a single graph.
+        The outputs of the model are then the n_heads predictions, and
+        output_size must be 1. The heads are trained on the sum of their
+        losses, so early stopping (and the restoration of the best weights)
+        acts on all of them at once. Each head weights its training points
+        by its own Poisson(1) bootstrap weights, so that the heads see
+        different resamplings of the same minibatches
     layer_sizes : Optional[Sequence[int]] (Default = None)
         the sizes of the hidden layers in the network. If None, default to
         two hidden layers with 100 neurons each.
@@ -69,14 +82,19 @@ class NN:
         the number of cores to parallelize feature matrix calculation over
     """
     def __init__(self, input_size: int, output_size: int,
-                 batch_size: int = 4096,
+                 batch_size: int = 4096, n_heads: int = 1,
                  layer_sizes: Optional[Sequence[int]] = None,
                  dropout: Optional[float] = None,
                  dropout_at_predict: bool = False,
                  activation: Optional[str] = 'relu',
                  ncpu: int = 1):
+        if n_heads > 1 and output_size != 1:
+            raise ValueError(f'NN output size ({output_size}) must be 1 '
+                             'with multiple heads')
+
         self.input_size = input_size
         self.output_size = output_size
+        self.n_heads = n_heads
         self.batch_size = batch_size
 
         layer_sizes = layer_sizes or [100, 100]
@@ -94,26 +112,45 @@ class NN:
 
         inputs = keras.layers.Input(shape=(self.input_size,))
 
-        hidden = inputs
-        for layer_size in layer_sizes:
-            hidden = keras.layers.Dense(
-                units=layer_size,
-                activation=activation,
-                kernel_regularizer=keras.regularizers.l2(0.01),
-            )(hidden)
-
-            if dropout:
-                hidden = keras.layers.Dropout(
-                    dropout
-                )(hidden, training=dropout_at_predict)
-
-        outputs = keras.layers.Dense(
-            self.output_size, activation='linear'
-        )(hidden)
+        heads = []
+        for _ in range(self.n_heads):
+            hidden = inputs
+            for layer_size in layer_sizes:
+                hidden = keras.layers.Dense(
+                    units=layer_size,
+                    activation=activation,
+                    kernel_regularizer=keras.regularizers.l2(0.01),
+                )(hidden)
+
+                if dropout:
+                    hidden = keras.layers.Dropout(
+                        dropout
+                    )(hidden, training=dropout_at_predict)
+
+            heads.append(keras.layers.Dense(
+                self.output_size, activation='linear'
+            )(hidden))
+
+        if self.n_heads == 1:
+            outputs = heads[0]
+        else:
+            outputs = keras.layers.Concatenate()(heads)
 
         model = keras.Model(inputs, outputs)
 
-        if self.output_size == 1:
+        if self.n_heads > 1:
+            # the heads share no weights, so minimizing the sum of their
+            # weighted MSEs trains each head independently, with the same
+            # balance of MSE and L2 penalty as a single network. y_true holds
+            # the targets followed by the bootstrap weights of each head
+            optimizer = keras.optimizers.Adam(lr=0.01)
+            def loss(y_true, y_pred):
+                y_true = tf.cast(y_true, y_pred.dtype)
+                y, w = y_true[:, :1], y_true[:, 1:]
+                return tf.reduce_mean(
+                    tf.reduce_sum(w * tf.math.square(y_pred - y), axis=1)
+                )
+        elif self.output_size == 1:
             optimizer = keras.optimizers.Adam(lr=0.01)
             loss = keras.losses.mse
         elif self.output_size == 2:
@@ -154,12 +191,22 @@ class NN:
         """
         self.model.compile(optimizer=self.optimizer, loss=self.loss)
 
-        X = feature_matrix(xs, featurize, self.ncpu)
+        X = np.asarray(
+            feature_matrix(xs, featurize, self.ncpu), dtype=np.float32
+        )
         Y = self._normalize(ys)
 
+        if self.n_heads > 1:
+            X, Y, validation_data = self._bootstrap(X, Y)
+            validation_split = 0.
+        else:
+            validation_data = None
+            validation_split = 0.2
+
         self.model.fit(
-            X, Y,
-            batch_size=self.batch_size, validation_split=0.2, epochs=50,
+            X, Y, batch_size=self.batch_size,
+            validation_split=validation_split,
+            validation_data=validation_data, epochs=50,
             validation_freq=2, verbose=2,
             callbacks=[
                 keras.callbacks.EarlyStopping(
@@ -171,11 +218,31 @@ class NN:
 
         return True
 
+    def _bootstrap(self, X: ndarray, Y: ndarray
+                   ) -> Tuple[ndarray, ndarray, Tuple[ndarray, ndarray]]:
+        """Split X and Y into training and validation data like keras'
+        validation_split and append the per-head weights to the targets
+
+        Each head weights the training points by its own Poisson(1) draws,
+        an online approximation of bootstrap resampling, and every
+        validation point by 1, so the validation loss is unbiased.
+        """
+        split = int(np.ceil(0.8 * len(X)))
+
+        W = np.random.poisson(1., (split, self.n_heads))
+        Y_train = np.column_stack((Y[:split], W))
+        Y_val = np.column_stack(
+            (Y[split:], np.ones((len(Y) - split, self.n_heads)))
+        )
+
+        return X[:split], Y_train, (X[split:], Y_val)
+
     def predict(self, xs: Sequence[ndarray]) -> ndarray:
-        X = np.stack(xs, axis=0)
+        X = np.stack(xs, axis=0).astype(np.float32)
         Y_pred = self.model.predict(X)
 
         if self.output_size == 1:
+            # also unnormalizes the predictions of every head
             Y_pred = Y_pred * self.std + self.mean
         else:
             Y_pred[:, 0] = Y_pred[:, 0] * self.std + self.mean
@@ -185,9 +252,15 @@ class NN:
     
     def save(self, path) -> None:
         self.model.save(path)
+        with open(f'{path}/scaling.json', 'w') as fid:
+            json.dump({'mean': float(self.mean), 'std': float(self.std)}, fid)
     
     def load(self, path) -> None:
-        self.model = keras.models.load_model(path)
+        self.model = keras.models.load_model(path, compile=False)
+        with open(f'{path}/scaling.json') as fid:
+            scaling = json.load(fid)
+        self.mean = scaling['mean']
+        self.std = scaling['std']
     
     def _normalize(self, ys: Sequence[float]) -> ndarray:
         Y = np.stack(list(ys))
@@ -248,6 +321,13 @@ class NNModel(Model):
 
         return self.model.train(xs, ys, featurize)
 
+    def save(self, path: str) -> str:
+        self.model.save(path)
+        return path
+
+    def load(self, path: str) -> None:
+        self.model.load(path)
+
     def get_means(self, xs: List) -> ndarray:
         return self.model.predict(xs)[:, 0]
 
@@ -257,11 +337,23 @@ class NNModel(Model):
 class NNEnsembleModel(Model):
     """A feed-forward neural network ensemble model for estimating mean
     and variance.
+
+    The members of the ensemble are fused into a single multi-head NN (see
+    NN.n_heads), so the feature matrix is calculated once per round of
+    training, all members are trained concurrently by the same optimizer
+    steps, and each batch of inputs is predicted by every member in a single
+    forward pass. As a result, early stopping and the restoration of the
+    best weights act on all members at once, based on their summed
+    validation loss, rather than on each member separately. Each member
+    trains on its own bootstrap weighting of the training data.
     
     Attributes
     ----------
-    models : List[Type[NN]]
-        the underlying neural nets on which to train and perform inference
+    model : Type[NN]
+        the underlying multi-head neural net on which to train and perform
+        inference
+    ensemble_size : int
+        the number of members in the ensemble
     
     Parameters
     ----------
@@ -285,11 +377,12 @@ class NNEnsembleModel(Model):
                  ncpu: int = 1, **kwargs):
         test_batch_size = test_batch_size or 4096
         self.build_model = partial(NN, input_size=input_size, output_size=1,
-                                   batch_size=test_batch_size, dropout=dropout,
+                                   batch_size=test_batch_size,
+                                   n_heads=ensemble_size, dropout=dropout,
                                    ncpu=ncpu)
 
         self.ensemble_size = ensemble_size
-        self.models = [self.build_model() for _ in range(self.ensemble_size)]
+        self.model = self.build_model()
 
         self.bootstrap_ensemble = bootstrap_ensemble # TODO: Actually use this
 
@@ -306,25 +399,24 @@ class NNEnsembleModel(Model):
     def train(self, xs: Iterable[T], ys: Sequence[Optional[float]], *,
               featurize: Callable[[T], ndarray], retrain: bool = False):
         if retrain:
-            self.models = [
-                self.build_model() for _ in range(self.ensemble_size)
-            ]
+            self.model = self.build_model()
 
-        return all([model.train(xs, ys, featurize) for model in self.models])
+        return self.model.train(xs, ys, featurize)
+
+    def save(self, path: str) -> str:
+        self.model.save(path)
+        return path
+
+    def load(self, path: str) -> None:
+        self.model.load(path)
 
     def get_means(self, xs: Sequence) -> np.ndarray:
-        preds = np.zeros((len(xs), len(self.models)))
-        for j, model in tqdm(enumerate(self.models), leave=False,
-                             desc='ensemble prediction', unit='model'):
-            preds[:, j] = model.predict(xs)[:, 0]
+        preds = self.model.predict(xs)
 
         return np.mean(preds, axis=1)
 
     def get_means_and_vars(self, xs: Sequence) -> Tuple[np.ndarray, np.ndarray]:
-        preds = np.zeros((len(xs), len(self.models)))
-        for j, model in tqdm(enumerate(self.models), leave=False,
-                             desc='ensemble prediction', unit='model'):
-            preds[:, j] = model.predict(xs)[:, 0]
+        preds = self.model.predict(xs)
 
         return np.mean(preds, axis=1), np.var(preds, axis=1)
 
@@ -376,6 +468,13 @@ class NNTwoOutputModel(Model):
 
         return self.model.train(xs, ys, featurize)
 
+    def save(self, path: str) -> str:
+        self.model.save(path)
+        return path
+
+    def load(self, path: str) -> None:
+        self.model.load(path)
+
     def get_means(self, xs: Sequence) -> np.ndarray:
         preds = self.model.predict(xs)
         return preds[:, 0]
@@ -440,6 +539,13 @@ class NNDropoutModel(Model):
         
         return self.model.train(xs, ys, featurize)
 
+    def save(self, path: str) -> str:
+        self.model.save(path)
+        return path
+
+    def load(self, path: str) -> None:
+        self.model.load(path)
+
     def get_means(self, xs: Sequence) -> ndarray:
         predss = self._get_predss(xs)
         return np.mean(predss, axis=1)
@@ -0,0 +1,215 @@
+"""This module contains the SparseGPModel, a Gaussian process model that
+scales to large training sets by conditioning on a fixed number of inducing
+points"""
+
+import logging
+from typing import Callable, Iterable, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+from numpy import ndarray
+from scipy.linalg import cho_factor, solve_triangular
+from sklearn.cluster import MiniBatchKMeans
+
+from molpal import similarity
+from molpal.models.base import Model
+from molpal.models.kernels import tanimoto_kernel, tanimoto_kernel_diag
+from molpal.models.utils import feature_matrix
+
+T = TypeVar('T')
+
+class SparseGPModel(Model):
+    """A sparse Gaussian process model using the deterministic training
+    conditional (DTC) approximation
+
+    The GP is conditioned on m inducing points selected from the training
+    inputs rather than on all n training inputs, so training takes O(nm^2)
+    time and O(m^2) memory (plus O(m * b) for blocks of b training inputs)
+    and predicting the mean and variance of each input takes O(m^2) time.
+    The targets are standardized before training and a fixed noise variance,
+    expressed as a fraction of the targets' variance, is assumed.
+
+    Attributes
+    ----------
+    model : Optional[Dict]
+        the trained state of the model: the inducing points Z, the Cholesky
+        factors Lm and LB, the weight vector c, and the target mean and
+        standard deviation. None if the model has not been trained
+    kernel : str
+        the kernel to use
+    n_inducing : int
+        the maximum number of inducing points
+    inducing_method : str
+        the method used to select inducing points
+    noise : float
+        the noise variance relative to the variance of the targets
+
+    Parameters
+    ----------
+    gp_kernel : str (Default = 'dotproduct')
+        'dotproduct' or 'tanimoto'
+    n_inducing : int (Default = 500)
+    inducing_method : str (Default = 'kcenter')
+        'kcenter': greedy farthest-point selection in Tanimoto distance
+        'kmeans': the training input closest to each k-means centroid
+    noise : float (Default = 0.1)
+    ncpu : int (Default = 1)
+    test_batch_size : Optional[int] (Default = 10000)
+
+    Raises
+    ------
+    ValueError
+        if gp_kernel or inducing_method is not recognized
+    """
+    def __init__(self, gp_kernel: str = 'dotproduct', n_inducing: int = 500,
+                 inducing_method: str = 'kcenter', noise: float = 0.1,
+                 ncpu: int = 1, test_batch_size: Optional[int] = 10000,
+                 **kwargs):
+        test_batch_size = test_batch_size or 10000
+        super().__init__(test_batch_size, ncpu=ncpu, **kwargs)
+
+        if gp_kernel not in KERNELS:
+            raise ValueError(f'Unrecognized kernel: "{gp_kernel}"')
+        if inducing_method not in ('kcenter', 'kmeans'):
+            raise ValueError(
+                f'Unrecognized inducing method: "{inducing_method}"')
+
+        self.model = None
+        self.kernel = gp_kernel
+        self.n_inducing = n_inducing
+        self.inducing_method = inducing_method
+        self.noise = noise
+
+    @property
+    def provides(self):
+        return {'means', 'vars'}
+
+    @property
+    def type_(self):
+        return 'sgp'
+
+    def train(self, xs: Iterable[T], ys: Iterable[float], *,
+              featurize: Callable[[T], ndarray], retrain: bool = False) -> bool:
+        X = np.asarray(feature_matrix(xs, featurize, self.ncpu), dtype=float)
+        Y = np.array(ys, dtype=float)
+
+        y_mean, y_std = Y.mean(), Y.std() or 1.
+        Y = (Y - y_mean) / y_std
+
+        K, _ = KERNELS[self.kernel]
+        Z = X[self.select_inducing(X)]
+
+        Kmm = K(Z, Z, n_threads=self.ncpu)
+        Kmm[np.diag_indices_from(Kmm)] += 1e-6 * np.trace(Kmm) / len(Kmm)
+        Lm = cho_factor(Kmm, lower=True)[0]
+        Lm = np.tril(Lm)
+
+        # accumulate A A^T and A y, where A = Lm^-1 Kmn / sigma, in blocks
+        sigma = np.sqrt(self.noise)
+        AAT = np.zeros((len(Z), len(Z)))
+        Ay = np.zeros(len(Z))
+        for i in range(0, len(X), self.test_batch_size):
+            X_block = X[i:i+self.test_batch_size]
+            Kmn = K(Z, X_block, n_threads=self.ncpu)
+            A = solve_triangular(Lm, Kmn, lower=True) / sigma
+            AAT += A @ A.T
+            Ay += A @ Y[i:i+self.test_batch_size]
+
+        B = AAT + np.eye(len(Z))
+        LB = np.tril(cho_factor(B, lower=True)[0])
+        c = solve_triangular(LB, Ay, lower=True) / sigma
+
+        self.model = {
+            'Z': Z, 'Lm': Lm, 'LB': LB, 'c': c,
+            'y_mean': y_mean, 'y_std': y_std
+        }
+
+        Y_pred = self.get_means(X)
+        errors = Y_pred - (Y * y_std + y_mean)
+        logging.info(f'  training MAE: {np.mean(np.abs(errors)):.2f}, '
+                     f'MSE: {np.mean(np.power(errors, 2)):.2f}')
+        return True
+
+    def select_inducing(self, X: ndarray) -> ndarray:
+        """Select the indices of the inducing points among the rows of X"""
+        m = min(self.n_inducing, len(X))
+        if m == len(X):
+            return np.arange(len(X))
+
+        if self.inducing_method == 'kmeans':
+            return kmeans_medoids(X, m)
+
+        return kcenter(X, m)
+
+    def get_means(self, xs: Sequence) -> ndarray:
+        return self._predict(xs, False)[0]
+
+    def get_means_and_vars(self, xs: Sequence) -> Tuple[ndarray, ndarray]:
+        return self._predict(xs, True)
+
+    def _predict(self, xs: Sequence, vars_: bool) -> Tuple[ndarray, ndarray]:
+        X = np.asarray(np.stack(xs, axis=0), dtype=float)
+        K, K_diag = KERNELS[self.kernel]
+        Z, Lm, LB, c = (self.model[k] for k in ('Z', 'Lm', 'LB', 'c'))
+        y_mean, y_std = self.model['y_mean'], self.model['y_std']
+
+        Kmn = K(Z, X, n_threads=self.ncpu)
+        tmp1 = solve_triangular(Lm, Kmn, lower=True)
+        tmp2 = solve_triangular(LB, tmp1, lower=True)
+        means = tmp2.T @ c * y_std + y_mean
+
+        if not vars_:
+            return means, None
+
+        variances = (
+            K_diag(X) - np.square(tmp1).sum(0) + np.square(tmp2).sum(0)
+        )
+        return means, np.maximum(variances, 0.) * y_std**2
+
+def kcenter(X: ndarray, m: int) -> ndarray:
+    """Select m rows of X by greedy farthest-point (k-center) selection in
+    Tanimoto distance, starting from the row with the most on-bits
+
+    Returns
+    -------
+    ndarray
+        the indices of the selected rows
+    """
+    fps = similarity.pack(X)
+    counts = similarity.counts(fps)
+
+    idxs = [int(np.argmax(counts))]
+    dists = np.full(len(X), np.inf)
+    for _ in range(m - 1):
+        i = idxs[-1]
+        S = similarity.tanimoto(fps[i:i+1], fps, counts[i:i+1], counts)[0]
+        np.minimum(dists, 1 - S, out=dists)
+        idxs.append(int(np.argmax(dists)))
+
+    return np.array(idxs)
+
+def kmeans_medoids(X: ndarray, m: int) -> ndarray:
+    """Select the m rows of X closest to the centroids of a k-means
+    clustering of X
+
+    Returns
+    -------
+    ndarray
+        the indices of the selected rows. Duplicates are removed, so fewer
+        than m rows may be selected
+    """
+    kmeans = MiniBatchKMeans(m, n_init=3, random_state=0).fit(X)
+    dists = kmeans.transform(X)
+
+    return np.unique(dists.argmin(axis=0))
+
+def _dotproduct(X: ndarray, Y: ndarray, n_threads: int = 1) -> ndarray:
+    return X @ Y.T + 1.
+
+def _dotproduct_diag(X: ndarray) -> ndarray:
+    return np.einsum('ij,ij->i', X, X) + 1.
+
+# a map from a kernel's name to its kernel and kernel diagonal functions
+KERNELS = {
+    'dotproduct': (_dotproduct, _dotproduct_diag),
+    'tanimoto': (tanimoto_kernel, tanimoto_kernel_diag),
+}
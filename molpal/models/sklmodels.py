@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from pathlib import Path
 import pickle
@@ -5,10 +6,14 @@ from typing import Callable, Iterable, Optional, Sequence, Tuple, TypeVar
 
 import numpy as np
 from numpy import ndarray
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import (
+    HistGradientBoostingRegressor, RandomForestRegressor
+)
 from sklearn.gaussian_process import GaussianProcessRegressor, kernels
+from threadpoolctl import threadpool_limits
 
 from molpal.models.base import Model
+from molpal.models.kernels import TanimotoKernel
 from molpal.models.utils import feature_matrix
 
 T = TypeVar('T')
@@ -22,6 +27,19 @@ class RFModel(Model):
         the number of jobs to parallelize training and prediction over
     model : RandomForestRegressor
         the underlying model on which to train and perform inference
+    n_trees : int
+        the number of trees in the forest
+    online : bool
+        whether to train the forest incrementally. See train()
+    new_trees : int
+        the number of trees to grow in each round of online training
+    max_samples : int
+        the maximum number of most recent training points retained for
+        online training
+    X_train : Optional[ndarray]
+        the retained training inputs for online training
+    Y_train : Optional[ndarray]
+        the retained training outputs for online training
     
     Parameters
     ----------
@@ -29,15 +47,32 @@ class RFModel(Model):
         the size into which testing data should be batched
     ncpu : int (Default = 1)
         the number of cores training/inference should be distributed over
+    n_trees : int (Default = 100)
+    rf_online : bool (Default = False)
+    rf_new_trees : int (Default = 20)
+    rf_max_samples : int (Default = 10000)
     """
 
     def __init__(self, test_batch_size: Optional[int] = 10000,
-                 ncpu: int = 1, **kwargs):
+                 ncpu: int = 1, n_trees: int = 100, rf_online: bool = False,
+                 rf_new_trees: int = 20, rf_max_samples: int = 10000,
+                 **kwargs):
         test_batch_size = test_batch_size or 10000
         super().__init__(test_batch_size, ncpu=ncpu, **kwargs)
 
+        if not 0 < rf_new_trees <= n_trees:
+            raise ValueError(
+                f'rf_new_trees(={rf_new_trees}) must be in (0, {n_trees}]')
+
+        self.n_trees = n_trees
+        self.online = rf_online
+        self.new_trees = rf_new_trees
+        self.max_samples = rf_max_samples
+        self.X_train = None
+        self.Y_train = None
+
         self.model = RandomForestRegressor(
-            n_estimators=100,
+            n_estimators=n_trees,
             n_jobs=self.ncpu,
             max_depth=8,
             verbose=1,
@@ -53,11 +88,32 @@ class RFModel(Model):
 
     def train(self, xs: Iterable[T], ys: Iterable[float], *,
               featurize: Callable[[T], ndarray], retrain: bool = True):
-        # retrain means nothing for this model- internally it always retrains
+        """Train the model on xs and ys
+
+        Outside of online mode, retrain means nothing for this model-
+        internally it always refits the full forest on the given data.
+
+        In online mode, the new data are appended to the retained training
+        data, of which only the max_samples most recent points are kept.
+        Unless retrain is True or the forest has not yet been fit, new_trees
+        trees are then grown on the retained data (via warm_start) and the
+        oldest trees are retired so that the forest holds n_trees trees. The
+        cost of each round of training is therefore bounded by new_trees and
+        max_samples rather than growing with the total amount of data.
+        """
         X = feature_matrix(xs, featurize, self.ncpu)
         Y = np.array(ys)
 
-        self.model.fit(X, Y)
+        if self.online:
+            X, Y = self._retain(X, Y)
+
+        if (not self.online or retrain
+                or not hasattr(self.model, 'estimators_')):
+            self.model.set_params(n_estimators=self.n_trees, warm_start=False)
+            self.model.fit(X, Y)
+        else:
+            self._grow(X, Y)
+
         Y_pred = self.model.predict(X)
         errors = Y_pred - Y
         logging.info(f'  training MAE: {np.mean(np.abs(errors)):.2f},'
@@ -68,14 +124,186 @@ class RFModel(Model):
         X = np.stack(xs, axis=0)
         return self.model.predict(X)
 
+    def save(self, path: str) -> str:
+        path = super().save(path)
+
+        if self.online and self.X_train is not None:
+            np.savez(Path(path) / 'train.npz', X=self.X_train, Y=self.Y_train)
+
+        return path
+
+    def load(self, path: str) -> None:
+        super().load(path)
+
+        p_train = Path(path) / 'train.npz'
+        if p_train.exists():
+            data = np.load(p_train)
+            self.X_train, self.Y_train = data['X'], data['Y']
+
+    def _retain(self, X: ndarray, Y: ndarray) -> Tuple[ndarray, ndarray]:
+        """Append X and Y to the retained training data, keep only the
+        max_samples most recent points, and return the retained data"""
+        if self.X_train is not None and len(self.X_train) > 0:
+            X = np.concatenate((self.X_train, X.astype(self.X_train.dtype)))
+            Y = np.concatenate((self.Y_train, Y))
+
+        self.X_train = X[-self.max_samples:]
+        self.Y_train = Y[-self.max_samples:]
+
+        return self.X_train, self.Y_train
+
+    def _grow(self, X: ndarray, Y: ndarray) -> None:
+        """Grow new_trees trees on X and Y and retire the oldest trees"""
+        n_old = self.n_trees - self.new_trees
+        self.model.estimators_ = self.model.estimators_[-n_old:] if n_old else []
+
+        self.model.set_params(
+            n_estimators=len(self.model.estimators_) + self.new_trees,
+            warm_start=True
+        )
+        self.model.fit(X, Y)
+
     def get_means_and_vars(self, xs: Sequence) -> Tuple[ndarray, ndarray]:
-        X = np.stack(xs, axis=0)
-        preds = np.zeros((len(X), len(self.model.estimators_)))
-        for j, submodel in enumerate(self.model.estimators_):
-            preds[:, j] = submodel.predict(xs)
+        """Calculate the mean and variance of the trees' predictions
+
+        The trees are split across ncpu threads, each of which accumulates
+        the running mean and sum of squared deviations of its trees'
+        predictions (Welford's algorithm). Tree inference releases the GIL,
+        so the threads run in parallel, and only O(N) memory per thread is 
+        needed rather than an N x n_trees matrix. The per-thread moments are
+        then merged pairwise (Chan et al.)
+        """
+        X = np.ascontiguousarray(np.stack(xs, axis=0), dtype=np.float32)
+        trees = self.model.estimators_
+        n_threads = max(min(self.ncpu, len(trees)), 1)
+
+        def moments(trees_):
+            n = 0
+            mean = np.zeros(len(X))
+            M2 = np.zeros(len(X))
+            for tree in trees_:
+                y = tree.predict(X, check_input=False)
+                n += 1
+                delta = y - mean
+                mean += delta / n
+                M2 += delta * (y - mean)
+
+            return n, mean, M2
 
-        return np.mean(preds, axis=1), np.var(preds, axis=1)
+        with ThreadPoolExecutor(n_threads) as pool:
+            results = list(pool.map(
+                moments, [trees[i::n_threads] for i in range(n_threads)]
+            ))
+
+        n, mean, M2 = results[0]
+        for n_b, mean_b, M2_b in results[1:]:
+            n_ab = n + n_b
+            delta = mean_b - mean
+            mean = mean + delta * (n_b / n_ab)
+            M2 = M2 + M2_b + delta**2 * (n * n_b / n_ab)
+            n = n_ab
+
+        return mean, M2 / n
     
+class GBModel(Model):
+    """A histogram gradient-boosted tree model for estimating mean and
+    variance
+
+    The mean is predicted by a model fit with the squared error loss. The
+    variance is estimated from two additional models fit with the quantile
+    loss at the 15.9th and 84.1st percentiles, which lie one standard
+    deviation below and above the mean of a normal distribution, so that
+    sigma = (q_84.1 - q_15.9) / 2. Features that are constant over the
+    training data carry no information and are dropped before training,
+    which reduces the cost of building each tree's histograms.
+
+    The model is typically more accurate than the RandomForestModel, but it
+    is not faster on a single core: trained on 10% of Enamine50k with
+    scripts/benchmark_models.py, training took 23.7s (vs. 19.9s for a
+    random forest) and inference over the pool 2.1s (vs. 1.2s.)
+
+    Attributes
+    ----------
+    model : Dict
+        the 'mean', 'lower' quantile, and 'upper' quantile models and the
+        boolean mask of the 'features' on which they were trained
+    
+    Parameters
+    ----------
+    test_batch_size : Optional[int] (Default = 10000)
+    ncpu : int (Default = 1)
+        the number of threads over which to parallelize training and
+        inference
+    gb_max_iter : int (Default = 100)
+        the number of boosting iterations of each model
+    gb_lr : float (Default = 0.1)
+        the learning rate of each model
+    """
+    QUANTILES = (0.159, 0.841)
+
+    def __init__(self, test_batch_size: Optional[int] = 10000,
+                 ncpu: int = 1, gb_max_iter: int = 100, gb_lr: float = 0.1,
+                 **kwargs):
+        test_batch_size = test_batch_size or 10000
+        super().__init__(test_batch_size, ncpu=ncpu, **kwargs)
+
+        params = {'max_iter': gb_max_iter, 'learning_rate': gb_lr}
+        lo, hi = self.QUANTILES
+        self.model = {
+            'features': None,
+            'mean': HistGradientBoostingRegressor(**params),
+            'lower': HistGradientBoostingRegressor(
+                loss='quantile', quantile=lo, **params
+            ),
+            'upper': HistGradientBoostingRegressor(
+                loss='quantile', quantile=hi, **params
+            )
+        }
+
+    @property
+    def provides(self):
+        return {'means', 'vars'}
+
+    @property
+    def type_(self):
+        return 'gb'
+
+    def train(self, xs: Iterable[T], ys: Iterable[float], *,
+              featurize: Callable[[T], ndarray], retrain: bool = True):
+        X = feature_matrix(xs, featurize, self.ncpu)
+        Y = np.array(ys)
+
+        features = (X != X[0]).any(axis=0)
+        if not features.any():
+            # every input is identical, but the models need a feature
+            features[0] = True
+        self.model['features'] = features
+        X = X[:, features]
+
+        with threadpool_limits(max(self.ncpu, 1)):
+            for k in ('mean', 'lower', 'upper'):
+                self.model[k].fit(X, Y)
+            Y_pred = self.model['mean'].predict(X)
+
+        errors = Y_pred - Y
+        logging.info(f'  training MAE: {np.mean(np.abs(errors)):.2f},'
+                     f'MSE: {np.mean(np.power(errors, 2)):.2f}')
+        return True
+
+    def get_means(self, xs: Sequence) -> ndarray:
+        X = np.stack(xs, axis=0)[:, self.model['features']]
+        with threadpool_limits(max(self.ncpu, 1)):
+            return self.model['mean'].predict(X)
+
+    def get_means_and_vars(self, xs: Sequence) -> Tuple[ndarray, ndarray]:
+        X = np.stack(xs, axis=0)[:, self.model['features']]
+        with threadpool_limits(max(self.ncpu, 1)):
+            means = self.model['mean'].predict(X)
+            lower = self.model['lower'].predict(X)
+            upper = self.model['upper'].predict(X)
+
+        return means, np.square(np.maximum(upper - lower, 0.) / 2)
+
 class GPModel(Model):
     """Gaussian process model
     
@@ -84,10 +312,15 @@ class GPModel(Model):
     model : GaussianProcessRegressor
     kernel : kernels.Kernel
         the GP kernel that will be used
+    normalize_y : bool
+        whether to normalize the targets before training
 
     Parameters
     ----------
     gp_kernel : str (Default = 'dotproduct')
+        'dotproduct': a dot product kernel on the raw feature vectors
+        'tanimoto': a scaled Tanimoto kernel on the bit-packed feature
+            vectors plus white noise
     ncpu : int (Default = 0)
     test_batch_size : Optional[int] (Default = 1000)
     """
@@ -97,9 +330,17 @@ class GPModel(Model):
         super().__init__(test_batch_size, ncpu=ncpu, **kwargs)
 
         self.model = None
-        self.kernel = {
-            'dotproduct': kernels.DotProduct
-        }[gp_kernel]()
+        if gp_kernel == 'dotproduct':
+            self.kernel = kernels.DotProduct()
+            self.normalize_y = False
+        elif gp_kernel == 'tanimoto':
+            self.kernel = (
+                kernels.ConstantKernel() * TanimotoKernel(max(ncpu, 1))
+                + kernels.WhiteKernel(0.1)
+            )
+            self.normalize_y = True
+        else:
+            raise ValueError(f'Unrecognized kernel: "{gp_kernel}"')
         
     @property
     def provides(self):
@@ -111,10 +352,12 @@ class GPModel(Model):
 
     def train(self, xs: Iterable[T], ys: Iterable[float], *,
               featurize: Callable[[T], ndarray], retrain: bool = False) -> bool:
-        X = feature_matrix(xs, featurize, self.ncpu)
+        X = np.asarray(feature_matrix(xs, featurize, self.ncpu), dtype=float)
         Y = np.array(ys)
 
-        self.model = GaussianProcessRegressor(kernel=self.kernel)
+        self.model = GaussianProcessRegressor(
+            kernel=self.kernel, normalize_y=self.normalize_y
+        )
         self.model.fit(X, Y)
         Y_pred = self.model.predict(X)
         errors = Y_pred - Y
@@ -124,12 +367,12 @@ class GPModel(Model):
         return True
 
     def get_means(self, xs: Sequence) -> ndarray:
-        X = np.stack(xs, axis=0)
+        X = np.stack(xs, axis=0).astype(float)
 
         return self.model.predict(X)
 
     def get_means_and_vars(self, xs: Sequence) -> Tuple[ndarray, ndarray]:
-        X = np.stack(xs, axis=0)
+        X = np.stack(xs, axis=0).astype(float)
         Y_mean, Y_sd = self.model.predict(X, return_std=True)
 
         return Y_mean, np.power(Y_sd, 2)
@@ -1,7 +1,8 @@
 """utility functions for the models module"""
 from concurrent.futures import ProcessPoolExecutor as Pool
 from itertools import islice
-from typing import Callable, Iterable, Iterator, List, TypeVar
+from typing import (Callable, Dict, Iterable, Iterator, List, Optional,
+                    TypeVar)
 
 import numpy as np
 from tqdm import tqdm
@@ -15,16 +16,128 @@ def batches(it: Iterable[T], chunk_size: int) -> Iterator[List]:
     return iter(lambda: list(islice(it, chunk_size)), [])
 
 def get_model_types() -> List[str]:
-    return ['rf', 'gp', 'nn', 'mpn']
+    return ['rf', 'gb', 'gp', 'sgp', 'knn', 'linear', 'nn', 'mpn']
 
 def feature_matrix(xs: Iterable[T], featurize: Callable[[T], np.ndarray],
                    ncpu: int = 0) -> np.ndarray:
     """Calculate the feature matrix of xs with the given featurization
-    function"""
+    function
+
+    If featurize is a PoolFeaturizer, the features of xs are instead read
+    from its pool where possible. See PoolFeaturizer for more details"""
+    if isinstance(featurize, PoolFeaturizer):
+        return featurize.feature_matrix(xs, ncpu)
+
+    return np.array(_featurize(xs, featurize, ncpu))
+
+class PoolFeaturizer:
+    """A PoolFeaturizer featurizes inputs by reading their precalculated
+    feature representations from a MoleculePool
+
+    Inputs whose pool index is unknown (e.g., those loaded from the scores of
+    a previous run that are absent from the pool) are instead featurized
+    with a fallback function and memoised, so that each input is featurized
+    at most once per run. A PoolFeaturizer may be passed anywhere a
+    featurization function is expected, but it is only efficient when used
+    through feature_matrix(), which reads the features of many inputs at
+    once. The feature matrix keeps the dtype of the pool's fingerprints
+    (e.g., int8), so models that need floating point inputs must cast them.
+
+    Attributes
+    ----------
+    pool : MoleculePool
+        the pool from which to read feature representations
+    featurize : Callable[[T], np.ndarray]
+        the fallback featurization function
+    idxs : Dict[T, int]
+        a mapping from an input to its index in the pool
+    cache : Dict[T, np.ndarray]
+        the memoised feature representations of inputs absent from idxs
+
+    Parameters
+    ----------
+    pool : MoleculePool
+    featurize : Callable[[T], np.ndarray]
+    idxs : Optional[Dict[T, int]] (Default = None)
+    """
+    def __init__(self, pool, featurize: Callable[[T], np.ndarray],
+                 idxs: Optional[Dict[T, int]] = None):
+        self.pool = pool
+        self.featurize = featurize
+        self.idxs = idxs or {}
+        self.cache = {}
+
+    def __call__(self, x: T) -> np.ndarray:
+        return self.feature_matrix([x])[0]
+
+    def feature_matrix(self, xs: Iterable[T], ncpu: int = 0) -> np.ndarray:
+        """Get the feature matrix of xs
+
+        Parameters
+        ----------
+        xs : Iterable[T]
+            the inputs to featurize
+        ncpu : int (Default = 0)
+            the number of cores over which to featurize cache misses
+
+        Returns
+        -------
+        np.ndarray
+            the feature matrix, parallel to xs
+        """
+        xs = list(xs)
+        if len(xs) == 0:
+            return np.empty((0, 0))
+
+        i_pool, idxs = [], []
+        misses = set()
+        for i, x in enumerate(xs):
+            idx = self.idxs.get(x)
+            if idx is not None:
+                i_pool.append(i)
+                idxs.append(idx)
+            elif x not in self.cache:
+                misses.add(x)
+
+        if misses:
+            misses = list(misses)
+            self.cache.update(zip(
+                misses, _featurize(misses, self.featurize, ncpu)
+            ))
+
+        X_pool = self._read(np.array(idxs, dtype=int))
+        X_cache = [self.cache[x] for x in xs if x not in self.idxs]
+
+        Xs = ([X_pool] if len(X_pool) > 0 else []) + X_cache[:1]
+        n_features = Xs[0].shape[-1]
+        X = np.empty((len(xs), n_features), dtype=np.result_type(*Xs))
+
+        in_pool = np.zeros(len(xs), dtype=bool)
+        in_pool[i_pool] = True
+        X[in_pool] = X_pool
+        if X_cache:
+            X[~in_pool] = X_cache
+
+        return X
+
+    def _read(self, idxs: np.ndarray) -> np.ndarray:
+        """Read the feature representations of the inputs at the given pool
+        indices, in the same order as idxs"""
+        if len(idxs) == 0:
+            return np.empty((0, 0))
+
+        uniq_idxs, inv = np.unique(idxs, return_inverse=True)
+        X = np.concatenate([
+            self.pool.get_fps(uniq_idxs[i:i+self.pool.chunk_size])
+            for i in range(0, len(uniq_idxs), self.pool.chunk_size)
+        ])
+
+        return X[inv]
+
+def _featurize(xs: Iterable[T], featurize: Callable[[T], np.ndarray],
+               ncpu: int = 0) -> List[np.ndarray]:
     if ncpu <= 1:
-        X = [featurize(x) for x in tqdm(xs, desc='Featurizing', smoothing=0.)]
-    else:
-        with Pool(max_workers=ncpu) as pool:
-            X = list(tqdm(pool.map(featurize, xs), desc='Featurizing'))
-    
-    return np.array(X)
+        return [featurize(x) for x in tqdm(xs, desc='Featurizing', smoothing=0.)]
+
+    with Pool(max_workers=ncpu) as pool:
+        return list(tqdm(pool.map(featurize, xs), desc='Featurizing'))
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Collection, Dict, Optional, TypeVar
+from itertools import islice
+from typing import (Collection, Dict, Iterable, Iterator,
+                    Optional, Tuple, TypeVar)
 
 T = TypeVar('T')
 
@@ -21,10 +23,47 @@ class Objective(ABC):
     def __init__(self, minimize: bool = False, **kwargs):
         self.c = -1 if minimize else 1
 
+    @property
+    def costs(self) -> Dict[T, float]:
+        """Dict[T, float] : the observed CPU time in seconds taken to
+        evaluate each input so far. Empty if this objective does not record
+        its costs"""
+        return {}
+
     def __call__(self, *args, **kwargs) -> Dict[T, Optional[float]]:
         self.calc(*args, **kwargs)
 
     @abstractmethod
     def calc(self,  xs: Collection[T], 
              *args, **kwargs) -> Dict[T, Optional[float]]:
-        """Calculate the objective function for a collection of inputs"""
\ No newline at end of file
+        """Calculate the objective function for a collection of inputs"""
+
+    def stream(self, xs: Iterable[T], *args, chunksize: int = 1,
+               **kwargs) -> Iterator[Tuple[T, Optional[float]]]:
+        """Calculate the objective function for a stream of inputs,
+        yielding each result as soon as it is available
+
+        Inputs are only pulled from xs as results are yielded, so xs may be 
+        a lazy iterable that the client extends while consuming the stream.
+        By default, this calls calc() on successive chunks of xs. Objectives
+        that can evaluate inputs concurrently should override this method.
+
+        Parameters
+        ----------
+        xs : Iterable[T]
+            the inputs for which to calculate the objective function
+        chunksize : int (Default = 1)
+            the number of inputs to pull from xs for each call to calc()
+        *args, **kwargs
+            additional positional and keyword arguments to pass to calc()
+        
+        Yields
+        ------
+        x : T
+            an input
+        y : Optional[float]
+            its objective function value
+        """
+        xs = iter(xs)
+        for xs_chunk in iter(lambda: list(islice(xs, chunksize)), []):
+            yield from self.calc(xs_chunk, *args, **kwargs).items()
@@ -7,7 +7,7 @@ import os
 from pathlib import Path
 import shelve
 import tempfile
-from typing import Dict, List, Optional, Tuple, TypeVar
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 from molpal.objectives.base import Objective
 from molpal.objectives import utils
@@ -119,6 +119,10 @@ class DockingObjective(Objective):
 
         super().__init__(minimize=True)
 
+    @property
+    def costs(self) -> Dict[str, float]:
+        return self.docking_screener.ligand_times
+
     def calc(self, smis: List[str],
              in_path: Optional[str] = None,
              out_path: Optional[str] = None,
@@ -163,6 +167,38 @@ class DockingObjective(Objective):
             for smi, score in scores.items()
         }
 
+    def stream(self, smis: Iterable[str],
+               in_path: Optional[str] = None,
+               out_path: Optional[str] = None,
+               **kwargs) -> Iterator[Tuple[str, Optional[float]]]:
+        """Calculate the docking scores for a stream of SMILES strings,
+        yielding each score as soon as the ligand has been docked
+
+        Parameters
+        ----------
+        smis : Iterable[str]
+            the SMILES strings of the ligands to dock. Only pulled from as
+            docking workers become free, so this may be a lazy iterable
+        in_path : Optional[str] (Default = None)
+        out_path : Optional[str] (Default = None)
+        **kwargs
+            additional and unused keyword arguments
+
+        Streams may be consumed concurrently, e.g., by a pipelined Explorer.
+        Their paths are passed to the screener with each stream rather than
+        set on it, and they share the screener's pool of docking workers.
+
+        Yields
+        ------
+        smi : str
+            the SMILES string of a docked ligand
+        score : Optional[float]
+            its docking score. None if the ligand failed to dock
+        """
+        stream = self.docking_screener.dock_stream(smis, in_path, out_path)
+        for smi, score in stream:
+            yield smi, self.c * score if score else None
+
     def _build_input_map(self, input_map_file) -> str:
         """Build the input map dictionary
 
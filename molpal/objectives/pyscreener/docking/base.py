@@ -1,13 +1,15 @@
 from abc import ABC, abstractmethod
-from concurrent.futures import Executor
+from concurrent.futures import Executor, wait, FIRST_COMPLETED
 import csv
 from functools import partial
 from itertools import chain
 from math import ceil, exp, log10
 import os
 from pathlib import Path
+import threading
 import timeit
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Type
+from typing import (Callable, Dict, Iterable, Iterator, List,
+                    Optional, Sequence, Tuple, Type)
 
 from rdkit import Chem
 from tqdm import tqdm
@@ -56,6 +58,10 @@ class Screener(ABC):
         the path under which all generated output will be placed
     verbose : int
         the level of output this Screener should output
+    ligand_times : Dict[str, float]
+        a mapping from the SMILES string of each ligand docked by this Screener
+        to the CPU time in seconds (i.e., the wall time multiplied by ncpu) of
+        all its docking runs
 
     Parameters
     ----------
@@ -103,6 +109,12 @@ class Screener(ABC):
         self.verbose = verbose
 
         self.num_docked_ligands = 0
+        self.ligand_times = {}
+
+        # guards the ligand counter and the pool shared by concurrent streams
+        self._lock = threading.Lock()
+        self._stream_pool = None
+        self._n_streams = 0
         
     def __len__(self) -> int:
         """The number of ligands this screener has simulated"""
@@ -194,6 +206,7 @@ class Screener(ABC):
                 self.ensemble_score_mode
             )
             smis_scores.append((smi, score))
+            self.ligand_times[smi] = self.calc_ligand_time(ligand_results)
 
         d_smi_score = {}
         for smi_score in smis_scores:
@@ -268,6 +281,140 @@ class Screener(ABC):
 
         return recordsss
 
+    def dock_stream(self, smis: Iterable[str],
+                    in_path: Optional[str] = None,
+                    out_path: Optional[str] = None
+                    ) -> Iterator[Tuple[str, Optional[float]]]:
+        """Dock a stream of SMILES strings, yielding the score of each 
+        ligand as soon as all of its docking runs have finished
+
+        Each ligand is prepared and docked in a single task, and only twice as
+        many tasks as there are workers are kept in flight. SMILES strings are
+        pulled from smis only when a task finishes, so smis may be a lazy
+        iterable that the client extends while consuming the stream.
+
+        Streams may be consumed concurrently from separate threads. They
+        share a single process pool, so concurrent streams queue their tasks
+        for the same workers rather than each starting workers of their own.
+
+        Parameters
+        ----------
+        smis : Iterable[str]
+            the SMILES strings of the ligands to dock
+        in_path : Optional[str] (Default = None)
+            the path under which the input files of these ligands should be
+            written. If None, use the Screener's in_path
+        out_path : Optional[str] (Default = None)
+            the path under which the output files of these ligands should be
+            written. If None, use the Screener's out_path
+
+        Yields
+        ------
+        smi : str
+            the SMILES string of a docked ligand
+        score : Optional[float]
+            the overall score of the ligand. None if preparation or docking
+            failed
+        """
+        in_path = Path(in_path or self.in_path)
+        out_path = Path(out_path or self.out_path)
+        in_path.mkdir(parents=True, exist_ok=True)
+        out_path.mkdir(parents=True, exist_ok=True)
+
+        prepare_and_dock = partial(
+            _prepare_and_dock, prepare_from_smi=self.prepare_from_smi,
+            dock_ligand=self.dock_ligand_partial(in_path, out_path),
+            path=in_path
+        )
+        max_inflight = 2 * self.pool_size(self.distributed, self.num_workers)
+        smis = iter(smis)
+
+        pool = self._open_stream_pool()
+        try:
+            def submit():
+                smi = next(smis, None)
+                if smi is None:
+                    return None
+
+                with self._lock:
+                    name = f'ligand_{self.num_docked_ligands}'
+                    self.num_docked_ligands += 1
+                return pool.submit(prepare_and_dock, smi, name)
+
+            futures = {submit() for _ in range(max_inflight)} - {None}
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    smi, ligand_results = future.result()
+                    if ligand_results is None:
+                        score = None
+                    else:
+                        score = self.calc_ligand_score(
+                            ligand_results, self.receptor_score_mode,
+                            self.ensemble_score_mode
+                        )
+                        self.ligand_times[smi] = self.calc_ligand_time(
+                            ligand_results
+                        )
+                    yield smi, score
+
+                    # only pull the next input after the client has seen this
+                    # result, so that it may first extend the input stream
+                    future = submit()
+                    if future is not None:
+                        futures.add(future)
+        finally:
+            self._close_stream_pool()
+
+    def _open_stream_pool(self) -> Executor:
+        """Get the process pool shared by all open streams, starting it if
+        no stream is open"""
+        with self._lock:
+            if self._stream_pool is None:
+                self._stream_pool = self.Pool(
+                    self.distributed, self.num_workers, self.ncpu
+                )
+            self._n_streams += 1
+
+            return self._stream_pool
+
+    def _close_stream_pool(self) -> None:
+        """Release the shared process pool, shutting it down once the last
+        open stream has released it"""
+        with self._lock:
+            self._n_streams -= 1
+            if self._n_streams > 0:
+                return
+            pool, self._stream_pool = self._stream_pool, None
+
+        pool.shutdown()
+
+    def dock_ligand_partial(self, in_path: Optional[str] = None,
+                            out_path: Optional[str] = None
+                            ) -> Callable[[Tuple[str, str]],
+                                          List[List[Dict]]]:
+        """Get a picklable function that docks a single prepared ligand
+        into the ensemble of receptors with this Screener's settings
+
+        Parameters
+        ----------
+        in_path : Optional[str] (Default = None)
+            the path under which docking input files should be written. If
+            None, use the Screener's in_path
+        out_path : Optional[str] (Default = None)
+            the path under which docking output files should be written. If
+            None, use the Screener's out_path
+
+        Returns
+        -------
+        Callable[[Tuple[str, str]], List[List[Dict]]]
+            a function that takes a tuple of a ligand's SMILES string and its 
+            input file and returns an MxO list of the records of each docking
+            run. See run_docking() for more details.
+        """
+        raise NotImplementedError(
+            f'{self.__class__.__name__} does not support streaming!')
+
     @abstractmethod
     def run_docking(self, ligands: Sequence[Tuple[str, str]]
                    ) -> List[List[List[Dict]]]:
@@ -599,6 +746,28 @@ class Screener(ABC):
         
         return ensemble_score
     
+    def calc_ligand_time(self, ligand_results: List[List[Dict]]) -> float:
+        """Calculate the total CPU time in seconds of all docking runs of a
+        ligand
+
+        Parameters
+        ----------
+        ligand_results : List[List[Dict]]
+            an MxO list of list of dictionaries where each individual
+            dictionary is a record of an individual docking run. Records
+            without a 'time' key are ignored
+
+        Returns
+        -------
+        float
+            the total CPU time of the ligand's docking runs
+        """
+        time = sum(
+            repeat.get('time', 0.)
+            for receptor in ligand_results for repeat in receptor
+        )
+        return self.ncpu * time
+
     @staticmethod
     def calc_score(scores: Sequence[float], score_mode: str = 'best') -> float:
         """Calculate an overall score from a sequence of scores
@@ -696,19 +865,50 @@ class Screener(ABC):
         Choices: see Ex. 1
         """
         if distributed:
-            from mpi4py import MPI
             from mpi4py.futures import MPIPoolExecutor as Pool
-
-            num_workers = MPI.COMM_WORLD.size
         else:
             from concurrent.futures import ProcessPoolExecutor as Pool
-            if num_workers == -1:
-                try:
-                    num_workers = len(os.sched_getaffinity(0))
-                except AttributeError:
-                    num_workers = os.cpu_count()
+
+        num_workers = Screener.pool_size(
+            distributed, num_workers, ncpu, all_cores)
+
+        return Pool(max_workers=num_workers)
+
+    @staticmethod
+    def pool_size(distributed: bool = False, num_workers: int = -1,
+                  ncpu: int = 1, all_cores: bool = False) -> int:
+        """The number of workers in a process pool built by Pool() with
+        the same arguments"""
+        if distributed:
+            from mpi4py import MPI
+
+            num_workers = MPI.COMM_WORLD.size
+        elif num_workers == -1:
+            try:
+                num_workers = len(os.sched_getaffinity(0))
+            except AttributeError:
+                num_workers = os.cpu_count()
 
         if all_cores:
             num_workers *= ncpu
 
-        return Pool(max_workers=num_workers)
+        return num_workers
+
+def _prepare_and_dock(smi: str, name: str, prepare_from_smi: Callable,
+                      dock_ligand: Callable, path: str
+                      ) -> Tuple[str, Optional[List[List[Dict]]]]:
+    """Prepare and dock a single ligand. Defined at the module level so
+    that it may be pickled for parallel processing
+
+    Returns
+    -------
+    smi : str
+        the SMILES string of the ligand
+    ligand_results : Optional[List[List[Dict]]]
+        the records of each docking run. None if preparation failed
+    """
+    ligand = prepare_from_smi(smi, name, path)
+    if ligand is None:
+        return smi, None
+
+    return smi, dock_ligand(ligand)
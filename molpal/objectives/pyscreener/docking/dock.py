@@ -282,13 +282,17 @@ class DOCK(Screener):
 
         return list(zip(smis, mol2s))
 
-    def run_docking(self, ligands: Sequence[Tuple[str, str]]
-                   ) -> List[List[List[Dict]]]:
-        dock_ligand = partial(
+    def dock_ligand_partial(self, in_path=None, out_path=None):
+        return partial(
             DOCK.dock_ligand, receptors=self.receptors,
-            in_path=self.in_path, out_path=self.out_path,
+            in_path=in_path or self.in_path,
+            out_path=out_path or self.out_path,
             repeats=self.repeats, score_mode=self.score_mode
         )
+
+    def run_docking(self, ligands: Sequence[Tuple[str, str]]
+                   ) -> List[List[List[Dict]]]:
+        dock_ligand = self.dock_ligand_partial()
         CHUNKSIZE = 2
         with self.Pool(self.distributed, self.num_workers) as pool:
             ligs_recs_reps = pool.map(dock_ligand, ligands, 
@@ -337,6 +341,7 @@ class DOCK(Screener):
             - out: the filename of the output docked ligand file
             - log: the filename of the output log file
             - score: the ligand's docking score
+            - time: the wall time of the docking run in seconds
         """
         if repeats <= 0:
             raise ValueError(f'Repeats must be greater than 0! ({repeats})')
@@ -357,7 +362,9 @@ class DOCK(Screener):
                 log = Path(outfile_prefix).parent / f'{name}.out'
                 argv = [DOCK6, '-i', infile, '-o', log]
 
+                begin = timeit.default_timer()
                 ret = sp.run(argv, stdout=sp.PIPE, stderr=sp.PIPE)
+                time = timeit.default_timer() - begin
                 try:
                     ret.check_returncode()
                 except sp.SubprocessError:
@@ -372,7 +379,8 @@ class DOCK(Screener):
                     'in': infile,
                     'log': log,
                     'out': out,
-                    'score': DOCK.parse_out_file(out, score_mode)
+                    'score': DOCK.parse_out_file(out, score_mode),
+                    'time': time
                 })
 
             if repeat_rows:
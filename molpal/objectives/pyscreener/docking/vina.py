@@ -180,15 +180,18 @@ class Vina(Screener):
 
         return list(zip(smis, pdbqts))
 
-    def run_docking(self, ligands: Sequence[Tuple[str, str]]
-                   ) -> List[List[List[Dict]]]:
-        dock_ligand = partial(
+    def dock_ligand_partial(self, in_path=None, out_path=None):
+        return partial(
             Vina.dock_ligand,
             software=self.software, receptors=self.receptors,
             center=self.center, size=self.size, ncpu=self.ncpu,
-            extra=self.extra, path=self.out_path,
+            extra=self.extra, path=out_path or self.out_path,
             repeats=self.repeats, score_mode=self.score_mode
         )
+
+    def run_docking(self, ligands: Sequence[Tuple[str, str]]
+                   ) -> List[List[List[Dict]]]:
+        dock_ligand = self.dock_ligand_partial()
         CHUNKSIZE = 2
         with self.Pool(self.distributed, self.num_workers, self.ncpu) as pool:
             ligs_recs_reps = pool.map(dock_ligand, ligands, 
@@ -248,6 +251,7 @@ class Vina(Screener):
             - out: the filename of the output docked ligand file
             - log: the filename of the output log file
             - score: the ligand's docking score
+            - time: the wall time of the docking run in seconds
         """
         if repeats <= 0:
             raise ValueError(f'Repeats must be greater than 0! ({repeats})')
@@ -269,7 +273,9 @@ class Vina(Screener):
                     extra=extra, path=path
                 )
 
+                begin = timeit.default_timer()
                 ret = sp.run(argv, stdout=sp.PIPE, stderr=sp.PIPE)
+                time = timeit.default_timer() - begin
                 try:
                     ret.check_returncode()
                 except sp.SubprocessError:
@@ -284,7 +290,8 @@ class Vina(Screener):
                     'in': p_pdbqt,
                     'out': p_out,
                     'log': p_log,
-                    'score': Vina.parse_log_file(p_log, score_mode)
+                    'score': Vina.parse_log_file(p_log, score_mode),
+                    'time': time
                 })
 
             ensemble_rowss.append(repeat_rows)
@@ -3,7 +3,7 @@ from collections import Counter
 from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 import gzip
-from itertools import repeat
+from itertools import islice, repeat
 import os
 from pathlib import Path
 from typing import Iterator, List, Optional, Sequence, Tuple, Type, Union
@@ -13,8 +13,10 @@ import numpy as np
 from rdkit import Chem
 from tqdm import tqdm
 
+from molpal import similarity
 from molpal.encoder import Encoder
 from molpal.pools.cluster import cluster_fps_h5
+from molpal.pools.index import SimilarityIndex
 from molpal.pools import fingerprints
 
 # a Mol is a SMILES string, a fingerprint, and an optional cluster ID
@@ -52,10 +54,16 @@ class MoleculePool(Sequence[Mol]):
         the filepath of an hdf5 file containing the precomputed fingerprints
     smis_ : Optional[List[str]]
         a list of SMILES strings in the pool. None if no caching
-    cluster_ids_ : Optional[List[int]]
+    smis_h5 : Optional[str]
+        the filepath of an hdf5 file storing the SMILES strings of the pool
+        for lookup by index. None until the first lookup of an uncached pool
+    cluster_ids_ : Optional[np.ndarray]
         the cluster ID for each molecule in the molecule. None if not clustered
     cluster_sizes : Dict[int, int]
         the size of each cluster in the pool. None if not clustered
+    index : Optional[SimilarityIndex]
+        the Tanimoto similarity index of the pool. None until the first call
+        to similar()
     chunk_size : int
         the size of each chunk in the hdf5 file
     open_ : Callable[..., TextIO]
@@ -94,11 +102,17 @@ class MoleculePool(Sequence[Mol]):
     ncluster : int (Default = 100)
         the number of clusters to form. Only used if cluster is True
     path : str
-        the path under which the h5 file should be written
+        the path under which the h5 files should be written
     verbose : int (Default = 0)
     **kwargs
         additional and unused keyword arguments
     """
+    # the dataset under which the SMILES strings are stored in an HDF5 file
+    SMIS_DSET = 'smis'
+
+    # the number of SMILES strings in each chunk of that dataset
+    SMIS_CHUNK = 4096
+
     def __init__(self, library: str, title_line: bool = True,
                  delimiter: str = ',', smiles_col: int = 0,
                  fps: Optional[str] = None,
@@ -120,10 +134,13 @@ class MoleculePool(Sequence[Mol]):
         self.fps_ = fps
         self.invalid_lines = None
         self.ncpu = ncpu
+        self.path = path
 
         self.smis_ = None
+        self.smis_h5 = None
         self.cluster_ids_ = None
         self.cluster_sizes = None
+        self.index = None
         
         self.chunk_size = self._encode_mols(encoder, ncpu, path)
         self.size = self._validate_and_cache_smis(cache, validated)
@@ -214,17 +231,7 @@ class MoleculePool(Sequence[Mol]):
         if self.smis_:
             return self.smis_[idx]
 
-        while idx in self.invalid_lines:
-            # external indices correspond internally to the line immediately
-            # following the invalid line(s)
-            idx += 1
-
-        # should test out using islice to advance instead of manually
-        for i, smi in enumerate(self.smis()):
-            if i==idx:
-                return smi
-
-        assert False    # shouldn't reach this point
+        return self.get_smis([idx])[0]
 
     def get_fp(self, idx: int) -> np.ndarray:
         idx = idx
@@ -242,7 +249,7 @@ class MoleculePool(Sequence[Mol]):
         if idx < 0 or idx >= len(self):
             raise IndexError(f'pool index(={idx}) out of range')
 
-        if self.cluster_ids_:
+        if self.cluster_ids_ is not None:
             return self.cluster_ids_[idx]
 
         return None
@@ -259,6 +266,9 @@ class MoleculePool(Sequence[Mol]):
 
         NOTE: Returns the list in sorted index order
 
+        If the SMILES strings are not cached, they are read from the pool's
+        SMILES file, which is written on the first call. See _store_smis()
+
         Parameters
         ----------
         idxs : Collection[int]
@@ -267,14 +277,17 @@ class MoleculePool(Sequence[Mol]):
         if min(idxs) < 0 or max(idxs) >= len(self):
             raise IndexError(f'Pool index out of range: {idxs}')
 
-        if self.smis:
-            idxs = sorted(idxs)
-            smis = [self.smis_[i] for i in sorted(idxs)]
-        else:
-            idxs = set(idxs)
-            smis = [smi for i, smi in enumerate(self.smis()) if i in idxs]
+        if self.smis_:
+            return [self.smis_[i] for i in sorted(idxs)]
 
-        return smis
+        if self.smis_h5 is None:
+            self.smis_h5 = self._store_smis()
+
+        idxs, inverse = np.unique(idxs, return_inverse=True)
+        with h5py.File(self.smis_h5, 'r') as h5f:
+            smis = h5f[self.SMIS_DSET].asstr()[idxs]
+
+        return smis[np.sort(inverse)].tolist()
 
     def get_fps(self, idxs: Sequence[int]) -> np.ndarray:
         """Get the uncompressed feature representations for the given indices
@@ -296,6 +309,94 @@ class MoleculePool(Sequence[Mol]):
 
         return enc_mols
 
+    def get_packed_fps(self, idxs: Sequence[int]) -> np.ndarray:
+        """Get the bit-packed feature representations for the given indices
+        
+        NOTE: unlike get_fps(), returns the fingerprints in the same order as
+        idxs. Fingerprints are read and packed in chunks, so only one chunk of
+        uncompressed fingerprints is held in memory at a time
+
+        Parameters
+        ----------
+        idxs : Collection[int]
+            the indices for which to retrieve the fingerprints
+
+        Returns
+        -------
+        np.ndarray
+            the packed fingerprints. See molpal.similarity.pack()
+        """
+        idxs = np.asarray(idxs, dtype=int)
+        if len(idxs) == 0:
+            return np.empty((0, 0), dtype=np.uint64)
+
+        order = np.argsort(idxs)
+        idxs_sorted = idxs[order]
+        packed = np.concatenate([
+            similarity.pack(self.get_fps(idxs_sorted[i:i+self.chunk_size]))
+            for i in range(0, len(idxs), self.chunk_size)
+        ])
+
+        packed_ = np.empty_like(packed)
+        packed_[order] = packed
+        return packed_
+
+    def similar(self, query_fps: np.ndarray, k: int = 10,
+                n_threads: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the k pool molecules most similar to each query fingerprint
+
+        The search is exact and uses the pool's similarity index, which is
+        built on the first call. If the pool has a fingerprints file, the
+        index is loaded from and saved to that file, so it is only built
+        once per pool. See SimilarityIndex for details.
+
+        Parameters
+        ----------
+        query_fps : np.ndarray
+            an MxL array of uncompressed query fingerprints, generated with
+            the same encoder as the pool
+        k : int (Default = 10)
+            the number of neighbors to find for each query
+        n_threads : int (Default = 1)
+            the number of threads over which to split the queries
+
+        Returns
+        -------
+        idxs : np.ndarray
+            an Mxk array containing the pool index of each neighbor in order
+            of decreasing similarity
+        sims : np.ndarray
+            an Mxk array containing the corresponding Tanimoto similarities
+        """
+        if self.index is None:
+            self.index = self._build_index()
+
+        return self.index.query(similarity.pack(query_fps), k, n_threads)
+
+    def _build_index(self) -> SimilarityIndex:
+        """Load the pool's similarity index from its fingerprints file or,
+        failing that, build it from the pool's fingerprints and try to save
+        it to the fingerprints file"""
+        if self.fps_ is not None:
+            index = SimilarityIndex.load(self.fps_)
+            if index is not None:
+                return index
+
+        if self.verbose > 0:
+            print('Building similarity index ...', end=' ', flush=True)
+        index = SimilarityIndex.from_fps(self.fps_batches())
+        if self.verbose > 0:
+            print('Done!')
+
+        if self.fps_ is not None:
+            try:
+                index.save(self.fps_)
+            except OSError:
+                print('WARNING: could not write similarity index to',
+                      f'"{self.fps_}". It will be rebuilt in future runs.')
+
+        return index
+
     def get_cluster_ids(self, idxs: Sequence[int]) -> Optional[List[int]]:
         """Get the cluster_ids for the given indices, if the pool is
         clustered. Otherwise, return None
@@ -310,7 +411,7 @@ class MoleculePool(Sequence[Mol]):
         if min(idxs) < 0 or max(idxs) >= len(self):
             raise IndexError(f'Pool index out of range: {idxs}')
 
-        if self.cluster_ids:
+        if self.cluster_ids_ is not None:
             idxs = sorted(idxs)
             return [self.cluster_ids_[i] for i in idxs]
 
@@ -384,6 +485,57 @@ class MoleculePool(Sequence[Mol]):
 
         return None
 
+    def _store_smis(self) -> str:
+        """Store the SMILES strings of the pool in an HDF5 file, so that they
+        may be looked up by index without reading the library
+
+        The strings are stored in a file of their own under the pool's path,
+        never in the fingerprints file. A file that already stores the
+        SMILES strings of the same library file, as identified by its
+        resolved path, size, and modification time, is reused.
+
+        Returns
+        -------
+        str
+            the filepath of the HDF5 file
+        """
+        p_library = Path(self.library).resolve()
+        stat = p_library.stat()
+        library = {
+            'library': str(p_library),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns
+        }
+
+        path = str(Path(self.path) / f'{Path(self.library).stem}.smis.h5')
+        chunk_size = max(min(self.SMIS_CHUNK, len(self)), 1)
+        with h5py.File(path, 'a') as h5f:
+            if self.SMIS_DSET in h5f:
+                dset = h5f[self.SMIS_DSET]
+                if (len(dset) == len(self) and all(
+                    dset.attrs.get(k) == v for k, v in library.items()
+                )):
+                    return path
+                del h5f[self.SMIS_DSET]
+
+            if self.verbose > 0:
+                print(f'Storing SMILES strings in "{path}" ...',
+                      end=' ', flush=True)
+
+            dset = h5f.create_dataset(
+                self.SMIS_DSET, (len(self),),
+                dtype=h5py.string_dtype(), chunks=(chunk_size,)
+            )
+            smis = iter(self.smis())
+            for i in range(0, len(self), chunk_size):
+                dset[i:i+chunk_size] = list(islice(smis, chunk_size))
+            dset.attrs.update(library)
+
+            if self.verbose > 0:
+                print('Done!')
+
+        return path
+
     def _encode_mols(self, encoder: Type[Encoder], 
                      ncpu: int, path: str) -> int:
         """Precalculate the fingerprints of the library members, if necessary.
@@ -509,12 +661,14 @@ class MoleculePool(Sequence[Mol]):
         
         Side effects
         ------------
-        (sets) self.cluster_ids : List[int]
-            a list of cluster IDs that is parallel to the valid SMILES strings
+        (sets) self.cluster_ids_ : np.ndarray
+            the cluster IDs, parallel to the valid SMILES strings
         (sets) self.cluster_sizes : Counter[int, int]
             a mapping from cluster ID to the number of molecules in that cluster
         """
-        self.cluster_ids_ = cluster_fps_h5(self.fps_, ncluster=ncluster)
+        self.cluster_ids_ = np.array(
+            cluster_fps_h5(self.fps_, ncluster=ncluster)
+        )
         self.cluster_sizes = Counter(self.cluster_ids_)
 
 def validate_smi(smi):
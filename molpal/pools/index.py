@@ -0,0 +1,202 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Tuple
+
+import h5py
+import numpy as np
+
+from molpal import similarity
+
+class SimilarityIndex:
+    """A SimilarityIndex answers Tanimoto nearest-neighbor queries over a
+    set of fingerprints
+
+    The fingerprints are stored bit-packed and sorted by their number of
+    on-bits, so the fingerprints with any given count form a contiguous
+    block. The Tanimoto similarity of fingerprints with counts a and b is at
+    most min(a, b) / max(a, b), so a query scans the blocks in order of
+    decreasing bound and stops as soon as no remaining block can contain a
+    fingerprint more similar than its current k-th nearest neighbor.
+    Queries are exact.
+
+    Attributes
+    ----------
+    packed : np.ndarray
+        the NxW array of packed fingerprints, sorted by count
+    order : np.ndarray
+        the original index of each sorted fingerprint
+    counts : np.ndarray
+        the on-bit count of each sorted fingerprint
+    offsets : np.ndarray
+        the fingerprints with count c are packed[offsets[c]:offsets[c+1]]
+
+    Parameters
+    ----------
+    packed : np.ndarray
+        an NxW array of packed fingerprints
+    order : Optional[np.ndarray] (Default = None)
+        the original index of each fingerprint in packed. If None, the
+        fingerprints are assumed to be in original order and unsorted
+    """
+    # the name of the group under which an index is stored in an HDF5 file
+    GROUP = 'similarity_index'
+
+    # the minimum number of fingerprints compared to a query group at once
+    BLOCK_SIZE = 4096
+
+    # the number of queries searched together
+    QUERY_SIZE = 64
+
+    def __init__(self, packed: np.ndarray,
+                 order: Optional[np.ndarray] = None):
+        counts = similarity.counts(packed)
+        if order is None:
+            order = np.argsort(counts, kind='stable')
+            packed, counts = packed[order], counts[order]
+
+        self.packed = np.ascontiguousarray(packed)
+        self.order = np.asarray(order, dtype=np.int64)
+        self.counts = counts
+
+        n_bits = 64 * packed.shape[1] if packed.ndim == 2 else 0
+        self.offsets = np.zeros(n_bits + 2, dtype=np.int64)
+        np.cumsum(
+            np.bincount(counts, minlength=n_bits+1), out=self.offsets[1:]
+        )
+
+    def __len__(self) -> int:
+        return len(self.packed)
+
+    @classmethod
+    def from_fps(cls, fps_batches: Iterable) -> 'SimilarityIndex':
+        """Build an index from batches of uncompressed fingerprints"""
+        packed = [
+            similarity.pack(np.stack(list(fps))) for fps in fps_batches
+        ]
+        return cls(np.concatenate(packed))
+
+    @classmethod
+    def load(cls, fps_h5: str) -> Optional['SimilarityIndex']:
+        """Load the index stored in fps_h5, if any, and if it was built
+        from the current contents of the 'fps' dataset"""
+        with h5py.File(fps_h5, 'r') as h5f:
+            if cls.GROUP not in h5f:
+                return None
+
+            group = h5f[cls.GROUP]
+            if group.attrs.get('size') != len(h5f['fps']):
+                return None
+
+            return cls(group['packed'][:], group['order'][:])
+
+    def save(self, fps_h5: str) -> None:
+        """Store the index in fps_h5, replacing any existing index"""
+        with h5py.File(fps_h5, 'a') as h5f:
+            if self.GROUP in h5f:
+                del h5f[self.GROUP]
+
+            group = h5f.create_group(self.GROUP)
+            group.create_dataset('packed', data=self.packed)
+            group.create_dataset('order', data=self.order)
+            group.attrs['size'] = len(self)
+
+    def query(self, queries: np.ndarray, k: int = 10,
+              n_threads: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the k fingerprints most similar to each query
+
+        Queries are sorted by count and searched in groups of QUERY_SIZE, so
+        that each block of the index is compared against a whole group at
+        once. A group stops scanning once the bound of the next block is no
+        greater than the smallest k-th nearest neighbor similarity in the
+        group.
+
+        Parameters
+        ----------
+        queries : np.ndarray
+            an MxW array of packed query fingerprints
+        k : int (Default = 10)
+            the number of neighbors to find. If there are fewer than k
+            fingerprints in the index, all of them are returned
+        n_threads : int (Default = 1)
+            the number of threads over which to split the query groups
+
+        Returns
+        -------
+        idxs : np.ndarray
+            an Mxk array containing the original index of each neighbor in
+            order of decreasing similarity
+        sims : np.ndarray
+            an Mxk array containing the corresponding similarities
+        """
+        queries = np.atleast_2d(queries)
+        k = min(k, len(self))
+
+        idxs = np.empty((len(queries), k), dtype=np.int64)
+        sims = np.empty((len(queries), k), dtype=np.float32)
+        if k == 0 or len(queries) == 0:
+            return idxs, sims
+
+        counts = similarity.counts(queries)
+        order = np.argsort(counts, kind='stable')
+        groups = [
+            order[i:i+self.QUERY_SIZE]
+            for i in range(0, len(order), self.QUERY_SIZE)
+        ]
+
+        def search(group: np.ndarray):
+            idxs[group], sims[group] = self._query(
+                queries[group], counts[group], k
+            )
+
+        with ThreadPoolExecutor(max(n_threads, 1)) as pool:
+            for _ in pool.map(search, groups):
+                pass
+
+        return idxs, sims
+
+    def _query(self, queries: np.ndarray, counts: np.ndarray,
+               k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the k nearest neighbors of a group of packed queries"""
+        cs = np.arange(len(self.offsets) - 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ub = (
+                np.minimum(cs[None, :], counts[:, None])
+                / np.maximum(cs[None, :], counts[:, None])
+            )
+        ub = np.nan_to_num(ub).max(axis=0)
+
+        sizes = self.offsets[1:] - self.offsets[:-1]
+        cs = cs[sizes > 0]
+        cs = cs[np.argsort(-ub[cs], kind='stable')]
+
+        top_idxs = np.empty((len(queries), 0), dtype=np.int64)
+        top_sims = np.empty((len(queries), 0), dtype=np.float32)
+        i = 0
+        while i < len(cs):
+            if top_sims.shape[1] == k and ub[cs[i]] <= top_sims[:, -1].min():
+                break
+
+            rows = []
+            n_rows = 0
+            while i < len(cs) and n_rows < self.BLOCK_SIZE:
+                lo, hi = self.offsets[cs[i]], self.offsets[cs[i]+1]
+                rows.append(np.arange(lo, hi))
+                n_rows += hi - lo
+                i += 1
+            rows = np.concatenate(rows)
+
+            S = similarity.tanimoto(
+                queries, self.packed[rows], counts, self.counts[rows]
+            )
+            rows = np.broadcast_to(rows, S.shape)
+            top_idxs = np.hstack((top_idxs, rows))
+            top_sims = np.hstack((top_sims, S))
+
+            if top_sims.shape[1] > k:
+                top = np.argpartition(-top_sims, k-1, axis=1)[:, :k]
+                top_idxs = np.take_along_axis(top_idxs, top, axis=1)
+                top_sims = np.take_along_axis(top_sims, top, axis=1)
+            top = np.argsort(-top_sims, axis=1, kind='stable')
+            top_idxs = np.take_along_axis(top_idxs, top, axis=1)
+            top_sims = np.take_along_axis(top_sims, top, axis=1)
+
+        return self.order[top_idxs], top_sims
@@ -70,7 +70,8 @@ class LazyMoleculePool(MoleculePool):
                                      smis_chunk, chunksize=job_chunk_size)
                 yield fps_chunk
 
-    def _encode_mols(self, encoder: Type[Encoder], ncpu: int, **kwargs) -> None:
+    def _encode_mols(self, encoder: Type[Encoder], ncpu: int,
+                     *args, **kwargs) -> None:
         """
         Side effects
         ------------
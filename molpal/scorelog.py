@@ -0,0 +1,167 @@
+"""This module contains the ScoreLog class, an append-only, compressed,
+columnar log of the labels acquired over the course of an exploration"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import h5py
+import numpy as np
+
+CHUNKSIZE = 4096
+
+class ScoreLog:
+    """A ScoreLog records the objective function values of explored inputs,
+    epoch by epoch, in an HDF5 file
+
+    The file contains three parallel, gzip-compressed datasets: 'smiles',
+    'score', and 'epoch'. Each call to append() adds only the labels
+    acquired since the previous call, so logging N labels over a campaign
+    costs O(N) I/O in total. Failed evaluations are stored with a score of
+    NaN. Rows are always appended with non-decreasing epochs.
+
+    Attributes
+    ----------
+    path : Path
+        the filepath of the log
+
+    Parameter
+    ---------
+    path : str
+        the filepath of the log. Created upon the first append() if it
+        does not already exist
+    """
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def __len__(self) -> int:
+        """The number of labels in the log"""
+        if not self.path.exists():
+            return 0
+
+        with h5py.File(self.path, 'r') as h5f:
+            return len(h5f['score'])
+
+    def append(self, scores: Mapping[str, float], failures: Iterable[str],
+               epoch: int) -> None:
+        """Append the new labels of an epoch to the log
+
+        Parameters
+        ----------
+        scores : Mapping[str, float]
+            the successfully evaluated new inputs and their scores
+        failures : Iterable[str]
+            the new inputs for which evaluation failed
+        epoch : int
+            the epoch at which these labels were acquired
+        """
+        failures = list(failures)
+        smis = list(scores.keys()) + failures
+        n = len(smis)
+        if n == 0:
+            return
+
+        ys = np.empty(n, dtype=float)
+        ys[:len(scores)] = np.fromiter(scores.values(), dtype=float,
+                                       count=len(scores))
+        ys[len(scores):] = np.nan
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with h5py.File(self.path, 'a') as h5f:
+            if 'score' not in h5f:
+                self._create_datasets(h5f)
+
+            n_old = len(h5f['score'])
+            for key in ('smiles', 'score', 'epoch'):
+                h5f[key].resize((n_old + n,))
+
+            h5f['smiles'][n_old:] = smis
+            h5f['score'][n_old:] = ys
+            h5f['epoch'][n_old:] = epoch
+
+    def epochs(self) -> List[int]:
+        """The epochs recorded in the log, in ascending order"""
+        if not self.path.exists():
+            return []
+
+        with h5py.File(self.path, 'r') as h5f:
+            return np.unique(h5f['epoch'][:]).tolist()
+
+    def read(self, epoch: Optional[int] = None
+             ) -> Tuple[Dict[str, float], Dict[str, None]]:
+        """Read all labels acquired up to and including the given epoch
+
+        Parameter
+        ---------
+        epoch : Optional[int] (Default = None)
+            the last epoch to read. If None, read the full log
+
+        Returns
+        -------
+        scores : Dict[str, float]
+            the successfully evaluated inputs and their scores
+        failures : Dict[str, None]
+            the inputs for which evaluation failed
+        """
+        scores, failures = {}, {}
+        for _, new_scores, new_failures in self.iter_epochs(epoch):
+            scores.update(new_scores)
+            failures.update(new_failures)
+
+        return scores, failures
+
+    def iter_epochs(self, epoch: Optional[int] = None
+                    ) -> Iterator[Tuple[int, Dict[str, float], Dict[str, None]]]:
+        """Iterate over the labels of each epoch in the log
+
+        Parameter
+        ---------
+        epoch : Optional[int] (Default = None)
+            the last epoch to read. If None, read the full log
+
+        Yields
+        ------
+        epoch : int
+            the epoch
+        scores : Dict[str, float]
+            the inputs successfully evaluated at this epoch and their scores
+        failures : Dict[str, None]
+            the inputs for which evaluation failed at this epoch
+        """
+        if not self.path.exists():
+            return
+
+        with h5py.File(self.path, 'r') as h5f:
+            epochs = h5f['epoch'][:]
+            n = len(epochs)
+            if epoch is not None:
+                n = np.searchsorted(epochs, epoch, side='right')
+
+            smis = h5f['smiles'].asstr()[:n]
+            ys = h5f['score'][:n]
+            epochs = epochs[:n]
+
+        bounds = np.flatnonzero(np.diff(epochs)) + 1
+        for i, j in zip(np.r_[0, bounds], np.r_[bounds, n]):
+            mask = np.isnan(ys[i:j])
+            scores = dict(zip(smis[i:j][~mask].tolist(),
+                              ys[i:j][~mask].tolist()))
+            failures = dict.fromkeys(smis[i:j][mask].tolist())
+            yield int(epochs[i]), scores, failures
+
+    def truncate(self, epoch: int) -> None:
+        """Remove all labels acquired at or after the given epoch"""
+        if not self.path.exists():
+            return
+
+        with h5py.File(self.path, 'a') as h5f:
+            n = np.searchsorted(h5f['epoch'][:], epoch, side='left')
+            for key in ('smiles', 'score', 'epoch'):
+                h5f[key].resize((n,))
+
+    @staticmethod
+    def _create_datasets(h5f: h5py.File) -> None:
+        kwargs = dict(shape=(0,), maxshape=(None,), chunks=(CHUNKSIZE,),
+                      compression='gzip')
+        h5f.create_dataset('smiles', dtype=h5py.string_dtype(), **kwargs)
+        h5f.create_dataset('score', dtype='f8', **kwargs)
+        h5f.create_dataset('epoch', dtype='i4', **kwargs)
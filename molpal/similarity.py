@@ -0,0 +1,234 @@
+"""This module contains functions for calculating Tanimoto similarities
+between bit-packed molecular fingerprints"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+M1 = np.uint64(0x5555555555555555)
+M2 = np.uint64(0x3333333333333333)
+M4 = np.uint64(0x0f0f0f0f0f0f0f0f)
+H01 = np.uint64(0x0101010101010101)
+
+# the maximum number of words in the temporary arrays of tanimoto()
+BLOCKSIZE = 1 << 16
+
+# the native popcount ufunc, if this version of numpy provides one
+BITWISE_COUNT = getattr(np, 'bitwise_count', None)
+
+def pack(fps: np.ndarray) -> np.ndarray:
+    """Pack uncompressed fingerprints into 64-bit words
+
+    Parameters
+    ----------
+    fps : np.ndarray
+        an NxL array of uncompressed fingerprints, where any nonzero entry is
+        treated as an on-bit
+
+    Returns
+    -------
+    np.ndarray
+        an NxW array of type uint64 containing the packed fingerprints,
+        where W = ceil(L / 64)
+    """
+    fps = np.atleast_2d(fps)
+    packed = np.packbits(fps != 0, axis=1)
+
+    pad = -packed.shape[1] % 8
+    if pad:
+        packed = np.pad(packed, ((0, 0), (0, pad)))
+
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+def popcount(X: np.ndarray) -> np.ndarray:
+    """Count the on-bits in each word of X, an array of type uint64"""
+    X = X - ((X >> np.uint64(1)) & M1)
+    X = (X & M2) + ((X >> np.uint64(2)) & M2)
+    X = (X + (X >> np.uint64(4))) & M4
+    return (X * H01) >> np.uint64(56)
+
+def counts(fps: np.ndarray) -> np.ndarray:
+    """Count the on-bits in each packed fingerprint"""
+    return popcount(fps).sum(axis=1).astype(np.int32)
+
+def _popcount_inplace(X: np.ndarray, T: np.ndarray) -> np.ndarray:
+    """Count the on-bits in each word of X in place, using T, an array of the
+    same shape, as scratch space"""
+    if BITWISE_COUNT is not None:
+        return BITWISE_COUNT(X, out=X)
+
+    np.right_shift(X, np.uint64(1), out=T)
+    T &= M1
+    X -= T
+    np.right_shift(X, np.uint64(2), out=T)
+    T &= M2
+    X &= M2
+    X += T
+    np.right_shift(X, np.uint64(4), out=T)
+    X += T
+    X &= M4
+    X *= H01
+    X >>= np.uint64(56)
+
+    return X
+
+def tanimoto(A: np.ndarray, B: np.ndarray,
+             counts_A: Optional[np.ndarray] = None,
+             counts_B: Optional[np.ndarray] = None,
+             n_threads: int = 1) -> np.ndarray:
+    """Calculate the Tanimoto similarity between two sets of packed
+    fingerprints
+
+    The intersections are calculated in blocks of rows of A so that the
+    temporary arrays contain at most BLOCKSIZE words (or a single row of A)
+    and are reused between blocks. The similarity between two empty
+    fingerprints is defined to be 0.
+
+    Parameters
+    ----------
+    A : np.ndarray
+        an NxW array of packed fingerprints
+    B : np.ndarray
+        an MxW array of packed fingerprints
+    counts_A : Optional[np.ndarray] (Default = None)
+        the precalculated on-bit counts of A
+    counts_B : Optional[np.ndarray] (Default = None)
+        the precalculated on-bit counts of B
+    n_threads : int (Default = 1)
+        the number of threads over which to split the rows of A. numpy
+        releases the GIL inside its bitwise ufuncs, so the threads run in
+        parallel
+
+    Returns
+    -------
+    np.ndarray
+        the NxM similarity matrix
+    """
+    counts_A = counts(A) if counts_A is None else counts_A
+    counts_B = counts(B) if counts_B is None else counts_B
+
+    S = np.empty((len(A), len(B)), dtype=np.float32)
+    if S.size == 0:
+        return S
+
+    n_threads = max(min(n_threads, len(A)), 1)
+    if n_threads == 1:
+        _tanimoto(A, B, counts_A, counts_B, S)
+        return S
+
+    bounds = np.linspace(0, len(A), n_threads+1).astype(int)
+    with ThreadPoolExecutor(n_threads) as pool:
+        futures = [
+            pool.submit(
+                _tanimoto, A[i:j], B, counts_A[i:j], counts_B, S[i:j]
+            ) for i, j in zip(bounds[:-1], bounds[1:])
+        ]
+        for future in futures:
+            future.result()
+
+    return S
+
+def _tanimoto(A: np.ndarray, B: np.ndarray, counts_A: np.ndarray,
+              counts_B: np.ndarray, S: np.ndarray) -> None:
+    """Calculate the Tanimoto similarity between A and B into S"""
+    n_rows = max(BLOCKSIZE // max(B.size, 1), 1)
+    X = np.empty((min(n_rows, len(A)),) + B.shape, dtype=np.uint64)
+    T = np.empty_like(X)
+
+    for i in range(0, len(A), n_rows):
+        A_block = A[i:i+n_rows]
+        X_block = X[:len(A_block)]
+
+        np.bitwise_and(A_block[:, None, :], B[None, :, :], out=X_block)
+        I = _popcount_inplace(X_block, T[:len(A_block)]).sum(axis=2)
+        U = counts_A[i:i+n_rows, None] + counts_B[None, :] - I
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            S_block = I / U
+        S_block[U == 0] = 0.
+        S[i:i+n_rows] = S_block
+
+def max_similarity(A: np.ndarray, B: np.ndarray,
+                   counts_A: Optional[np.ndarray] = None,
+                   counts_B: Optional[np.ndarray] = None,
+                   threshold: Optional[float] = None) -> np.ndarray:
+    """Calculate the maximum Tanimoto similarity of each fingerprint in A
+    to any fingerprint in B
+
+    If a threshold is given, the bound T(a, b) <= min(|a|, |b|)/max(|a|, |b|)
+    is used to skip fingerprints in B that cannot be at least threshold
+    similar to any fingerprint in A. In this case, only the maximum
+    similarities at or above threshold are exact; the rest are reported as 0
+
+    Returns
+    -------
+    np.ndarray
+        an array of length N containing the maximum similarities. 0 if B is
+        empty
+    """
+    counts_A = counts(A) if counts_A is None else counts_A
+    counts_B = counts(B) if counts_B is None else counts_B
+
+    if threshold is not None and threshold > 0 and len(A) > 0:
+        lo = threshold * counts_A.min()
+        hi = counts_A.max() / threshold
+        mask = (lo <= counts_B) & (counts_B <= hi)
+        B, counts_B = B[mask], counts_B[mask]
+
+    if len(A) == 0 or len(B) == 0:
+        return np.zeros(len(A), dtype=np.float32)
+
+    return tanimoto(A, B, counts_A, counts_B).max(axis=1)
+
+def select_diverse(fps: np.ndarray, k: int, threshold: float,
+                   block_size: int = 1024) -> np.ndarray:
+    """Greedily select up to k mutually dissimilar fingerprints
+
+    The fingerprints are visited in order and a fingerprint is selected only
+    if its Tanimoto similarity to every previously selected fingerprint is
+    below threshold. Candidates are processed in blocks: each block is first
+    compared against the fingerprints selected from previous blocks, with
+    popcount bounds used to prune the fingerprints that need be compared
+    (see max_similarity()), and the survivors are then resolved against one
+    another.
+
+    Parameters
+    ----------
+    fps : np.ndarray
+        an NxW array of packed fingerprints in order of preference
+    k : int
+        the maximum number of fingerprints to select
+    threshold : float
+        the maximum allowed similarity between any two selected fingerprints
+    block_size : int (Default = 1024)
+        the number of candidates to process at once
+
+    Returns
+    -------
+    np.ndarray
+        the indices of the selected fingerprints in increasing order
+    """
+    counts_ = counts(fps)
+    selected = np.empty(0, dtype=int)
+
+    for i in range(0, len(fps), block_size):
+        if len(selected) >= k:
+            break
+
+        block = np.arange(i, min(i+block_size, len(fps)))
+        sims = max_similarity(
+            fps[block], fps[selected], counts_[block], counts_[selected],
+            threshold
+        )
+        block = block[sims < threshold]
+
+        S = tanimoto(fps[block], fps[block], counts_[block], counts_[block])
+        keep = np.ones(len(block), dtype=bool)
+        for j in range(len(block)):
+            if keep[j]:
+                keep[j+1:] &= S[j, j+1:] < threshold
+
+        selected = np.concatenate((selected, block[keep]))
+
+    return selected[:k]
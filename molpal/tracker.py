@@ -0,0 +1,126 @@
+"""This module contains the TopKTracker class, which maintains the order
+statistics of a growing set of scored inputs"""
+
+from typing import Iterable, List, Mapping, Optional, Tuple, TypeVar, Union
+
+import numpy as np
+
+T = TypeVar('T')
+
+class TopKTracker:
+    """A TopKTracker maintains a set of scored inputs in sorted order
+
+    Inputs and their scores are stored in parallel arrays sorted by
+    descending score, along with the prefix sums of the sorted scores. Each
+    update merges a batch of new scores into the arrays in
+    O(n + b log b) time for n tracked and b new scores, after which the
+    top-k average for any k costs O(1) and the top-k list O(k). Inputs with
+    equal scores are kept in the order in which they were added.
+
+    Attributes
+    ----------
+    xs : np.ndarray
+        the tracked inputs, sorted by descending score
+    ys : np.ndarray
+        the scores of the tracked inputs, sorted in descending order
+
+    Parameter
+    ---------
+    scores : Optional[Mapping[T, float]] (Default = None)
+        the initial scored inputs to track, if any
+    """
+    def __init__(self, scores: Optional[Mapping[T, float]] = None):
+        self.xs = np.empty(0, dtype=object)
+        self.ys = np.empty(0, dtype=float)
+        self._cumsum = None
+
+        if scores:
+            self.update(scores)
+
+    def __len__(self) -> int:
+        """The number of inputs being tracked"""
+        return len(self.ys)
+
+    @property
+    def cumsum(self) -> np.ndarray:
+        """np.ndarray : the prefix sums of the sorted scores, i.e.,
+        cumsum[i] is the sum of the top i+1 scores"""
+        if self._cumsum is None:
+            self._cumsum = np.cumsum(self.ys)
+
+        return self._cumsum
+
+    def update(self, scores: Mapping[T, float]) -> None:
+        """Add a batch of newly scored inputs to the tracker
+
+        NOTE: inputs are assumed to be new. Adding an input that is already
+        being tracked results in it being tracked twice
+
+        Parameter
+        ---------
+        scores : Mapping[T, float]
+            a mapping from each new input to its score
+        """
+        if len(scores) == 0:
+            return
+
+        xs = np.empty(len(scores), dtype=object)
+        xs[:] = list(scores.keys())
+        ys = np.fromiter(scores.values(), dtype=float, count=len(scores))
+
+        order = np.argsort(-ys, kind='stable')
+        xs = xs[order]
+        ys = ys[order]
+
+        # side='right' places new scores after any equal, older scores
+        idxs = np.searchsorted(-self.ys, -ys, side='right')
+        self.xs = np.insert(self.xs, idxs, xs)
+        self.ys = np.insert(self.ys, idxs, ys)
+        self._cumsum = None
+
+    def avg(self, k: int) -> float:
+        """Calculate the average of the top-k scores
+
+        Parameter
+        ---------
+        k : int
+            the number of scores to average. If greater than the number of
+            tracked inputs, average all tracked scores
+
+        Returns
+        -------
+        float
+            the top-k average. NaN if no inputs are being tracked
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return float('nan')
+
+        return float(self.cumsum[k-1]) / k
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[T, float]]:
+        """Get the top-k inputs and their scores
+
+        Parameter
+        ---------
+        k : Optional[int] (Default = None)
+            the number of inputs to get. If None, get all tracked inputs
+
+        Returns
+        -------
+        List[Tuple[T, float]]
+            the top-k inputs and their scores, sorted by descending score
+        """
+        if k is None:
+            k = len(self)
+
+        return list(zip(self.xs[:k].tolist(), self.ys[:k].tolist()))
+
+    def threshold(self, k: int) -> float:
+        """The score of the k-th best input, i.e., the minimum score an input
+        would need to be among the top-k. -inf if fewer than k inputs are
+        being tracked"""
+        if k <= 0 or k > len(self):
+            return float('-inf')
+
+        return float(self.ys[k-1])
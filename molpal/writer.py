@@ -0,0 +1,132 @@
+"""This module contains the BackgroundWriter class, which performs file output
+in a background thread"""
+
+import atexit
+import os
+from pathlib import Path
+from queue import Queue
+from threading import Thread
+from typing import Callable, Optional
+
+class BackgroundWriter:
+    """A BackgroundWriter runs output tasks in a background thread so that
+    they do not block the caller
+
+    Tasks are run one at a time in the order in which they were submitted.
+    The queue of pending tasks is bounded, so a caller that outpaces the disk
+    blocks in submit() rather than accumulating unbounded amounts of data in
+    memory. Files written by tasks are flushed to disk (fsynced) by flush() and
+    close(), the latter of which is also registered to run at interpreter
+    exit.
+
+    NOTE: the arguments of a task are read only when the task is run, so
+    callers must not mutate them after submission
+
+    Attributes
+    ----------
+    maxsize : int
+        the maximum number of pending tasks
+
+    Parameter
+    ---------
+    maxsize : int (Default = 4)
+    """
+    def __init__(self, maxsize: int = 4):
+        self.maxsize = maxsize
+
+        self._queue = Queue(maxsize)
+        self._thread = None
+        self._paths = set()
+        self._errors = []
+
+    def submit(self, path: Optional[str], f: Callable, *args, **kwargs) -> None:
+        """Submit a task to be run in the background
+
+        Parameters
+        ----------
+        path : Optional[str]
+            the file written by the task, which will be fsynced upon the next
+            call to flush(). If None, don't fsync anything
+        f : Callable
+            the function to run
+        *args, **kwargs
+            the positional and keyword arguments with which to call f
+
+        Raises
+        ------
+        Exception
+            the first exception raised by any previously submitted task
+        """
+        self._raise_errors()
+
+        if self._thread is None:
+            self._thread = Thread(target=self._work, daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+        self._queue.put((path, f, args, kwargs))
+
+    def flush(self) -> None:
+        """Wait for all pending tasks to finish and fsync the files they wrote
+
+        Raises
+        ------
+        Exception
+            the first exception raised by any submitted task
+        """
+        if self._thread is None:
+            return
+
+        self._queue.join()
+
+        paths, self._paths = self._paths, set()
+        for path in paths:
+            fsync(path)
+        for dir_ in {Path(path).parent for path in paths}:
+            fsync(dir_)
+
+        self._raise_errors()
+
+    def close(self) -> None:
+        """Flush all pending tasks and stop the background thread"""
+        if self._thread is None:
+            return
+
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            atexit.unregister(self.close)
+
+    def _work(self) -> None:
+        while True:
+            task = self._queue.get()
+            if task is None:
+                self._queue.task_done()
+                return
+
+            path, f, args, kwargs = task
+            try:
+                f(*args, **kwargs)
+                if path is not None:
+                    self._paths.add(str(path))
+            except Exception as e:
+                self._errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    def _raise_errors(self) -> None:
+        if self._errors:
+            e = self._errors[0]
+            self._errors = []
+            raise e
+
+def fsync(path: str) -> None:
+    """Flush the file or directory at path to disk"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -33,7 +33,12 @@ def main():
     except BaseException:
         state_file = explorer.save()
         print(f'Exception raised! Intemediate state saved to "{state_file}"')
+        if explorer.save_state:
+            chkpt = explorer.checkpoint(interrupted=True)
+            print(f'Checkpoint of the interrupted epoch written to "{chkpt}"')
         raise
+    finally:
+        explorer.close()
     stop = time()
 
     m, s = divmod(stop-start, 60)
@@ -0,0 +1,119 @@
+"""benchmark the training and inference time and the accuracy of molpal
+models on a library with precalculated scores"""
+import argparse
+import csv
+import gzip
+import os
+from pathlib import Path
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from molpal import models
+from molpal.encoder import Encoder
+from molpal.models.utils import PoolFeaturizer
+from molpal.pools import MoleculePool
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--library', default='libraries/Enamine50k.csv.gz',
+                    help='the file containing the library')
+parser.add_argument('--scores', default='data/4UNN_Enamine50k_scores.csv.gz',
+                    help='the file containing the score of each library member')
+parser.add_argument('--scores-smiles-col', type=int, default=1,
+                    help='the column containing the SMILES string in the scores file')
+parser.add_argument('--scores-data-col', type=int, default=2,
+                    help='the column containing the score in the scores file')
+parser.add_argument('--fps',
+                    help='the filepath of an hdf5 file containing the precalculated fingerprints of the library. If not specified, the fingerprints are calculated and written to a temporary directory')
+parser.add_argument('--models', nargs='+', default=['rf', 'gb'],
+                    choices=models.get_model_types(),
+                    help='the models to benchmark')
+parser.add_argument('--train-size', type=float, default=0.1,
+                    help='the number of training points, expressed either as a number or as a fraction of the scored library members')
+parser.add_argument('-nc', '--ncpu', type=int, default=1,
+                    help='the number of cores available to each model')
+parser.add_argument('--seed', type=int, default=0,
+                    help='the random seed used to select the training points')
+parser.add_argument('--fingerprint', default='pair',
+                    choices={'morgan', 'rdkit', 'pair', 'maccs', 'map4'},
+                    help='the type of encoder to use')
+parser.add_argument('--radius', type=int, default=2,
+                    help='the radius or path length to use for fingerprints')
+parser.add_argument('--length', type=int, default=2048,
+                    help='the length of the fingerprint')
+
+def read_scores(path: str, smiles_col: int, data_col: int):
+    """read the scores file into a dictionary, skipping unparseable scores.
+    Scores are negated, as molpal maximizes its objective"""
+    open_ = gzip.open if Path(path).suffix == '.gz' else open
+
+    scores = {}
+    with open_(path, 'rt') as fid:
+        reader = csv.reader(fid)
+        next(reader)
+        for row in reader:
+            try:
+                scores[row[smiles_col]] = -float(row[data_col])
+            except ValueError:
+                pass
+
+    return scores
+
+def main():
+    args = parser.parse_args()
+
+    encoder = Encoder(fingerprint=args.fingerprint, radius=args.radius,
+                      length=args.length)
+    pool = MoleculePool(args.library, fps=args.fps, encoder=encoder,
+                        ncpu=args.ncpu, validated=True,
+                        path=tempfile.gettempdir())
+    smis = list(pool.smis())
+    scores = read_scores(args.scores, args.scores_smiles_col,
+                         args.scores_data_col)
+
+    scored = np.array([i for i, smi in enumerate(smis) if smi in scores])
+    Y = np.array([scores[smis[i]] for i in scored])
+
+    n_train = int(args.train_size * len(scored)) if args.train_size <= 1 \
+        else int(args.train_size)
+    perm = np.random.default_rng(args.seed).permutation(len(scored))
+    train, test = perm[:n_train], perm[n_train:]
+
+    featurizer = PoolFeaturizer(
+        pool, encoder.encode_and_uncompress,
+        {smis[i]: i for i in scored[train]}
+    )
+    xs_train = [smis[i] for i in scored[train]]
+
+    print(f'Benchmarking on {n_train} training points, {len(test)} test '
+          f'points, and a pool of {len(pool)} molecules using {args.ncpu} '
+          'core(s)')
+    print(f'{"model":>8} {"train (s)":>10} {"infer (s)":>10} '
+          f'{"MAE":>6} {"r":>6}')
+
+    for model_type in args.models:
+        model = models.model(model_type, input_size=len(encoder),
+                             ncpu=args.ncpu, test_batch_size=None)
+
+        start = timeit.default_timer()
+        model.train(xs_train, Y[train], featurize=featurizer, retrain=True)
+        train_time = timeit.default_timer() - start
+
+        start = timeit.default_timer()
+        means, _ = model.apply(
+            x_ids=pool.smis(), x_feats=pool.fps_batches(),
+            batched_size=pool.chunk_size, size=len(pool), mean_only=False
+        )
+        infer_time = timeit.default_timer() - start
+
+        Y_pred = np.array(means)[scored[test]]
+        mae = np.abs(Y_pred - Y[test]).mean()
+        r = np.corrcoef(Y_pred, Y[test])[0, 1]
+        print(f'{model_type:>8} {train_time:10.2f} {infer_time:10.2f} '
+              f'{mae:6.3f} {r:6.3f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""materialize sorted CSV views of a molpal score log"""
+import argparse
+import csv
+import os
+from pathlib import Path
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from molpal.scorelog import ScoreLog
+from molpal.tracker import TopKTracker
+
+parser = argparse.ArgumentParser()
+parser.add_argument('log',
+                    help='the filepath of the score log (<root>/<name>/data/scores.h5)')
+parser.add_argument('--epoch', type=int,
+                    help='the last epoch to include. If not specified, use all epochs in the log')
+parser.add_argument('--all-epochs', action='store_true', default=False,
+                    help='whether to write a view of every epoch in the log, mimicking the output of a molpal run with per-iteration CSVs')
+parser.add_argument('-m', '--top-m', type=float, default=1.,
+                    help='the number of top inputs to write, expressed either as a number or as a fraction of the explored inputs')
+parser.add_argument('--include-failed', action='store_true', default=False,
+                    help='whether to include the inputs for which evaluation failed')
+parser.add_argument('-o', '--output-dir',
+                    help='the directory under which to write the CSV files. By default, the directory of the log')
+
+def write_view(output_dir: Path, epoch: int, tracker: TopKTracker,
+               failures, m: float, include_failed: bool) -> None:
+    """write the top-m inputs explored up to the given epoch to a CSV file
+    named the same way as the intermediate CSVs of a molpal run"""
+    n = len(tracker) + len(failures)
+    m = int(m * n) if m <= 1. else min(int(m), n)
+
+    p_csv = output_dir / f'top_{m}_explored_iter_{epoch}.csv'
+
+    with open(p_csv, 'w') as fid:
+        writer = csv.writer(fid)
+        writer.writerow(['smiles', 'score'])
+        writer.writerows(tracker.top(m))
+        if include_failed:
+            writer.writerows(failures.items())
+
+    print(f'Wrote "{p_csv}"')
+
+def main():
+    args = parser.parse_args()
+
+    score_log = ScoreLog(args.log)
+    output_dir = Path(args.output_dir or score_log.path.parent)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tracker = TopKTracker()
+    failures = {}
+    epoch = None
+    for epoch, new_scores, new_failures in score_log.iter_epochs(args.epoch):
+        tracker.update(new_scores)
+        failures.update(new_failures)
+
+        if args.all_epochs:
+            write_view(output_dir, epoch, tracker, failures,
+                       args.top_m, args.include_failed)
+
+    if epoch is None:
+        print(f'"{args.log}" contains no scores!')
+        exit(1)
+
+    if not args.all_epochs:
+        write_view(output_dir, epoch, tracker, failures,
+                   args.top_m, args.include_failed)
+
+if __name__ == '__main__':
+    main()
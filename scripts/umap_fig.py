@@ -267,6 +267,36 @@ def main_fig(d_smi_score, d_smi_idx, fps_embedded, data_dirs,
     plt.savefig(f'umap_fig_main_2.pdf')
     plt.clf()
 
+def preds_fig(fps_embedded, preds_npys, models):
+    """plot the embedded pool colored by the predicted scores of each model
+
+    the prediction snapshots written by molpal --save-preds are memory mapped,
+    so only the pages actually plotted are read from disk"""
+    predss = [np.load(preds_npy, mmap_mode='r') for preds_npy in preds_npys]
+    zmin = min(float(preds.min()) for preds in predss)
+    zmax = max(float(preds.max()) for preds in predss)
+
+    fig, axs = plt.subplots(1, len(predss), figsize=(4*len(predss)*1.15, 4),
+                            constrained_layout=True, squeeze=False)
+    axs = axs[0]
+    for ax, preds, model in zip(axs, predss, models):
+        ax.scatter(
+            fps_embedded[:, 0], fps_embedded[:, 1], marker='.', s=1,
+            c=preds, cmap='plasma', vmin=zmin, vmax=zmax
+        )
+        add_ellipses(ax)
+        ax.set_title(model)
+        ax.set_xticks([])
+        ax.set_yticks([])
+
+    colormap = ScalarMappable(cmap='plasma')
+    colormap.set_clim(zmin, zmax)
+    cbar = plt.colorbar(colormap, ax=list(axs), aspect=30)
+    cbar.ax.set_title('Predicted score')
+
+    plt.savefig(f'umap_fig_preds.pdf')
+    plt.clf()
+
 parser = argparse.ArgumentParser()
 parser.add_argument('--scores-dict-pkl',
                     help='the filepath of a pickle file containing the scores dictionary')
@@ -284,10 +314,18 @@ parser.add_argument('--si-fig', action='store_true', default=False,
                     help='whether to produce generate the SI fig instead of the main fig')
 parser.add_argument('--landscape', action='store_true', default=False,
                     help='whether to produce a landscape SI figure')
+parser.add_argument('--preds-npys', nargs='+',
+                    help='the prediction snapshots (preds_iter_<N>.npy files written by molpal --save-preds) of each model in --models. If specified, produce a figure of the predicted scores over the embedded pool instead')
 
 if __name__ == "__main__":
     args = parser.parse_args()
 
+    fps_embedded = np.load(args.fps_embedded_npy, mmap_mode='r')
+
+    if args.preds_npys:
+        preds_fig(fps_embedded, args.preds_npys, args.models)
+        sys.exit(0)
+
     d_smi_score = pickle.load(open(args.scores_dict_pkl, 'rb'))
 
     with open(args.smis_csv, 'r') as fid:
@@ -295,8 +333,6 @@ if __name__ == "__main__":
         smis = [row[0] for row in tqdm(reader)]
     d_smi_idx = {smi: i for i, smi in enumerate(smis)}
 
-    fps_embedded = np.load(args.fps_embedded_npy)
-
     if not args.si_fig:
         main_fig(d_smi_score, d_smi_idx, fps_embedded,
                  args.data_dirs, args.models, args.iters)
@@ -3,6 +3,7 @@ import unittest
 
 import numpy as np
 
+from molpal import similarity
 from molpal.acquirer import Acquirer
 
 class TestAcquirer(unittest.TestCase):
@@ -57,6 +58,21 @@ class TestAcquirer(unittest.TestCase):
 
         self.assertNotEqual(set(init_xs_1), set(init_xs_2))
 
+    def test_acquire_initial_idxs(self):
+        idxs = self.acq.acquire_initial_idxs()
+        self.assertEqual(len(idxs), self.init_size)
+        self.assertEqual(len(set(idxs)), self.init_size)
+        self.assertTrue(((0 <= idxs) & (idxs < len(self.xs))).all())
+
+    def test_acquire_initial_idxs_clustered(self):
+        cluster_ids = [i % 2 for i in range(len(self.xs))]
+        cluster_sizes = {0: 13, 1: 13}
+
+        idxs = self.acq.acquire_initial_idxs(cluster_ids, cluster_sizes)
+        cids = [cluster_ids[i] for i in idxs]
+        self.assertEqual(cids.count(0), 5)
+        self.assertEqual(cids.count(1), 5)
+
     def test_acquire_batch_explored(self):
         """Acquirers should not reacquire old points"""
         init_xs = self.acq.acquire_initial(self.xs)
@@ -95,6 +111,132 @@ class TestAcquirer(unittest.TestCase):
         self.assertEqual(set(batch_xs_3),
                          set(self.xs[2*self.batch_size:]))
 
+    def test_acquire_batch_idxs_order(self):
+        idxs = self.acq.acquire_batch_idxs(self.y_means, self.y_vars)
+        np.testing.assert_array_equal(idxs, np.arange(self.batch_size))
+
+    def test_acquire_batch_idxs_explored(self):
+        explored = np.zeros(len(self.xs), dtype=bool)
+        explored[:5] = True
+
+        idxs = self.acq.acquire_batch_idxs(
+            self.y_means, self.y_vars, explored=explored
+        )
+        np.testing.assert_array_equal(idxs, np.arange(5, 5+self.batch_size))
+
+    def test_acquire_batch_idxs_sharded(self):
+        """the selected batch should not depend on the number of shards"""
+        rg = np.random.default_rng(0)
+        y_means = rg.random(1000)
+        explored = rg.random(1000) < 0.5
+
+        idxss = []
+        for n_threads in (1, 3, 16):
+            acq = Acquirer(
+                size=1000, init_size=self.init_size, batch_size=50,
+                metric='greedy', epsilon=0., seed=0, n_threads=n_threads
+            )
+            idxss.append(acq.acquire_batch_idxs(
+                y_means, [], explored=explored
+            ))
+
+        for idxs in idxss[1:]:
+            np.testing.assert_array_equal(idxs, idxss[0])
+        self.assertFalse(explored[idxss[0]].any())
+        np.testing.assert_array_equal(
+            idxss[0], np.flatnonzero(~explored)[
+                np.argsort(-y_means[~explored])[:50]
+            ]
+        )
+
+    def test_acquire_batch_idxs_clustered(self):
+        """each of two equally sized clusters should contribute its own top
+        half of the batch"""
+        cluster_ids = np.arange(len(self.xs)) % 2
+        cluster_sizes = {0: 13, 1: 13}
+
+        idxs = self.acq.acquire_batch_idxs(
+            self.y_means, self.y_vars,
+            cluster_ids=cluster_ids, cluster_sizes=cluster_sizes
+        )
+        self.assertEqual(set(idxs[cluster_ids[idxs] == 0]), {0, 2, 4, 6, 8})
+        self.assertEqual(set(idxs[cluster_ids[idxs] == 1]), {1, 3, 5, 7, 9})
+
+    def test_acquire_batch_idxs_clustered_temp(self):
+        """a cluster whose best utility lies far below the global maximum
+        should have its quota scaled down"""
+        cluster_ids = (np.arange(len(self.xs)) >= 13).astype(int)
+        cluster_sizes = {0: 13, 1: 13}
+        acq = Acquirer(
+            size=len(self.xs), init_size=self.init_size,
+            batch_size=self.batch_size, metric='greedy', epsilon=0., seed=0,
+            temp_i=1., temp_f=1.
+        )
+
+        idxs = acq.acquire_batch_idxs(
+            self.y_means, self.y_vars, cluster_ids=cluster_ids,
+            cluster_sizes=cluster_sizes, epoch=0
+        )
+        n_0 = (cluster_ids[idxs] == 0).sum()
+        n_1 = (cluster_ids[idxs] == 1).sum()
+        self.assertEqual(n_0, 5)
+        self.assertLess(n_1, 5)
+
+    def test_acquire_batch_idxs_diverse(self):
+        """consecutive pairs of inputs share a fingerprint, so a diversified
+        batch should contain only the first input of each pair"""
+        fps = similarity.pack(np.eye(64)[np.arange(len(self.xs)) // 2])
+        acq = Acquirer(
+            size=len(self.xs), init_size=self.init_size,
+            batch_size=self.batch_size, metric='greedy', epsilon=0., seed=0,
+            max_similarity=0.5, shortlist_factor=3
+        )
+
+        idxs = acq.acquire_batch_idxs(
+            self.y_means, self.y_vars, get_fps=lambda idxs: fps[idxs]
+        )
+        np.testing.assert_array_equal(idxs, np.arange(0, 20, 2))
+
+    def test_acquire_batch_idxs_cost_aware(self):
+        """inputs that are twice as good but ten times as expensive should
+        be ranked below cheaper ones"""
+        costs = np.where(np.arange(len(self.xs)) < 5, 10., 1.)
+        acq = Acquirer(
+            size=len(self.xs), init_size=self.init_size,
+            batch_size=self.batch_size, metric='greedy', epsilon=0., seed=0,
+            cost_aware=True
+        )
+
+        idxs = acq.acquire_batch_idxs(self.y_means, [], costs=costs)
+        np.testing.assert_array_equal(idxs, np.arange(5, 15))
+
+    def test_acquire_batch_idxs_cost_aware_negative(self):
+        """the ranking of an input should not depend on the utility of the
+        worst input in the pool"""
+        acq = Acquirer(
+            size=3, init_size=1, batch_size=1, metric='greedy', epsilon=0.,
+            seed=0, cost_aware=True
+        )
+        costs = np.array([2., 1., 1.])
+
+        for worst in (0., -100.):
+            idxs = acq.acquire_batch_idxs([4., 1., worst], [], costs=costs)
+            np.testing.assert_array_equal(idxs, [0])
+
+    def test_acquire_batch_idxs_cpu_budget(self):
+        costs = np.full(len(self.xs), 2.)
+        acq = Acquirer(
+            size=len(self.xs), init_size=self.init_size,
+            batch_size=self.batch_size, metric='greedy', epsilon=0., seed=0,
+            cpu_budget=25.
+        )
+
+        idxs = acq.acquire_batch_idxs(self.y_means, [], costs=costs)
+        np.testing.assert_array_equal(idxs, np.arange(12))
+
+        idxs = acq.acquire_batch_idxs(self.y_means, [])
+        self.assertEqual(len(idxs), self.batch_size)
+
     def test_acquire_batch_epsilon(self):
         """There is roughly a  1-in-5*10^6 (= nCr(26, 10)) chance that a random
         batch is the same as the calculated top-m batch, causing this test to
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from molpal.models.costmodel import CostModel
+
+class TestCostModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rg = np.random.default_rng(0)
+        cls.X = (rg.random((200, 64)) < 0.2).astype(float)
+        # cost doubles with every on-bit in the first 8 bits
+        cls.costs = np.exp2(cls.X[:, :8].sum(1))
+
+    def test_predict_positive(self):
+        model = CostModel(alpha=1e-3)
+        model.train(range(len(self.X)), self.costs,
+                    featurize=lambda i: self.X[i])
+
+        Y_pred = model.predict([self.X[:100], self.X[100:]])
+        self.assertEqual(Y_pred.shape, (200,))
+        self.assertTrue((Y_pred > 0).all())
+        np.testing.assert_allclose(Y_pred, self.costs, rtol=0.1)
+
+    def test_predict_size(self):
+        model = CostModel()
+        model.train(range(len(self.X)), self.costs,
+                    featurize=lambda i: self.X[i])
+
+        np.testing.assert_allclose(
+            model.predict([self.X[:50], self.X[50:]], size=200),
+            model.predict([self.X])
+        )
+
+    def test_predict_lazy_batches(self):
+        """batches may be iterators of fingerprints, as yielded by a
+        LazyMoleculePool"""
+        model = CostModel()
+        model.train(range(len(self.X)), self.costs,
+                    featurize=lambda i: self.X[i])
+
+        batches = (iter(self.X[i:i+64]) for i in range(0, len(self.X), 64))
+        np.testing.assert_allclose(
+            model.predict(batches, size=200), model.predict([self.X])
+        )
+
+    def test_train_empty(self):
+        model = CostModel()
+        self.assertFalse(model.train([], [], featurize=lambda i: self.X[i]))
+        self.assertFalse(model.trained)
+
+if __name__ == "__main__":
+    unittest.main()
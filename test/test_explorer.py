@@ -0,0 +1,263 @@
+from collections import deque
+import contextlib
+import csv
+import gzip
+import io
+from itertools import islice
+from pathlib import Path
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from molpal import args, Explorer
+
+class TestExplorer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        path = Path(cls.tmpdir.name)
+
+        library = Path(__file__).parents[1] / 'libraries' / 'Enamine10k.csv.gz'
+        with gzip.open(library, 'rt') as fid:
+            reader = csv.reader(fid)
+            next(reader)
+            cls.smis = [row[0] for _, row in zip(range(1200), reader)]
+        cls.scores = {smi: float(len(smi)) for smi in cls.smis}
+
+        cls.library = str(path / 'library.csv')
+        with open(cls.library, 'w') as fid:
+            writer = csv.writer(fid)
+            writer.writerow(['smiles'])
+            writer.writerows([smi] for smi in cls.smis)
+
+        cls.lookup = str(path / 'lookup.csv')
+        with open(cls.lookup, 'w') as fid:
+            writer = csv.writer(fid)
+            writer.writerow(['smiles', 'score'])
+            writer.writerows(cls.scores.items())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def explorer(self, *argv: str) -> Explorer:
+        params = vars(args.gen_args([
+            '--library', self.library, '--validated',
+            '--objective', 'lookup', '--lookup-path', self.lookup,
+            '--metric', 'greedy', '--init-size', '40', '--batch-size', '40',
+            '--root', self.tmpdir.name, '--name', self.id().split('.')[-1],
+            *argv
+        ]))
+        return Explorer(**params)
+
+    def run_explorer(self, explorer: Explorer):
+        with contextlib.redirect_stdout(io.StringIO()):
+            explorer.run()
+        explorer.close()
+
+    def test_pipelined(self):
+        explorer = self.explorer(
+            '--pipeline-frac', '0.5', '--max-explore', '100',
+            '--max-epochs', '10', '--write-intermediate'
+        )
+        self.run_explorer(explorer)
+
+        self.assertEqual(explorer.pending, {})
+        self.assertEqual(len(explorer), 120)
+        for smi, score in explorer.scores.items():
+            self.assertEqual(score, self.scores[smi])
+
+        # the results still in flight at the end must be logged too
+        scores, failures = explorer.score_log.read()
+        self.assertEqual(scores, explorer.scores)
+        self.assertEqual(len(scores) + len(failures), len(explorer))
+
+    def test_pipelined_tail(self):
+        """results still in flight when exploration stops must be logged"""
+        explorer = self.explorer(
+            '--pipeline-frac', '0.5', '--max-epochs', '3',
+            '--write-intermediate', '--model', 'knn'
+        )
+        finished = threading.Event()
+        def stream(xs, **kwargs):
+            """hold back the tail of each batch until the final drain"""
+            for i, x in enumerate(xs):
+                if i == len(xs) // 2:
+                    finished.wait()
+                yield x, self.scores[x]
+        explorer.objective.stream = stream
+
+        n_tail = []
+        collect_pending = explorer._collect_pending
+        def drain(wait_all=False):
+            if wait_all:
+                n_tail.append(len(explorer.pending))
+                finished.set()
+            return collect_pending(wait_all)
+        explorer._collect_pending = drain
+
+        self.run_explorer(explorer)
+
+        self.assertEqual(n_tail, [4 * 20])
+        scores, failures = explorer.score_log.read()
+        self.assertEqual(len(explorer), 4 * 40)
+        self.assertEqual(scores, explorer.scores)
+        self.assertEqual(len(scores) + len(failures), len(explorer))
+
+    def test_cascade_batch_size(self):
+        """survivors of the prefilter should never have been acquired, so
+        every batch is full"""
+        explorer = self.explorer(
+            '--cascade-frac', '0.1', '--prefilter-model', 'knn',
+            '--max-epochs', '6', '--delta', '0'
+        )
+        batch_sizes = []
+        calc = explorer._calc
+        def record_batch(inputs):
+            batch_sizes.append(len(inputs))
+            return calc(inputs)
+        explorer._calc = record_batch
+
+        self.run_explorer(explorer)
+
+        self.assertEqual(batch_sizes, [40] * 7)
+
+    def test_cascade_prune(self):
+        """only inputs predicted by the model may be pruned, and survivors
+        that are pruned must be replaced so that every batch stays full
+        until the pool is exhausted"""
+        explorer = self.explorer(
+            '--cascade-frac', '0.1', '--prefilter-model', 'knn',
+            '--max-epochs', '6', '--delta', '0', '--prune-epochs', '1',
+            '--prune-beta', '0', '-k', '100'
+        )
+        predicted = np.zeros(len(self.smis), dtype=bool)
+        prune = explorer._prune
+        def record_survivors():
+            predicted[explorer.survivors] = True
+            prune()
+        explorer._prune = record_survivors
+
+        batch_sizes = []
+        calc = explorer._calc
+        def record_batch(inputs):
+            batch_sizes.append(len(inputs))
+            return calc(inputs)
+        explorer._calc = record_batch
+
+        self.run_explorer(explorer)
+
+        self.assertTrue((~explorer.active).any())
+        self.assertFalse((~explorer.active & ~predicted).any())
+        *batch_sizes, last_size = batch_sizes
+        self.assertEqual(batch_sizes, [40] * len(batch_sizes))
+        if last_size < 40:
+            self.assertTrue((explorer.acquired | ~explorer.active).all())
+
+    def test_prune_all(self):
+        """exploration should stop once every input has been pruned"""
+        explorer = self.explorer(
+            '--model', 'knn', '--max-epochs', '20', '--delta', '0',
+            '--prune-epochs', '1', '--prune-beta', '0', '-k', '50',
+            '--seed', '0'
+        )
+        self.run_explorer(explorer)
+
+        self.assertTrue((explorer.acquired | ~explorer.active).all())
+        self.assertLess(explorer.epoch, 20)
+
+    def test_checkpoint(self):
+        explorer = self.explorer(
+            '--save-state', '--max-epochs', '1', '--model', 'knn'
+        )
+        self.run_explorer(explorer)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            finished = Path(explorer.checkpoint())
+            interrupted = Path(explorer.checkpoint(interrupted=True))
+        chkpts = finished.parent
+        self.assertEqual(
+            sorted(p.name for p in chkpts.iterdir()),
+            [f'epoch_{i}' for i in range(1, explorer.epoch + 1)]
+            + [f'epoch_{explorer.epoch}_interrupted']
+        )
+        self.assertNotEqual(finished, interrupted)
+
+        resumed = self.explorer('--checkpoint', str(finished))
+        self.assertEqual(resumed.epoch, explorer.epoch)
+        self.assertEqual(resumed.scores, explorer.scores)
+        resumed.close()
+
+    def test_fresh_score_log(self):
+        for _ in range(2):
+            explorer = self.explorer(
+                '--write-intermediate', '--max-epochs', '1'
+            )
+            self.run_explorer(explorer)
+
+            scores, failures = explorer.score_log.read()
+            self.assertEqual(scores, explorer.scores)
+            self.assertEqual(len(scores) + len(failures), len(explorer))
+
+    def test_score_log_kept(self):
+        """a run without intermediate output must leave the score log of a
+        previous run of the same name intact"""
+        explorer = self.explorer('--write-intermediate', '--max-epochs', '1')
+        self.run_explorer(explorer)
+        logged = explorer.score_log.read()
+
+        explorer = self.explorer('--max-epochs', '1')
+        self.run_explorer(explorer)
+
+        self.assertEqual(explorer.score_log.read(), logged)
+
+    def test_continuous(self):
+        explorer = self.explorer(
+            '--continuous', '--retrain-every', '40', '--max-epochs', '100',
+            '--delta', '0', '--model', 'knn'
+        )
+        def stream(xs, **kwargs):
+            """keep 8 inputs in flight, like a concurrent objective"""
+            xs = iter(xs)
+            inflight = deque(islice(xs, 8))
+            while inflight:
+                x = inflight.popleft()
+                yield x, self.scores[x]
+                inflight.extend(islice(xs, 1))
+        explorer.objective.stream = stream
+
+        epochs = []
+        end_epoch = explorer._end_continuous_epoch
+        def record_epoch():
+            epochs.append(len(explorer))
+            end_epoch()
+        explorer._end_continuous_epoch = record_epoch
+
+        self.run_explorer(explorer)
+
+        self.assertEqual(explorer.pending, {})
+        self.assertEqual(len(explorer), len(self.smis))
+        self.assertEqual(explorer.scores, self.scores)
+        # the ranking runs out, and is refilled, once the objective has
+        # pulled all 40 of its inputs, and the results in flight once the
+        # pool has been exhausted are recorded in a single final epoch
+        self.assertEqual(
+            epochs, [*range(40 - 8 + 1, len(self.smis), 40), len(self.smis)]
+        )
+        self.assertEqual(explorer.epoch, len(epochs))
+
+    def test_continuous_budget(self):
+        explorer = self.explorer(
+            '--continuous', '--retrain-every', '40', '--max-epochs', '100',
+            '--delta', '0', '--max-explore', '100'
+        )
+        self.run_explorer(explorer)
+
+        self.assertEqual(explorer.pending, {})
+        self.assertEqual(len(explorer), 100)
+        self.assertEqual(explorer.epoch, 3)
+
+if __name__ == '__main__':
+    unittest.main()
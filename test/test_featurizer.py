@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from molpal.models.utils import PoolFeaturizer, feature_matrix
+
+class FakePool:
+    def __init__(self, fps):
+        self.fps = fps
+        self.chunk_size = 3
+        self.reads = 0
+
+    def get_fps(self, idxs):
+        self.reads += 1
+        return self.fps[sorted(idxs)]
+
+class TestPoolFeaturizer(unittest.TestCase):
+    def setUp(self):
+        self.fps = np.arange(40).reshape(10, 4)
+        self.pool = FakePool(self.fps)
+        self.calls = []
+
+        def featurize(x):
+            self.calls.append(x)
+            return np.full(4, -1)
+
+        self.featurizer = PoolFeaturizer(
+            self.pool, featurize, {f'x{i}': i for i in range(10)}
+        )
+
+    def test_reads_pool_in_order(self):
+        xs = ['x7', 'x2', 'x9', 'x2', 'x0']
+        X = feature_matrix(xs, self.featurizer)
+
+        np.testing.assert_array_equal(X, self.fps[[7, 2, 9, 2, 0]])
+        self.assertEqual(self.calls, [])
+
+    def test_fallback_memoised(self):
+        xs = ['x1', 'y', 'x3', 'y']
+        X = feature_matrix(xs, self.featurizer)
+        np.testing.assert_array_equal(X[[0, 2]], self.fps[[1, 3]])
+        np.testing.assert_array_equal(X[[1, 3]], -1)
+
+        feature_matrix(xs, self.featurizer)
+        self.assertEqual(self.calls, ['y'])
+
+    def test_keeps_pool_dtype(self):
+        self.pool.fps = self.fps.astype(np.int8)
+
+        X = feature_matrix(['x1', 'x3'], self.featurizer)
+        self.assertEqual(X.dtype, np.int8)
+
+    def test_call(self):
+        np.testing.assert_array_equal(self.featurizer('x4'), self.fps[4])
+
+if __name__ == "__main__":
+    unittest.main()
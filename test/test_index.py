@@ -0,0 +1,68 @@
+import tempfile
+import unittest
+
+import h5py
+import numpy as np
+
+from molpal import similarity
+from molpal.pools.index import SimilarityIndex
+
+class TestSimilarityIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rg = np.random.default_rng(0)
+        p = rg.uniform(0.02, 0.3, size=(500, 1))
+        cls.fps = (rg.random((500, 256)) < p).astype(np.int8)
+        cls.fps[0] = 0
+        cls.packed = similarity.pack(cls.fps)
+        cls.queries = similarity.pack(cls.fps[:20])
+
+        cls.index = SimilarityIndex(cls.packed)
+        cls.index.BLOCK_SIZE = 16
+
+    def test_query_exact(self):
+        k = 5
+        idxs, sims = self.index.query(self.queries, k)
+        S = similarity.tanimoto(self.queries, self.packed)
+
+        np.testing.assert_allclose(
+            sims, -np.sort(-S, axis=1)[:, :k], rtol=1e-6
+        )
+        np.testing.assert_allclose(
+            np.take_along_axis(S, idxs, axis=1), sims, rtol=1e-6
+        )
+
+    def test_query_self(self):
+        """every nonempty fingerprint is its own nearest neighbor"""
+        idxs, sims = self.index.query(self.queries[1:], 1)
+        np.testing.assert_array_equal(idxs[:, 0], np.arange(1, 20))
+        np.testing.assert_array_equal(sims[:, 0], 1.)
+
+    def test_query_threads(self):
+        idxs, sims = self.index.query(self.queries, 5)
+        idxs_, sims_ = self.index.query(self.queries, 5, n_threads=4)
+        np.testing.assert_array_equal(sims_, sims)
+        np.testing.assert_array_equal(idxs_, idxs)
+
+    def test_query_large_k(self):
+        idxs, _ = self.index.query(self.queries[:2], 1000)
+        self.assertEqual(idxs.shape, (2, len(self.fps)))
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fps_h5 = f'{tmpdir}/fps.h5'
+            with h5py.File(fps_h5, 'w') as h5f:
+                h5f.create_dataset('fps', data=self.fps)
+
+            self.assertIsNone(SimilarityIndex.load(fps_h5))
+            self.index.save(fps_h5)
+            index = SimilarityIndex.load(fps_h5)
+        index.BLOCK_SIZE = self.index.BLOCK_SIZE
+
+        idxs, sims = index.query(self.queries, 5)
+        idxs_, sims_ = self.index.query(self.queries, 5)
+        np.testing.assert_array_equal(sims, sims_)
+        np.testing.assert_array_equal(idxs, idxs_)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+import numpy as np
+from sklearn.gaussian_process import GaussianProcessRegressor, kernels
+
+from molpal import similarity
+from molpal.models.kernels import (
+    TanimotoKernel, tanimoto_kernel, tanimoto_kernel_diag
+)
+
+class TestTanimotoKernel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rg = np.random.default_rng(0)
+        cls.X = (rg.random((40, 200)) < 0.2).astype(np.float32)
+        cls.X[0] = 0
+        cls.Y = (rg.random((40, 200)) < 0.2).astype(np.float32)
+
+    def test_tanimoto_kernel(self):
+        A, B = self.X.astype(bool), self.Y.astype(bool)
+        K = tanimoto_kernel(self.X, self.Y, n_threads=3)
+        for i, j in [(1, 0), (5, 7), (39, 39), (0, 3)]:
+            union = (A[i] | B[j]).sum()
+            k = (A[i] & B[j]).sum() / union if union else 0.
+            self.assertAlmostEqual(K[i, j], k, places=6)
+
+    def test_tanimoto_kernel_diag(self):
+        np.testing.assert_allclose(
+            tanimoto_kernel_diag(self.X), np.diag(tanimoto_kernel(self.X))
+        )
+
+    def test_kernel_gradient(self):
+        K, K_grad = TanimotoKernel()(self.X, eval_gradient=True)
+        self.assertEqual(K.shape, (40, 40))
+        self.assertEqual(K_grad.shape, (40, 40, 0))
+
+    def test_gp(self):
+        """a GP with a Tanimoto kernel should interpolate a function of the
+        Tanimoto similarity to a reference fingerprint"""
+        ref = similarity.pack(self.Y[:1])
+        y = similarity.tanimoto(similarity.pack(self.X), ref)[:, 0]
+
+        kernel = kernels.ConstantKernel() * TanimotoKernel(n_threads=2)
+        gp = GaussianProcessRegressor(kernel, alpha=1e-6).fit(self.X, y)
+        np.testing.assert_allclose(gp.predict(self.X), y, atol=1e-3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from molpal.models.knnmodels import KNNModel
+
+class TestKNNModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rg = np.random.default_rng(0)
+        cls.X = (rg.random((100, 64)) < 0.2).astype(float)
+        cls.X[:, 0] = 1
+        cls.Y = rg.standard_normal(100)
+
+    def test_training_points(self):
+        """with k=1, every training point is its own nearest neighbor"""
+        model = KNNModel(knn_k=1)
+        model.train(range(len(self.X)), self.Y,
+                    featurize=lambda i: self.X[i])
+
+        means, variances = model.get_means_and_vars(list(self.X))
+        np.testing.assert_allclose(means, self.Y)
+        np.testing.assert_array_equal(variances, 0.)
+
+    def test_weighted_mean(self):
+        model = KNNModel(knn_k=3)
+        model.train(range(len(self.X)), self.Y,
+                    featurize=lambda i: self.X[i])
+
+        x = self.X[0]
+        A, b = self.X.astype(bool), x.astype(bool)
+        S = (A & b).sum(1) / (A | b).sum(1)
+        nn = np.argsort(-S, kind='stable')[:3]
+        W = S[nn] / S[nn].sum()
+        mean = W @ self.Y[nn]
+        var = W @ (self.Y[nn] - mean)**2
+
+        means, variances = model.get_means_and_vars([x])
+        self.assertAlmostEqual(means[0], mean, places=5)
+        self.assertAlmostEqual(variances[0], var, places=5)
+
+    def test_train_incremental(self):
+        """training in parts without retraining should match training on
+        all the data at once"""
+        model = KNNModel(knn_k=5)
+        for i in range(0, 100, 10):
+            model.train(range(i, i+10), self.Y[i:i+10],
+                        featurize=lambda i: self.X[i])
+        self.assertEqual(model.model['size'], 100)
+        means = model.get_means(list(self.X))
+
+        model.train(range(100), self.Y, featurize=lambda i: self.X[i],
+                    retrain=True)
+        np.testing.assert_allclose(model.get_means(list(self.X)), means)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from molpal.models.linmodels import OnlineLinearModel
+
+class TestOnlineLinearModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rg = np.random.default_rng(0)
+        cls.X = (rg.random((2000, 128)) < 0.1).astype(np.float32)
+        cls.w = rg.standard_normal(128)
+        cls.Y = cls.X @ cls.w - 5 + 0.1 * rg.standard_normal(2000)
+
+    def featurize(self, i):
+        return self.X[i]
+
+    def test_fit(self):
+        model = OnlineLinearModel(seed=0)
+        model.train(range(1500), self.Y[:1500], featurize=self.featurize)
+
+        means, variances = model.get_means_and_vars(list(self.X[1500:]))
+        self.assertGreater(np.corrcoef(means, self.Y[1500:])[0, 1], 0.9)
+        self.assertTrue((variances > 0).all())
+
+    def test_partial_fit(self):
+        """updating on new data alone should improve the model"""
+        model = OnlineLinearModel(seed=0)
+        X_test = list(self.X[1500:])
+
+        model.train(range(200), self.Y[:200], featurize=self.featurize)
+        mse_1 = np.mean((model.get_means(X_test) - self.Y[1500:])**2)
+
+        model.train(range(200, 1500), self.Y[200:1500],
+                    featurize=self.featurize)
+        mse_2 = np.mean((model.get_means(X_test) - self.Y[1500:])**2)
+        self.assertLess(mse_2, mse_1)
+
+    def test_target_stats(self):
+        """the target statistics should be those of all the training data,
+        and updating them should not change the predictions"""
+        model = OnlineLinearModel(linear_heads=3, seed=0)
+        model.train(range(200), self.Y[:200], featurize=self.featurize)
+        means = model.get_means(list(self.X[:50]))
+
+        Y_shifted = self.Y[200:400] + 10
+        model._update_stats(Y_shifted)
+        model._stack()
+        np.testing.assert_allclose(
+            model.get_means(list(self.X[:50])), means, rtol=1e-5
+        )
+
+        Y = np.concatenate((self.Y[:200], Y_shifted))
+        self.assertEqual(model.model['n'], 400)
+        self.assertAlmostEqual(model.model['y_mean'], Y.mean())
+        self.assertAlmostEqual(model.model['y_std'], Y.std())
+
+    def test_retrain(self):
+        model = OnlineLinearModel(linear_heads=3, seed=0)
+        model.train(range(200), self.Y[:200], featurize=self.featurize)
+        heads = model.model['heads']
+
+        model.train(range(200), self.Y[:200], featurize=self.featurize)
+        self.assertIs(model.model['heads'][0], heads[0])
+
+        model.train(range(200), self.Y[:200], featurize=self.featurize,
+                    retrain=True)
+        self.assertIsNot(model.model['heads'][0], heads[0])
+        self.assertEqual(model.get_means(list(self.X[:5])).shape, (5,))
+
+if __name__ == "__main__":
+    unittest.main()
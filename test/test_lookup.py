@@ -12,7 +12,7 @@ class TestLookupObjective(unittest.TestCase):
     def setUpClass(cls):
         cls.alphabet = {c: i for i, c in enumerate(string.ascii_lowercase)}
 
-        cls.random_xs = random.sample(cls.alphabet.keys(), 10)
+        cls.random_xs = random.sample(sorted(cls.alphabet), 10)
         cls.random_items = {c: cls.alphabet[c] for c in cls.random_xs}
 
         cls.empty_csv = 'test_lookup_empty.csv'
@@ -75,6 +75,23 @@ class TestLookupObjective(unittest.TestCase):
         scores = self.weird.calc('abc')
         self.assertEqual(scores, {x: self.alphabet[x] for x in 'abc'})
 
+    def test_stream(self):
+        xs = ['foo', 'bar']
+        xs.extend(self.random_xs)
+        scores = dict(self.normal.stream(iter(xs), chunksize=3))
+        self.assertEqual(scores, self.normal.calc(xs))
+
+    def test_stream_extended(self):
+        """inputs appended to the stream while it is consumed should be
+        evaluated too"""
+        xs = ['a']
+        scores = {}
+        for x, y in self.normal.stream(iter(xs)):
+            scores[x] = y
+            if len(xs) < 3:
+                xs.append(string.ascii_lowercase[len(xs)])
+        self.assertEqual(scores, {x: self.alphabet[x] for x in 'abc'})
+
     @classmethod
     def tearDownClass(cls):
         os.unlink(cls.empty_csv)
@@ -111,6 +111,86 @@ class TestMetrics(unittest.TestCase):
         Y_mean = np.arange(10)
         U = metrics.random_threshold(Y_mean, threshold=10)
         np.testing.assert_allclose(U, np.full(Y_mean.shape, -1.))
-        
+
+class TestChunkedMetrics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rg = np.random.default_rng(42)
+        cls.Y_mean = rg.normal(size=1000)
+        cls.Y_var = rg.random(1000)
+        cls.Y_var[::10] = 0.
+        cls.kwargs = dict(chunksize=64, n_threads=4)
+
+    def assert_parity(self, metric, **kwargs):
+        U = metrics.calc_chunked(
+            metric, self.Y_mean.astype(np.float32), 
+            self.Y_var.astype(np.float32), **kwargs, **self.kwargs
+        )
+        U_ref = getattr(metrics, metric)(self.Y_mean, self.Y_var, **kwargs)
+
+        self.assertEqual(U.dtype, np.float32)
+        np.testing.assert_allclose(U, U_ref, rtol=1e-5, atol=1e-6)
+
+    def test_greedy(self):
+        U = metrics.calc_chunked('greedy', self.Y_mean, **self.kwargs)
+        np.testing.assert_allclose(U, self.Y_mean, rtol=1e-6)
+
+    def test_ucb(self):
+        self.assert_parity('ucb', beta=2)
+
+    def test_lcb(self):
+        self.assert_parity('lcb', beta=2)
+
+    def test_ei(self):
+        self.assert_parity('ei', current_max=1., xi=0.01)
+
+    def test_ei_no_max(self):
+        self.assert_parity('ei', current_max=float('-inf'), xi=0.01)
+
+    def test_pi(self):
+        self.assert_parity('pi', current_max=1., xi=0.01)
+
+    def test_thompson_stochastic(self):
+        self.assert_parity('thompson', stochastic=True)
+
+    def test_out(self):
+        out = np.empty(len(self.Y_mean), dtype=np.float32)
+        U = metrics.calc_chunked(
+            'ucb', self.Y_mean, self.Y_var, out=out, **self.kwargs
+        )
+        self.assertIs(U, out)
+
+    def test_bad_out(self):
+        out = np.empty(len(self.Y_mean), dtype=np.float64)
+        with self.assertRaises(ValueError):
+            metrics.calc_chunked('greedy', self.Y_mean, out=out)
+
+    def test_random_metrics_thread_invariant(self):
+        for metric in ['random', 'noisy', 'thompson', 'threshold']:
+            metrics.set_seed(0)
+            U_1 = metrics.calc_chunked(
+                metric, self.Y_mean, self.Y_var, threshold=0.,
+                chunksize=64, n_threads=1
+            )
+            metrics.set_seed(0)
+            U_4 = metrics.calc_chunked(
+                metric, self.Y_mean, self.Y_var, threshold=0.,
+                chunksize=64, n_threads=4
+            )
+            np.testing.assert_array_equal(U_1, U_4)
+
+    def test_noisy(self):
+        sd = np.std(self.Y_mean)
+        U = metrics.calc_chunked('noisy', self.Y_mean, **self.kwargs)
+        np.testing.assert_allclose(U, self.Y_mean, atol=6*sd)
+
+    def test_threshold(self):
+        U = metrics.calc_chunked(
+            'threshold', self.Y_mean, threshold=0., **self.kwargs
+        )
+        below = self.Y_mean < 0
+        np.testing.assert_array_equal(U[below], -1.)
+        self.assertTrue(((U[~below] >= 0) & (U[~below] < 1)).all())
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,70 @@
+import importlib.util
+import tempfile
+import unittest
+
+import numpy as np
+
+HAS_TF = all(
+    importlib.util.find_spec(module) is not None
+    for module in ('tensorflow', 'tensorflow_addons')
+)
+
+@unittest.skipIf(not HAS_TF, 'tensorflow is not installed')
+class TestNNEnsembleModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rg = np.random.default_rng(0)
+        cls.X = (rg.random((200, 32)) < 0.2).astype(np.float32)
+        cls.Y = cls.X[:, :4].sum(1) + 0.1 * rg.standard_normal(200)
+
+    def featurize(self, i):
+        return self.X[i]
+
+    def model(self):
+        from molpal.models.nnmodels import NNEnsembleModel
+
+        return NNEnsembleModel(
+            input_size=self.X.shape[1], test_batch_size=64, ensemble_size=3
+        )
+
+    def test_fit_predict(self):
+        model = self.model()
+        model.train(range(200), self.Y, featurize=self.featurize)
+
+        means, variances = model.get_means_and_vars(list(self.X[:10]))
+        self.assertEqual(means.shape, (10,))
+        self.assertEqual(variances.shape, (10,))
+        self.assertTrue((variances > 0).all())
+        np.testing.assert_allclose(
+            model.get_means(list(self.X[:10])), means, rtol=1e-5
+        )
+
+    def test_save_load(self):
+        model = self.model()
+        model.train(range(200), self.Y, featurize=self.featurize)
+        means, variances = model.get_means_and_vars(list(self.X[:10]))
+
+        with tempfile.TemporaryDirectory() as path:
+            model.save(path)
+            loaded = self.model()
+            loaded.load(path)
+
+        means_, variances_ = loaded.get_means_and_vars(list(self.X[:10]))
+        np.testing.assert_allclose(means_, means, rtol=1e-5)
+        np.testing.assert_allclose(variances_, variances, rtol=1e-5)
+
+    def test_bootstrap_weights(self):
+        """each head should weight the training data differently, and the
+        validation data not at all"""
+        model = self.model()
+        X, Y, (X_val, Y_val) = model.model._bootstrap(self.X, self.Y)
+
+        self.assertEqual(len(X) + len(X_val), len(self.X))
+        self.assertEqual(Y.shape, (len(X), 4))
+        np.testing.assert_array_equal(Y[:, 0], self.Y[:len(X)])
+        self.assertTrue(len({tuple(w) for w in Y[:, 1:].T}) > 1)
+        np.testing.assert_array_equal(Y_val[:, 0], self.Y[len(X):])
+        np.testing.assert_array_equal(Y_val[:, 1:], 1)
+
+if __name__ == "__main__":
+    unittest.main()
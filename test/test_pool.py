@@ -0,0 +1,72 @@
+import csv
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+import h5py
+
+from molpal.pools import LazyMoleculePool
+
+class TestMoleculePool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.smis = ['C' * n for n in range(1, 101)]
+
+        cls.library = str(Path(cls.tmpdir.name) / 'library.csv')
+        with open(cls.library, 'w') as fid:
+            writer = csv.writer(fid)
+            writer.writerow(['smiles'])
+            writer.writerows([smi] for smi in cls.smis)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def pool(self) -> LazyMoleculePool:
+        return LazyMoleculePool(
+            self.library, validated=True, path=self.tmpdir.name
+        )
+
+    def test_get_smis(self):
+        pool = self.pool()
+        idxs = [57, 3, 99, 3, 0]
+
+        self.assertEqual(
+            pool.get_smis(idxs), [self.smis[i] for i in sorted(idxs)]
+        )
+        self.assertEqual(pool.get_smi(42), self.smis[42])
+
+    def test_get_smis_out_of_range(self):
+        pool = self.pool()
+        with self.assertRaises(IndexError):
+            pool.get_smis([0, 100])
+
+    def test_smis_file_reused(self):
+        pool = self.pool()
+        pool.get_smis([0])
+        with h5py.File(pool.smis_h5, 'a') as h5f:
+            h5f[pool.SMIS_DSET][0] = 'N'
+
+        pool = self.pool()
+        self.assertEqual(pool.get_smis([0, 1]), ['N', 'CC'])
+
+    def test_smis_file_stale(self):
+        """an edited library must not be served the SMILES strings stored
+        for its previous contents, even if its size is unchanged"""
+        library = str(Path(self.tmpdir.name) / 'edited.csv')
+        for atom in ('N', 'O'):
+            with open(library, 'w') as fid:
+                writer = csv.writer(fid)
+                writer.writerow(['smiles'])
+                writer.writerows([atom * n] for n in range(1, 101))
+            os.utime(library, ns=(0, ord(atom)))
+
+            pool = LazyMoleculePool(
+                library, validated=True, path=self.tmpdir.name
+            )
+            self.assertEqual(pool.get_smis([1]), [atom * 2])
+
+if __name__ == '__main__':
+    unittest.main()
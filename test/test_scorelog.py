@@ -0,0 +1,66 @@
+from pathlib import Path
+import tempfile
+import unittest
+
+import numpy as np
+
+from molpal.scorelog import ScoreLog
+
+class TestScoreLog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log = ScoreLog(Path(self.tmpdir.name) / 'data' / 'scores.h5')
+
+        self.batches = [
+            ({'C': 1., 'CC': 2.}, ['CCC']),
+            ({'CCCC': 4., 'CCCCC': -1.}, []),
+            ({'CCCCCC': 0.5}, ['CCCCCCC', 'CCCCCCCC']),
+        ]
+        for epoch, (scores, failures) in enumerate(self.batches):
+            self.log.append(scores, failures, epoch)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_empty(self):
+        log = ScoreLog(Path(self.tmpdir.name) / 'empty.h5')
+        self.assertEqual(len(log), 0)
+        self.assertEqual(log.epochs(), [])
+        self.assertEqual(log.read(), ({}, {}))
+
+    def test_len(self):
+        self.assertEqual(len(self.log), 8)
+
+    def test_epochs(self):
+        self.assertEqual(self.log.epochs(), [0, 1, 2])
+
+    def test_iter_epochs(self):
+        for (epoch, scores, failures), (true_scores, true_failures) in zip(
+                self.log.iter_epochs(), self.batches):
+            self.assertEqual(scores, true_scores)
+            self.assertEqual(list(failures), true_failures)
+            self.assertTrue(all(y is None for y in failures.values()))
+
+    def test_read(self):
+        scores, failures = self.log.read()
+        self.assertEqual(
+            scores, {'C': 1., 'CC': 2., 'CCCC': 4., 'CCCCC': -1., 'CCCCCC': 0.5}
+        )
+        self.assertEqual(set(failures), {'CCC', 'CCCCCCC', 'CCCCCCCC'})
+
+    def test_read_epoch(self):
+        scores, failures = self.log.read(epoch=1)
+        self.assertEqual(scores, {'C': 1., 'CC': 2., 'CCCC': 4., 'CCCCC': -1.})
+        self.assertEqual(set(failures), {'CCC'})
+
+    def test_truncate(self):
+        self.log.truncate(1)
+        self.assertEqual(self.log.epochs(), [0])
+        self.assertEqual(len(self.log), 3)
+
+        self.log.append({'N': 3.}, [], 1)
+        scores, _ = self.log.read()
+        self.assertEqual(scores, {'C': 1., 'CC': 2., 'N': 3.})
+
+if __name__ == '__main__':
+    unittest.main()
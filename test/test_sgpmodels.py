@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from molpal.models.sgpmodels import SparseGPModel, kcenter
+
+class TestSparseGPModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rg = np.random.default_rng(0)
+        cls.X = (rg.random((120, 64)) < 0.2).astype(float)
+        cls.Y = cls.X[:, :8].sum(1) + 0.1 * rg.standard_normal(120)
+
+    def test_exact_when_all_inducing(self):
+        """with every training input as an inducing point, the sparse GP
+        should match the exact GP"""
+        model = SparseGPModel(n_inducing=len(self.X), noise=0.1)
+        model.train(range(len(self.X)), self.Y,
+                    featurize=lambda i: self.X[i])
+
+        y_mean, y_std = self.Y.mean(), self.Y.std()
+        Y = (self.Y - y_mean) / y_std
+        K = self.X @ self.X.T + 1
+        X_test = self.X[:10] + 0.
+        X_test[:, -1] = 1 - X_test[:, -1]
+        K_s = X_test @ self.X.T + 1
+        K_ss = (X_test * X_test).sum(1) + 1
+        G = np.linalg.inv(K + 0.1 * np.eye(len(K)))
+        means = K_s @ G @ Y * y_std + y_mean
+        variances = (K_ss - np.einsum('ij,jk,ik->i', K_s, G, K_s)) * y_std**2
+
+        means_, variances_ = model.get_means_and_vars(list(X_test))
+        np.testing.assert_allclose(means_, means, rtol=1e-3, atol=1e-3)
+        np.testing.assert_allclose(variances_, variances, rtol=1e-2, atol=1e-3)
+
+    def test_sparse(self):
+        for method in ('kcenter', 'kmeans'):
+            model = SparseGPModel(n_inducing=40, inducing_method=method)
+            model.train(range(len(self.X)), self.Y,
+                        featurize=lambda i: self.X[i])
+            self.assertLessEqual(len(model.model['Z']), 40)
+
+            means, variances = model.get_means_and_vars(list(self.X))
+            self.assertEqual(means.shape, (len(self.X),))
+            self.assertTrue((variances >= 0).all())
+            self.assertGreater(np.corrcoef(means, self.Y)[0, 1], 0.5)
+
+    def test_kcenter(self):
+        idxs = kcenter(self.X, 10)
+        self.assertEqual(len(set(idxs)), 10)
+        self.assertEqual(idxs[0], self.X.sum(1).argmax())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from molpal import similarity
+
+class TestSimilarity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rg = np.random.default_rng(0)
+        cls.fps = (rg.random((50, 300)) < 0.1).astype(np.int8)
+        cls.fps[0] = 0
+        cls.packed = similarity.pack(cls.fps)
+
+    @staticmethod
+    def brute_tanimoto(A, B):
+        A, B = A.astype(bool), B.astype(bool)
+        S = np.zeros((len(A), len(B)))
+        for i, a in enumerate(A):
+            for j, b in enumerate(B):
+                union = (a | b).sum()
+                if union > 0:
+                    S[i, j] = (a & b).sum() / union
+        return S
+
+    def test_pack_shape(self):
+        self.assertEqual(self.packed.shape, (50, 5))
+        self.assertEqual(self.packed.dtype, np.uint64)
+
+    def test_counts(self):
+        np.testing.assert_array_equal(
+            similarity.counts(self.packed), self.fps.sum(axis=1)
+        )
+
+    def test_tanimoto(self):
+        S = similarity.tanimoto(self.packed, self.packed[:20])
+        np.testing.assert_allclose(
+            S, self.brute_tanimoto(self.fps, self.fps[:20]), rtol=1e-6
+        )
+
+    def test_tanimoto_threads(self):
+        S = similarity.tanimoto(self.packed, self.packed)
+        S_threaded = similarity.tanimoto(
+            self.packed, self.packed, n_threads=4
+        )
+        np.testing.assert_array_equal(S_threaded, S)
+
+    def test_max_similarity_threshold(self):
+        """pruning by popcount bounds must not change any similarity above
+        the threshold"""
+        S = self.brute_tanimoto(self.fps[:10], self.fps[10:]).max(axis=1)
+        S_max = similarity.max_similarity(
+            self.packed[:10], self.packed[10:], threshold=0.1
+        )
+        np.testing.assert_allclose(S_max[S >= 0.1], S[S >= 0.1], rtol=1e-6)
+
+    def test_select_diverse(self):
+        threshold = 0.1
+        selected = similarity.select_diverse(
+            self.packed, 20, threshold, block_size=7
+        )
+        self.assertLessEqual(len(selected), 20)
+        self.assertEqual(selected[0], 0)
+
+        S = self.brute_tanimoto(self.fps[selected], self.fps[selected])
+        np.fill_diagonal(S, 0)
+        self.assertTrue((S < threshold).all())
+
+    def test_select_diverse_greedy(self):
+        """each rejected fingerprint before the last selected one must be too
+        similar to an earlier selected fingerprint"""
+        threshold = 0.1
+        selected = similarity.select_diverse(self.packed, 50, threshold)
+        S = self.brute_tanimoto(self.fps, self.fps)
+        for i in set(range(selected[-1])) - set(selected):
+            earlier = selected[selected < i]
+            self.assertTrue((S[i, earlier] >= threshold).any())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+from molpal.models.sklmodels import GBModel, RFModel
+
+class TestRFModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rg = np.random.default_rng(0)
+        cls.X = (rg.random((300, 128)) < 0.1).astype(np.int8)
+        cls.Y = cls.X[:, :10].sum(1) + rg.random(300)
+
+    def test_means_and_vars(self):
+        """the running moments should match those of the full matrix of
+        per-tree predictions, regardless of the number of threads"""
+        for ncpu in (1, 3):
+            model = RFModel(ncpu=ncpu)
+            model.model.set_params(verbose=0)
+            model.model.fit(self.X, self.Y)
+
+            X = self.X[:50].astype(np.float32)
+            preds = np.stack([
+                tree.predict(X) for tree in model.model.estimators_
+            ], axis=1)
+
+            means, variances = model.get_means_and_vars(list(self.X[:50]))
+            np.testing.assert_allclose(means, preds.mean(1))
+            np.testing.assert_allclose(variances, preds.var(1), atol=1e-12)
+
+    def test_online(self):
+        model = RFModel(n_trees=10, rf_online=True, rf_new_trees=4,
+                        rf_max_samples=150)
+        model.model.set_params(verbose=0)
+        featurize = lambda i: self.X[i]
+
+        model.train(range(100), self.Y[:100], featurize=featurize)
+        first_trees = list(model.model.estimators_)
+        self.assertEqual(len(first_trees), 10)
+
+        model.train(range(100, 200), self.Y[100:200], featurize=featurize,
+                    retrain=False)
+        trees = model.model.estimators_
+        self.assertEqual(len(trees), 10)
+        self.assertEqual(trees[:6], first_trees[4:])
+        self.assertTrue(all(tree not in first_trees for tree in trees[6:]))
+
+        self.assertEqual(len(model.X_train), 150)
+        np.testing.assert_array_equal(model.Y_train, self.Y[50:200])
+
+        means, variances = model.get_means_and_vars(list(self.X[:5]))
+        self.assertEqual(means.shape, (5,))
+
+class TestGBModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rg = np.random.default_rng(0)
+        cls.X = (rg.random((1000, 64)) < 0.2).astype(np.float32)
+        cls.X[:, -8:] = 0
+        cls.Y = cls.X[:, :8].sum(1) + rg.standard_normal(1000)
+
+    def test_means_and_vars(self):
+        model = GBModel()
+        model.train(range(800), self.Y[:800], featurize=lambda i: self.X[i])
+        self.assertEqual(model.model['features'].sum(), 56)
+
+        means, variances = model.get_means_and_vars(list(self.X[800:]))
+        self.assertGreater(np.corrcoef(means, self.Y[800:])[0, 1], 0.6)
+        self.assertTrue((variances >= 0).all())
+        np.testing.assert_allclose(np.sqrt(variances.mean()), 1., atol=0.3)
+        np.testing.assert_array_equal(
+            model.get_means(list(self.X[800:])), means
+        )
+
+    def test_identical_inputs(self):
+        model = GBModel(gb_max_iter=5)
+        model.train(range(10), self.Y[:10], featurize=lambda i: self.X[0])
+        self.assertEqual(model.model['features'].sum(), 1)
+
+        means, variances = model.get_means_and_vars(list(self.X[:5]))
+        np.testing.assert_allclose(means, self.Y[:10].mean())
+        self.assertEqual(variances.shape, (5,))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import heapq
+from operator import itemgetter
+import random
+import unittest
+
+import numpy as np
+
+from molpal.tracker import TopKTracker
+
+class TestTopKTracker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        random.seed(42)
+        cls.batches = [
+            {f'x{i}_{j}': random.gauss(0, 1) for j in range(100)}
+            for i in range(10)
+        ]
+        cls.scores = {}
+        for batch in cls.batches:
+            cls.scores.update(batch)
+
+    def setUp(self):
+        self.tracker = TopKTracker()
+        for batch in self.batches:
+            self.tracker.update(batch)
+
+    def test_empty(self):
+        tracker = TopKTracker()
+        self.assertEqual(len(tracker), 0)
+        self.assertEqual(tracker.top(10), [])
+        self.assertTrue(np.isnan(tracker.avg(10)))
+
+    def test_len(self):
+        self.assertEqual(len(self.tracker), len(self.scores))
+
+    def test_init(self):
+        tracker = TopKTracker(self.scores)
+        self.assertEqual(tracker.top(), self.tracker.top())
+
+    def test_top(self):
+        for k in [1, 10, 100, 1000]:
+            top_k = heapq.nlargest(k, self.scores.items(), key=itemgetter(1))
+            self.assertEqual(self.tracker.top(k), top_k)
+
+    def test_top_all(self):
+        top = sorted(self.scores.items(), key=itemgetter(1), reverse=True)
+        self.assertEqual(self.tracker.top(), top)
+        self.assertEqual(self.tracker.top(len(self.scores) + 10), top)
+
+    def test_avg(self):
+        ys = sorted(self.scores.values(), reverse=True)
+        for k in [1, 10, 100, 1000]:
+            self.assertAlmostEqual(self.tracker.avg(k), sum(ys[:k]) / k)
+
+    def test_avg_k_too_large(self):
+        ys = list(self.scores.values())
+        self.assertAlmostEqual(
+            self.tracker.avg(len(ys) + 10), sum(ys) / len(ys)
+        )
+
+    def test_ties_insertion_order(self):
+        tracker = TopKTracker({'a': 1., 'b': 1.})
+        tracker.update({'c': 1., 'd': 2.})
+        self.assertEqual(
+            tracker.top(), [('d', 2.), ('a', 1.), ('b', 1.), ('c', 1.)]
+        )
+
+    def test_threshold(self):
+        ys = sorted(self.scores.values(), reverse=True)
+        self.assertEqual(self.tracker.threshold(10), ys[9])
+        self.assertEqual(
+            self.tracker.threshold(len(ys) + 1), float('-inf')
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+from pathlib import Path
+import tempfile
+import threading
+import unittest
+
+from molpal.writer import BackgroundWriter
+
+def write_text(path, text, event=None):
+    if event is not None:
+        event.wait()
+    Path(path).write_text(text)
+
+def fail():
+    raise IOError('write failed')
+
+class TestBackgroundWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.writer = BackgroundWriter(maxsize=2)
+
+    def tearDown(self):
+        self.writer.close()
+        self.tmpdir.cleanup()
+
+    def test_flush(self):
+        path = Path(self.tmpdir.name) / 'a.txt'
+        self.writer.submit(path, write_text, path, 'foo')
+        self.writer.flush()
+
+        self.assertEqual(path.read_text(), 'foo')
+
+    def test_background(self):
+        path = Path(self.tmpdir.name) / 'a.txt'
+        event = threading.Event()
+        self.writer.submit(path, write_text, path, 'foo', event)
+
+        self.assertFalse(path.exists())
+        event.set()
+        self.writer.flush()
+        self.assertTrue(path.exists())
+
+    def test_order(self):
+        path = Path(self.tmpdir.name) / 'a.txt'
+        for i in range(10):
+            self.writer.submit(path, write_text, path, str(i))
+        self.writer.close()
+
+        self.assertEqual(path.read_text(), '9')
+
+    def test_error(self):
+        self.writer.submit(None, fail)
+        with self.assertRaises(IOError):
+            self.writer.flush()
+
+    def test_close_idempotent(self):
+        self.writer.close()
+        self.writer.close()
+
+if __name__ == '__main__':
+    unittest.main()